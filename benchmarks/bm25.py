@@ -0,0 +1,106 @@
+"""Local BM25 benchmark: index build time and query latency on a synthetic corpus.
+
+The corpus has Zipf-distributed word frequencies, like natural text, and is
+written to a temporary directory, so no network or real documents are needed.
+
+    python benchmarks/bm25.py --passages 300000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passages", type=int, default=300000, help="Number of passages in the corpus.")
+    parser.add_argument("--passage-words", type=int, default=60, help="Words per passage.")
+    parser.add_argument("--vocabulary", type=int, default=50000, help="Distinct words in the corpus.")
+    parser.add_argument("--files", type=int, default=100, help="Number of corpus files.")
+    parser.add_argument("--queries", type=int, default=500, help="Number of timed queries.")
+    parser.add_argument("--top-k", type=int, default=5, help="Passages returned per query.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed of the corpus and queries.")
+    return parser.parse_args()
+
+
+def word(rank: int) -> str:
+    """Return a distinct alphabetic word for a vocabulary rank."""
+    letters = []
+    rank += 1
+    while rank:
+        rank, digit = divmod(rank - 1, 26)
+        letters.append(chr(ord("a") + digit))
+    return "w" + "".join(letters)
+
+
+def write_corpus(corpus_dir: str, args, rng) -> list:
+    """Write the synthetic corpus and return its vocabulary."""
+    vocabulary = [word(rank) for rank in range(args.vocabulary)]
+    weights = 1 / np.arange(1, args.vocabulary + 1)
+    weights /= weights.sum()
+    per_file = -(-args.passages // args.files)
+    for file_number in range(args.files):
+        count = min(per_file, args.passages - file_number * per_file)
+        if count <= 0:
+            break
+        ranks = rng.choice(args.vocabulary, size=(count, args.passage_words), p=weights)
+        # One blank line between passages; each passage fits a single index chunk
+        text = "\n\n".join(" ".join(vocabulary[rank] for rank in row) for row in ranks)
+        with open(os.path.join(corpus_dir, f"doc{file_number:04d}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+    return vocabulary
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, ROOT)
+    from graph.retrieval.bm25 import BM25Index, build_index
+    from graph.retrieval.text import estimate_tokens
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus_dir = os.path.join(workdir, "corpus")
+        index_dir = os.path.join(workdir, "index")
+        os.makedirs(corpus_dir)
+        vocabulary = write_corpus(corpus_dir, args, rng)
+
+        chunk_tokens = estimate_tokens(" ".join(vocabulary[-1:] * args.passage_words)) + 1
+        started = time.perf_counter()
+        stats = build_index(corpus_dir, index_dir, chunk_tokens)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = BM25Index(index_dir)
+        open_seconds = time.perf_counter() - started
+
+        # Queries of 2-6 words drawn uniformly from the vocabulary, i.e. mostly mid-frequency terms
+        queries = [
+            " ".join(vocabulary[rank] for rank in rng.choice(args.vocabulary, size=rng.integers(2, 7)))
+            for _ in range(args.queries)
+        ]
+        # Common words have the longest postings lists and are the worst case
+        queries += [" ".join(vocabulary[:4])] * 10
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, args.top_k)
+            latencies.append(time.perf_counter() - started)
+
+    ordered = sorted(latencies)
+    print(f"passages:          {stats['passages']}")
+    print(f"postings:          {stats['postings']}")
+    print(f"build seconds:     {build_seconds:.2f}")
+    print(f"open milliseconds: {open_seconds * 1000:.2f}")
+    print(f"query p50 ms:      {statistics.median(latencies) * 1000:.3f}")
+    print(f"query p95 ms:      {ordered[int(0.95 * len(ordered))] * 1000:.3f}")
+    print(f"query max ms:      {ordered[-1] * 1000:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Deterministic offline stand-ins for the Gemini, Tavily and Wikipedia clients."""
+import asyncio
+import hashlib
+import time
+from langchain_core.messages import AIMessage
+from graph.models import Analyst, Perspectives, QueryPlan, ReportFraming, SearchQuery
+from config import QUERIES_PER_TURN
+
+WORDS = (
+    "cats internet culture memes video platforms attention sharing humor community "
+    "animals photos viral social audience behaviour research study online pets"
+).split()
+
+
+def filler(tokens: int, seed: str = "") -> str:
+    """Return deterministic text of roughly the given number of tokens."""
+    offset = int(hashlib.sha1(seed.encode("utf-8")).hexdigest(), 16) % len(WORDS)
+    # estimate_tokens counts ~4 characters per token; words here average ~7 with the space
+    count = max(1, tokens * 4 // 7)
+    return " ".join(WORDS[(offset + i) % len(WORDS)] for i in range(count))
+
+
+def _digest(messages) -> str:
+    text = "".join(str(getattr(message, "content", message)) for message in messages)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:10]
+
+
+class FakeChatModel:
+    """Chat model with fixed latency and response size, including structured output."""
+
+    def __init__(self, latency_seconds: float = 0.0, response_tokens: int = 200, analysts: int = 3):
+        self.latency_seconds = latency_seconds
+        self.response_tokens = response_tokens
+        self.analysts = analysts
+
+    def _respond(self, messages) -> AIMessage:
+        digest = _digest(messages)
+        return AIMessage(
+            content=f"## {digest}\n{filler(self.response_tokens, digest)} [1]",
+            usage_metadata={
+                "input_tokens": sum(len(str(getattr(m, "content", m))) for m in messages) // 4,
+                "output_tokens": self.response_tokens,
+                "total_tokens": self.response_tokens
+            }
+        )
+
+    def _structured(self, schema, messages):
+        # Queries depend on the prompt so that different runs never share search cache entries
+        digest = _digest(messages)
+        if schema is Perspectives:
+            return Perspectives(analysts=[
+                Analyst(affiliation=f"Lab {i}", name=f"Analyst {i}", role="Researcher", description=filler(30, f"{digest}{i}"))
+                for i in range(self.analysts)
+            ])
+        if schema is QueryPlan:
+            return QueryPlan(
+                search_query=f"cats {digest}",
+                alternative_queries=[f"cats {digest} {i}" for i in range(1, QUERIES_PER_TURN)]
+            )
+        if schema is ReportFraming:
+            return ReportFraming(
+                introduction=f"# {digest}\n## Introduction\n{filler(self.response_tokens // 2, digest)}",
+                conclusion=f"## Conclusion\n{filler(self.response_tokens // 2, digest + 'c')}"
+            )
+        if schema is SearchQuery:
+            return SearchQuery(search_query=f"cats {digest}")
+        raise ValueError(f"No fake structured output for {schema.__name__}")
+
+    def invoke(self, messages, **kwargs):
+        time.sleep(self.latency_seconds)
+        return self._respond(messages)
+
+    async def ainvoke(self, messages, **kwargs):
+        await asyncio.sleep(self.latency_seconds)
+        return self._respond(messages)
+
+    def with_structured_output(self, schema, **kwargs):
+        return FakeStructuredModel(self, schema)
+
+
+class FakeStructuredModel:
+    """Structured-output runnable of FakeChatModel."""
+
+    def __init__(self, model: FakeChatModel, schema):
+        self.model = model
+        self.schema = schema
+
+    def invoke(self, messages, **kwargs):
+        time.sleep(self.model.latency_seconds)
+        return self.model._structured(self.schema, messages)
+
+    async def ainvoke(self, messages, **kwargs):
+        await asyncio.sleep(self.model.latency_seconds)
+        return self.model._structured(self.schema, messages)
+
+
+class FakeTavilySearch:
+    """TavilySearch stand-in returning max_results results of a fixed size."""
+
+    def __init__(self, latency_seconds: float = 0.0, result_tokens: int = 300, max_results: int = 3):
+        self.latency_seconds = latency_seconds
+        self.result_tokens = result_tokens
+        self.max_results = max_results
+
+    def _results(self, query: str) -> dict:
+        return {
+            "query": query,
+            "results": [
+                {"url": f"https://example.com/{i}/{query.replace(' ', '-')}", "content": filler(self.result_tokens, f"{query}{i}")}
+                for i in range(self.max_results)
+            ]
+        }
+
+    def invoke(self, query: str):
+        time.sleep(self.latency_seconds)
+        return self._results(query)
+
+    async def ainvoke(self, query: str):
+        await asyncio.sleep(self.latency_seconds)
+        return self._results(query)
+
+
+def fake_wikipedia_client(latency_seconds: float = 0.0, page_tokens: int = 3000):
+    """Create a WikipediaClient on mock transports answering every MediaWiki request after a fixed latency."""
+    import httpx
+    from graph.retrieval.wikipedia import WikipediaClient
+
+    def page_text(title: str) -> str:
+        sections = "\n\n".join(f"== Section {n} ==\n{filler(page_tokens // 5, f'{title}{n}')}" for n in range(5))
+        return f"{filler(100, title)}\n\n{sections}"
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        if params.get("generator") == "search":
+            pages = []
+            for i in range(int(params["gsrlimit"])):
+                title = f"{params['gsrsearch']} {i}"
+                page = {"index": i + 1, "title": title, "fullurl": f"https://en.wikipedia.org/wiki/{i}"}
+                if params.get("exintro"):
+                    page["extract"] = filler(100, title)
+                pages.append(page)
+        else:
+            pages = [{"title": params["titles"], "extract": page_text(params["titles"])}]
+        return httpx.Response(200, json={"query": {"pages": pages}})
+
+    def handler(request):
+        time.sleep(latency_seconds)
+        return respond(request)
+
+    async def ahandler(request):
+        await asyncio.sleep(latency_seconds)
+        return respond(request)
+
+    return WikipediaClient(transport=httpx.MockTransport(handler), async_transport=httpx.MockTransport(ahandler))
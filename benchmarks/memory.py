@@ -0,0 +1,148 @@
+"""Memory benchmark: checkpoint bytes and RSS per interview for string context vs Document records.
+
+"strings" keeps an interview's context the way it was kept before Document
+records: one pre-rendered string per retrieval node and turn, reranked
+passages as rendered strings, and documents reused from the run's store
+rendered again into every interview. "documents" keeps the Document records
+the interview nodes store now, with reranked passages as indices into
+them. Each variant builds the same synthetic
+interviews in a fresh interpreter, so RSS is measured per variant:
+
+    python benchmarks/memory.py --interviews 20 --turns 3
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VARIANTS = ("strings", "documents")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--interviews", type=int, default=20, help="Interviews of the run.")
+    parser.add_argument("--turns", type=int, default=3, help="Retrieval turns per interview.")
+    parser.add_argument("--queries", type=int, default=3, help="Search queries per backend and turn.")
+    parser.add_argument("--web-results", type=int, default=3, help="Tavily results per web query.")
+    parser.add_argument("--result-tokens", type=int, default=300, help="Tokens per Tavily result.")
+    parser.add_argument("--wikipedia-chunks", type=int, default=4, help="Wikipedia chunks per query.")
+    parser.add_argument("--chunk-tokens", type=int, default=500, help="Tokens per Wikipedia chunk.")
+    parser.add_argument("--shared", type=float, default=0.5, help="Fraction of documents reused from the run's store.")
+    parser.add_argument("--top-k", type=int, default=8, help="Reranked passages kept per turn.")
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def rss_bytes() -> int:
+    """Current resident set size, from /proc on Linux and the peak elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def turn_documents(args, interview: int, turn: int, shared: list) -> list:
+    """(backend, documents) of one turn's retrieval nodes, with a share of them taken from the store."""
+    from benchmarks.fakes import filler
+    from graph.retrieval.documents import Document
+
+    batches = []
+    for backend, count in (("web", args.queries * args.web_results), ("wikipedia", args.queries * args.wikipedia_chunks)):
+        reused = int(count * args.shared)
+        documents = [shared[(interview + turn * count + i) % len(shared)] for i in range(reused)]
+        for i in range(reused, count):
+            seed = f"{interview}/{turn}/{backend}/{i}"
+            if backend == "web":
+                documents.append(Document("web", f"https://example.com/{seed}", filler(args.result_tokens, seed)))
+            else:
+                documents.append(Document(
+                    "wikipedia", f"https://en.wikipedia.org/wiki/{seed}", filler(args.chunk_tokens, seed),
+                    title=f"Page {seed}", section=f"Section {i}"
+                ))
+        batches.append((backend, documents))
+    return batches
+
+
+def build_interview(args, interview: int, shared: list, variant: str, serde) -> tuple:
+    """Build one interview's context channels turn by turn; return them with the bytes checkpointed."""
+    from graph.retrieval.documents import render_documents
+    from graph.retrieval.packing import unique_passages
+
+    context, ranked_context, checkpoint_bytes = [], [], 0
+    for turn in range(args.turns):
+        batches = turn_documents(args, interview, turn, shared)
+        documents = [document for _, batch in batches for document in batch]
+        if variant == "strings":
+            context = context + [render_documents(batch) for _, batch in batches]
+            # Passages selected for the answer; which ones does not change their size much
+            ranked_context = [passage.render() for passage in unique_passages(documents)[:args.top_k]]
+        else:
+            context = context + documents
+            ranked_context = list(range(args.top_k))
+        # Every turn's checkpoint writes the updated channels in full
+        for value in (context, ranked_context):
+            checkpoint_bytes += len(serde.dumps_typed(value)[1])
+    return (context, ranked_context), checkpoint_bytes
+
+
+def run_variant(args) -> dict:
+    """Build every interview of one variant and measure checkpoint bytes and RSS per interview."""
+    sys.path.insert(0, ROOT)
+    from benchmarks.fakes import filler
+    from graph.checkpointing import checkpoint_serde
+    from graph.retrieval.documents import Document
+
+    serde = checkpoint_serde()
+    shared = [
+        Document("web", f"https://example.com/shared/{i}", filler(args.result_tokens, f"shared{i}"))
+        for i in range(args.queries * args.web_results * 4)
+    ]
+    gc.collect()
+    baseline = rss_bytes()
+    states, checkpoint_bytes = [], 0
+    for interview in range(args.interviews):
+        state, written = build_interview(args, interview, shared, args.variant, serde)
+        states.append(state)
+        checkpoint_bytes += written
+    gc.collect()
+    return {
+        "checkpoint_kb_per_interview": round(checkpoint_bytes / args.interviews / 1024, 1),
+        "rss_kb_per_interview": round((rss_bytes() - baseline) / args.interviews / 1024, 1)
+    }
+
+
+def spawn_variant(variant: str) -> dict:
+    """Run a variant in a fresh interpreter with the same arguments."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--variant", variant],
+        env={**os.environ, "LOG_LEVEL": "WARNING"}, cwd=ROOT, capture_output=True, text=True
+    )
+    if output.returncode != 0:
+        raise RuntimeError(f"Variant {variant} failed:\n{output.stderr[-3000:]}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+    if args.variant:
+        print(json.dumps(run_variant(args)))
+        return 0
+
+    results = {variant: spawn_variant(variant) for variant in VARIANTS}
+    print(f"{'context':<12}{'checkpoint KB/interview':>26}{'RSS KB/interview':>20}")
+    for variant, measured in results.items():
+        print(f"{variant:<12}{measured['checkpoint_kb_per_interview']:>26}{measured['rss_kb_per_interview']:>20}")
+    before, after = results["strings"], results["documents"]
+    for metric in ("checkpoint_kb_per_interview", "rss_kb_per_interview"):
+        if before[metric] > 0:
+            print(f"{metric}: {after[metric] / before[metric]:.2f}x of strings")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Offline end-to-end benchmark of the research graph with fake LLM and search backends.
+
+Every grid point (analysts x interview turns x concurrency) runs in a fresh
+interpreter so that peak RSS is measured per point. Results can be stored as
+a baseline and later checked against it:
+
+    python benchmarks/offline.py --update-baseline
+    python benchmarks/offline.py --check
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Settings that change what is measured; a baseline only applies when they match
+FAKE_SETTINGS = ("runs", "use_async", "llm_latency", "search_latency", "response_tokens", "result_tokens", "page_tokens")
+
+
+def _ints(value: str) -> list:
+    return [int(item) for item in value.split(",")]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analysts", type=_ints, default=[1, 3], help="Comma-separated max_analysts values.")
+    parser.add_argument("--turns", type=_ints, default=[1, 2], help="Comma-separated MAX_INTERVIEW_TURNS values.")
+    parser.add_argument("--concurrency", type=_ints, default=[4, 32], help="Comma-separated MAX_CONCURRENCY values.")
+    parser.add_argument("--runs", type=int, default=10, help="Measured runs per grid point, after one warm-up run.")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Benchmark the asyncio path.")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Seconds per fake LLM call.")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Seconds per fake search call.")
+    parser.add_argument("--response-tokens", type=int, default=200, help="Tokens per fake LLM response.")
+    parser.add_argument("--result-tokens", type=int, default=300, help="Tokens per fake Tavily result.")
+    parser.add_argument("--page-tokens", type=int, default=3000, help="Tokens per fake Wikipedia page.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file for --check and --update-baseline.")
+    parser.add_argument("--check", action="store_true", help="Exit non-zero on regressions against the baseline.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.35, help="Allowed relative regression for --check.")
+    parser.add_argument("--point", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def install_fakes(settings: dict):
+    """Swap the LLM, Tavily and Wikipedia clients for deterministic fakes."""
+    import graph.retrieval.search as search
+    import graph.retrieval.wikipedia as wikipedia
+    from graph.chains.llm import llm
+    from fakes import FakeChatModel, FakeTavilySearch, fake_wikipedia_client
+    from config import WEB_SEARCH_MAX_RESULTS
+
+    llm._model = FakeChatModel(settings["llm_latency"], settings["response_tokens"], settings["analysts"])
+    tavily = FakeTavilySearch(settings["search_latency"], settings["result_tokens"], WEB_SEARCH_MAX_RESULTS)
+    search.get_tavily_search = lambda: tavily
+    wikipedia_client = fake_wikipedia_client(settings["search_latency"], settings["page_tokens"])
+    wikipedia.get_wikipedia_client = lambda: wikipedia_client
+
+
+def run_point(settings: dict) -> dict:
+    """Run one grid point in this interpreter and return its measurements."""
+    sys.path.insert(0, ROOT)
+    from graph.graph import build_research_graph
+    from graph.runner import run_research, arun_research
+
+    install_fakes(settings)
+    research_graph = build_research_graph(use_async=settings["use_async"])
+
+    def run_once(index: int) -> float:
+        thread = {"configurable": {"thread_id": f"bench-{index}"}, "max_concurrency": settings["concurrency"]}
+        topic = f"Why do people love cats on the Internet? (run {index})"
+        started = time.perf_counter()
+        if settings["use_async"]:
+            report = asyncio.run(arun_research(research_graph, topic, settings["analysts"], thread))
+        else:
+            report = run_research(research_graph, topic, settings["analysts"], thread)
+        if not report:
+            raise RuntimeError("benchmark run finished without a final report")
+        return time.perf_counter() - started
+
+    run_once(-1)
+    latencies = [run_once(index) for index in range(settings["runs"])]
+    ordered = sorted(latencies)
+    return {
+        "runs_per_second": round(len(latencies) / sum(latencies), 4),
+        "p50_seconds": round(statistics.median(latencies), 4),
+        "p95_seconds": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def point_id(settings: dict) -> str:
+    return f"analysts={settings['analysts']},turns={settings['turns']},concurrency={settings['concurrency']}"
+
+
+def spawn_point(settings: dict, cache_dir: str) -> dict:
+    """Run a grid point in a fresh interpreter configured through the environment."""
+    env = dict(os.environ)
+    env.update({
+        "MAX_INTERVIEW_TURNS": str(settings["turns"]),
+        "MAX_CONCURRENCY": str(settings["concurrency"]),
+        # Fake search results share one small vocabulary; keep every interview at its full turn count
+        "NOVELTY_THRESHOLD": "0",
+        "LLM_CACHE_ENABLED": "false",
+        "INTERVIEW_MEMO_ENABLED": "false",
+        "SEARCH_CACHE_PATH": os.path.join(cache_dir, f"search-{point_id(settings)}.sqlite"),
+        "LLM_REQUESTS_PER_MINUTE": "0",
+        "LLM_TOKENS_PER_MINUTE": "0",
+        "TAVILY_REQUESTS_PER_MINUTE": "0",
+        "WIKIPEDIA_REQUESTS_PER_SECOND": "0",
+        "LOG_LEVEL": "WARNING"
+    })
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--point", json.dumps(settings)],
+        env=env, cwd=ROOT, capture_output=True, text=True
+    )
+    if output.returncode != 0:
+        raise RuntimeError(f"Grid point {point_id(settings)} failed:\n{output.stderr[-3000:]}")
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """Compare results to a baseline and describe every regression beyond tolerance."""
+    problems = []
+    for point, measured in results.items():
+        expected = baseline.get(point)
+        if expected is None:
+            continue
+        if measured["runs_per_second"] < expected["runs_per_second"] * (1 - tolerance):
+            problems.append(f"{point}: runs/sec {measured['runs_per_second']} < baseline {expected['runs_per_second']}")
+        # p95 over a handful of runs is too noisy to gate on; it is reported only
+        for metric in ("p50_seconds", "peak_rss_mb"):
+            if measured[metric] > expected[metric] * (1 + tolerance):
+                problems.append(f"{point}: {metric} {measured[metric]} > baseline {expected[metric]}")
+    return problems
+
+
+def main():
+    args = parse_args()
+    if args.point:
+        print(json.dumps(run_point(json.loads(args.point))))
+        return 0
+
+    settings = {name: getattr(args, name) for name in FAKE_SETTINGS}
+    results = {}
+    print(f"{'grid point':<42}{'runs/s':>9}{'p50 s':>9}{'p95 s':>9}{'rss MB':>9}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for analysts, turns, concurrency in itertools.product(args.analysts, args.turns, args.concurrency):
+            point = {**settings, "analysts": analysts, "turns": turns, "concurrency": concurrency}
+            measured = spawn_point(point, cache_dir)
+            results[point_id(point)] = measured
+            print(
+                f"{point_id(point):<42}{measured['runs_per_second']:>9}{measured['p50_seconds']:>9}"
+                f"{measured['p95_seconds']:>9}{measured['peak_rss_mb']:>9}"
+            )
+
+    report = {"settings": settings, "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to: {args.baseline}")
+
+    if args.check:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["settings"] != settings:
+            print("Baseline was recorded with different fake settings; rerun with --update-baseline")
+            return 1
+        problems = regressions(results, baseline["results"], args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
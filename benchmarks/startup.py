@@ -0,0 +1,91 @@
+"""Cold-start benchmark: time from ``import main`` to the first executed node.
+
+Each run happens in a fresh interpreter so that import costs are measured
+cold. The LLM is replaced by a canned response, so no network is used.
+
+    python benchmarks/startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child():
+    """Measure one cold start and print the phase timings as JSON."""
+    started = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    import main  # noqa: F401
+    imported = time.perf_counter()
+
+    from langgraph.checkpoint.memory import MemorySaver
+    from graph.graph import get_graph, build_research_graph
+    checkpointer = MemorySaver()
+    research_graph = get_graph("research", checkpointer)
+    built = time.perf_counter()
+
+    import graph.nodes.analyst_nodes as analyst_nodes
+    from graph.models import Analyst, Perspectives
+
+    class CannedLLM:
+        def with_structured_output(self, schema):
+            return self
+
+        def invoke(self, messages):
+            return Perspectives(analysts=[
+                Analyst(affiliation="Bench", name="Bench", role="Benchmark", description="Benchmark analyst")
+            ])
+
+    analyst_nodes.llm = CannedLLM()
+    thread = {"configurable": {"thread_id": "startup"}}
+    for _ in research_graph.stream({"topic": "Benchmark", "max_analysts": 1}, thread, stream_mode="updates"):
+        break
+    first_node = time.perf_counter()
+
+    # Repeated builds: the factory returns the compiled graph, a plain build recompiles
+    factory_started = time.perf_counter()
+    get_graph("research", checkpointer)
+    factory_hit = time.perf_counter() - factory_started
+    rebuild_started = time.perf_counter()
+    build_research_graph(checkpointer=checkpointer)
+    rebuild = time.perf_counter() - rebuild_started
+
+    print(json.dumps({
+        "import": imported - started,
+        "build": built - imported,
+        "first_node": first_node - built,
+        "total": first_node - started,
+        "factory_hit": factory_hit,
+        "rebuild": rebuild
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child()
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'phase':<14}{'median ms':>12}{'min ms':>12}")
+    for phase in runs[0]:
+        values = [run[phase] * 1000 for run in runs]
+        print(f"{phase:<14}{statistics.median(values):>12.1f}{min(values):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,13 @@ MODEL_NAME = os.getenv("MODEL_NAME", "gemini-2.0-flash-lite")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 
+# LLM Cache Configuration
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+LLM_CACHE_MAX_AGE_SECONDS = int(os.getenv("LLM_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
 # LangSmith Tracing (Optional)
 LANGSMITH_TRACING = os.getenv("LANGSMITH_TRACING")
 LANGSMITH_ENDPOINT = os.getenv("LANGSMITH_ENDPOINT")
@@ -18,16 +25,114 @@ LANGSMITH_PROJECT = os.getenv("LANGSMITH_PROJECT")
 # Search Configuration
 WEB_SEARCH_MAX_RESULTS = int(os.getenv("WEB_SEARCH_MAX_RESULTS", "3"))
 WIKIPEDIA_MAX_DOCS = int(os.getenv("WIKIPEDIA_MAX_DOCS", "2"))
+WIKIPEDIA_MODE = os.getenv("WIKIPEDIA_MODE", "chunks")  # chunks, summary or full
+WIKIPEDIA_CHUNK_TOKENS = int(os.getenv("WIKIPEDIA_CHUNK_TOKENS", "300"))
+WIKIPEDIA_CHUNK_OVERLAP_TOKENS = int(os.getenv("WIKIPEDIA_CHUNK_OVERLAP_TOKENS", "50"))
+WIKIPEDIA_TOP_K_CHUNKS = int(os.getenv("WIKIPEDIA_TOP_K_CHUNKS", "4"))
+# MediaWiki API used for Wikipedia search and page extracts, on a pool of keep-alive connections
+WIKIPEDIA_API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+WIKIPEDIA_MAX_CONNECTIONS = int(os.getenv("WIKIPEDIA_MAX_CONNECTIONS", "10"))
+WIKIPEDIA_HTTP_TIMEOUT_SECONDS = float(os.getenv("WIKIPEDIA_HTTP_TIMEOUT_SECONDS", "15"))
+WIKIPEDIA_USER_AGENT = os.getenv("WIKIPEDIA_USER_AGENT", "lg-foundations-research-agent/0.1 (https://www.mediawiki.org/wiki/API:Etiquette)")
+# Seconds a search may take before the turn proceeds with a stale cached result or none (0 disables)
+TAVILY_TIMEOUT_SECONDS = float(os.getenv("TAVILY_TIMEOUT_SECONDS", "10"))
+WIKIPEDIA_TIMEOUT_SECONDS = float(os.getenv("WIKIPEDIA_TIMEOUT_SECONDS", "6"))
+
+# Retrieval backends queried in every interview turn: web, wikipedia, local
+RETRIEVAL_BACKENDS = [name.strip() for name in os.getenv("RETRIEVAL_BACKENDS", "web,wikipedia").split(",") if name.strip()]
+# Queries planned per backend and turn, fetched concurrently; each extra one costs a search per backend
+QUERIES_PER_TURN = int(os.getenv("QUERIES_PER_TURN", "1"))
+
+# Local BM25 Index Configuration (build with `python main.py --build-index CORPUS_DIR`)
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", ".cache/local_index")
+LOCAL_CHUNK_TOKENS = int(os.getenv("LOCAL_CHUNK_TOKENS", "200"))
+LOCAL_TOP_K = int(os.getenv("LOCAL_TOP_K", "5"))
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+# Search Cache Configuration
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", ".cache/search_cache.sqlite")
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+SEARCH_CACHE_MEMORY_ENTRIES = int(os.getenv("SEARCH_CACHE_MEMORY_ENTRIES", "512"))
+TAVILY_CACHE_TTL_SECONDS = int(os.getenv("TAVILY_CACHE_TTL_SECONDS", str(6 * 3600)))
+WIKIPEDIA_CACHE_TTL_SECONDS = int(os.getenv("WIKIPEDIA_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Context Packing Configuration (approximate LLM tokens)
+ANSWER_CONTEXT_TOKEN_BUDGET = int(os.getenv("ANSWER_CONTEXT_TOKEN_BUDGET", "6000"))
+SECTION_CONTEXT_TOKEN_BUDGET = int(os.getenv("SECTION_CONTEXT_TOKEN_BUDGET", "12000"))
+
+# Run-scoped Document Store (queries this similar to an earlier one in the run reuse its documents)
+DOCUMENT_STORE_QUERY_SIMILARITY = float(os.getenv("DOCUMENT_STORE_QUERY_SIMILARITY", "0.85"))
+# Stores are held until their run finishes or fails; more than this many is logged as a leak
+DOCUMENT_STORE_MAX_RUNS = int(os.getenv("DOCUMENT_STORE_MAX_RUNS", "64"))
+
+# Reranking Configuration (local hashing embeddings between retrieval and answering)
+RERANK_TOP_K = int(os.getenv("RERANK_TOP_K", "8"))
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "2048"))
+EMBEDDING_CACHE_ENTRIES = int(os.getenv("EMBEDDING_CACHE_ENTRIES", "20000"))
 
 # Interview Configuration
 MAX_INTERVIEW_TURNS = int(os.getenv("MAX_INTERVIEW_TURNS", "2"))
+# Stop an interview early when less than this fraction of a turn's passages is new (0 disables)
+NOVELTY_THRESHOLD = float(os.getenv("NOVELTY_THRESHOLD", "0.2"))
+# Cosine similarity above which a passage counts as a near-duplicate of earlier context
+NOVELTY_DUPLICATE_SIMILARITY = float(os.getenv("NOVELTY_DUPLICATE_SIMILARITY", "0.9"))
+
+# Seconds after the interviews start at which the report proceeds without stragglers once
+# INTERVIEW_QUORUM (fraction of the analysts) of the interviews has finished (0 disables)
+INTERVIEW_DEADLINE_SECONDS = float(os.getenv("INTERVIEW_DEADLINE_SECONDS", "300"))
+INTERVIEW_QUORUM = float(os.getenv("INTERVIEW_QUORUM", "0.5"))
+# Trackers of late interviews are held until their run finishes or fails; more than this many is logged as a leak
+INTERVIEW_TRACKER_MAX_RUNS = int(os.getenv("INTERVIEW_TRACKER_MAX_RUNS", "64"))
+
+# Interview Memo Configuration (opt-in; finished interviews reused when a topic is researched again)
+INTERVIEW_MEMO_ENABLED = os.getenv("INTERVIEW_MEMO_ENABLED", "false").lower() in ("1", "true", "yes")
+INTERVIEW_MEMO_PATH = os.getenv("INTERVIEW_MEMO_PATH", ".cache/interview_memo.sqlite")
+INTERVIEW_MEMO_MAX_BYTES = int(os.getenv("INTERVIEW_MEMO_MAX_BYTES", str(64 * 1024 * 1024)))
+INTERVIEW_MEMO_MAX_AGE_SECONDS = int(os.getenv("INTERVIEW_MEMO_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+# Persona cosine similarity at which a changed analyst still reuses the earlier interview
+INTERVIEW_REUSE_SIMILARITY = float(os.getenv("INTERVIEW_REUSE_SIMILARITY", "0.9"))
+
+# Report Configuration: sections over REPORT_DIGEST_TOKEN_BUDGET in total are tree-reduced in
+# parallel batches of REPORT_FAN_IN memos until they fit the budget
+REPORT_FAN_IN = int(os.getenv("REPORT_FAN_IN", "5"))
+REPORT_DIGEST_TOKEN_BUDGET = int(os.getenv("REPORT_DIGEST_TOKEN_BUDGET", "12000"))
+# Write introduction and conclusion with one structured call instead of two
+REPORT_COMBINED_FRAMING = os.getenv("REPORT_COMBINED_FRAMING", "true").lower() in ("1", "true", "yes")
+
+# Concurrency Configuration
+MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "32"))
+
+# Rate Limit and Retry Configuration (0 disables a limit)
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "300"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+TAVILY_REQUESTS_PER_MINUTE = float(os.getenv("TAVILY_REQUESTS_PER_MINUTE", "100"))
+WIKIPEDIA_REQUESTS_PER_SECOND = float(os.getenv("WIKIPEDIA_REQUESTS_PER_SECOND", "5"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "5"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1.0"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "30.0"))
+
+# Checkpoint Configuration
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "memory")  # memory or sqlite
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", ".cache/checkpoints.sqlite")
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "20"))
+CHECKPOINT_FINISHED_TTL_SECONDS = int(os.getenv("CHECKPOINT_FINISHED_TTL_SECONDS", str(24 * 3600)))
+
+# Batch Configuration
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", "4"))
+BATCH_OUTPUT_DIR = os.getenv("BATCH_OUTPUT_DIR", "reports")
+
+# Metrics Configuration
+METRICS_DIR = os.getenv("METRICS_DIR", "metrics")
 
 # Logging Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
-# Validation
-if not GOOGLE_API_KEY:
-    raise ValueError("GOOGLE_API_KEY environment variable is required")
-if not TAVILY_API_KEY:
-    raise ValueError("TAVILY_API_KEY environment variable is required")
+
+def require_api_key(name: str) -> str:
+    """Return a required API key, validated when its client is first built."""
+    value = os.getenv(name)
+    if not value:
+        raise ValueError(f"{name} environment variable is required")
+    return value
 
@@ -0,0 +1,197 @@
+"""Batch research mode: many topics per process with a bounded scheduler."""
+import asyncio
+import csv
+import json
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from langgraph.checkpoint.memory import MemorySaver
+from graph.runner import run_research, arun_research
+from graph.logging_config import logger
+from config import MAX_CONCURRENCY
+
+
+def _slug(text: str) -> str:
+    """Lowercase text reduced to letters, digits and single dashes, safe as a file name."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _parse_line(line: str):
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return e
+
+
+def _job(index: int, record, default_max_analysts: int) -> dict:
+    """Validate one record into a job; an invalid one gets an error instead of failing the batch."""
+    if not isinstance(record, dict):
+        reason = f"invalid JSON: {record}" if isinstance(record, Exception) else "record is not an object"
+        return {"id": f"{index:05d}", "topic": "", "error": reason}
+    topic = str(record.get("topic") or "").strip()
+    job_id = _slug(str(record.get("id") or "")) or f"{index:05d}-{_slug(topic)[:40]}".rstrip("-")
+    if not topic:
+        return {"id": job_id, "topic": "", "error": "record has no topic"}
+    try:
+        return {"id": job_id, "topic": topic, "max_analysts": int(record.get("max_analysts") or default_max_analysts)}
+    except (TypeError, ValueError):
+        return {"id": job_id, "topic": topic, "error": f"invalid max_analysts: {record['max_analysts']}"}
+
+
+def load_topics(path: str, default_max_analysts: int) -> list:
+    """Load research jobs from a JSONL or CSV file.
+
+    Each record needs a ``topic``; ``max_analysts`` and ``id`` are optional.
+    Ids are slugified so reports stay inside the output directory. Invalid
+    records and duplicate ids become jobs with an ``error``, which the
+    batch reports as failed without running them.
+    """
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            records = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            records = [_parse_line(line) for line in f if line.strip()]
+
+    jobs, seen = [], set()
+    for index, record in enumerate(records):
+        job = _job(index, record, default_max_analysts)
+        if job["id"] in seen and "error" not in job:
+            job["error"] = f"duplicate id {job['id']}"
+        seen.add(job["id"])
+        jobs.append(job)
+    return jobs
+
+
+def _thread(job: dict) -> dict:
+    """A fresh thread per attempt, so a rerun never continues an earlier run's checkpoints."""
+    thread_id = f"batch-{job['id']}-{uuid.uuid4().hex[:8]}"
+    return {"configurable": {"thread_id": thread_id}, "max_concurrency": MAX_CONCURRENCY}
+
+
+def _save_report(job: dict, final_report: str, output_dir: str) -> str:
+    path = os.path.join(output_dir, f"{job['id']}.md")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(final_report)
+    return path
+
+
+def _release_memory_checkpoints(research_graph, thread: dict):
+    """Drop a finished topic's checkpoints from an in-memory checkpointer.
+
+    They cannot be resumed once the batch process exits, and would
+    otherwise pile up for every topic of the batch. SQLite checkpoints are
+    left to CheckpointRetention.
+    """
+    checkpointer = getattr(research_graph, "checkpointer", None)
+    if isinstance(checkpointer, MemorySaver):
+        checkpointer.delete_thread(thread["configurable"]["thread_id"])
+
+
+def _result(job: dict, started: float, report_path=None, error=None) -> dict:
+    return {
+        "id": job["id"],
+        "topic": job["topic"],
+        "status": "ok" if error is None else "failed",
+        "wall_time_seconds": round(time.perf_counter() - started, 3),
+        "report_path": report_path,
+        "error": error
+    }
+
+
+def run_job(research_graph, job: dict, output_dir: str, retention=None) -> dict:
+    """Run one topic and write its report as soon as it finishes."""
+    started = time.perf_counter()
+    if "error" in job:
+        logger.error(f"Topic {job['id']} skipped: {job['error']}")
+        return _result(job, started, error=job["error"])
+    thread = _thread(job)
+    try:
+        final_report = run_research(research_graph, job["topic"], job["max_analysts"], thread)
+        if not final_report:
+            raise RuntimeError("graph finished without a final report")
+        result = _result(job, started, report_path=_save_report(job, final_report, output_dir))
+        if retention:
+            retention.mark_finished(thread["configurable"]["thread_id"])
+    except Exception as e:
+        logger.error(f"Topic {job['id']} failed: {e}")
+        result = _result(job, started, error=f"{type(e).__name__}: {e}")
+    _release_memory_checkpoints(research_graph, thread)
+    logger.info(f"Topic {job['id']} {result['status']} in {result['wall_time_seconds']}s")
+    return result
+
+
+async def arun_job(research_graph, job: dict, output_dir: str, retention=None) -> dict:
+    """Run one topic on the asyncio path and write its report as soon as it finishes."""
+    started = time.perf_counter()
+    if "error" in job:
+        logger.error(f"Topic {job['id']} skipped: {job['error']}")
+        return _result(job, started, error=job["error"])
+    thread = _thread(job)
+    try:
+        final_report = await arun_research(research_graph, job["topic"], job["max_analysts"], thread)
+        if not final_report:
+            raise RuntimeError("graph finished without a final report")
+        result = _result(job, started, report_path=_save_report(job, final_report, output_dir))
+        if retention:
+            retention.mark_finished(thread["configurable"]["thread_id"])
+    except Exception as e:
+        logger.error(f"Topic {job['id']} failed: {e}")
+        result = _result(job, started, error=f"{type(e).__name__}: {e}")
+    _release_memory_checkpoints(research_graph, thread)
+    logger.info(f"Topic {job['id']} {result['status']} in {result['wall_time_seconds']}s")
+    return result
+
+
+def summarize(results: list, wall_time: float) -> dict:
+    """Aggregate per-topic results into a batch summary."""
+    times = sorted(result["wall_time_seconds"] for result in results)
+    failures = [result for result in results if result["status"] != "ok"]
+    return {
+        "topics": len(results),
+        "succeeded": len(results) - len(failures),
+        "failed": len(failures),
+        "wall_time_seconds": round(wall_time, 3),
+        "topic_time_p50_seconds": times[len(times) // 2] if times else 0.0,
+        "topic_time_max_seconds": times[-1] if times else 0.0,
+        "results": results
+    }
+
+
+def run_batch(research_graph, jobs: list, output_dir: str, max_in_flight: int, retention=None) -> dict:
+    """Run jobs on a bounded thread pool and return the batch summary."""
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        futures = [executor.submit(run_job, research_graph, job, output_dir, retention) for job in jobs]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return _write_summary(results, started, output_dir)
+
+
+async def arun_batch(research_graph, jobs: list, output_dir: str, max_in_flight: int, retention=None) -> dict:
+    """Run jobs as coroutines with at most max_in_flight topics at a time."""
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def bounded(job):
+        async with semaphore:
+            return await arun_job(research_graph, job, output_dir, retention)
+
+    results = await asyncio.gather(*[bounded(job) for job in jobs])
+    return _write_summary(list(results), started, output_dir)
+
+
+def _write_summary(results: list, started: float, output_dir: str) -> dict:
+    summary = summarize(results, time.perf_counter() - started)
+    with open(os.path.join(output_dir, "summary.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    logger.info(
+        f"Batch finished: {summary['succeeded']}/{summary['topics']} topics succeeded "
+        f"in {summary['wall_time_seconds']}s"
+    )
+    return summary
@@ -0,0 +1,258 @@
+"""On-disk key/value cache used by the LLM and search layers."""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class DiskCache:
+    """SQLite-backed string cache with age and size based eviction."""
+
+    # Run a full eviction pass every N writes instead of on every write
+    EVICT_EVERY = 64
+
+    def __init__(self, path: str, max_bytes: int, max_age_seconds: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.RLock()
+        self._connection = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Open the database on first use so that constructing a cache is free."""
+        with self._lock:
+            if self._connection is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache ("
+                    " key TEXT PRIMARY KEY,"
+                    " value TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " accessed_at REAL NOT NULL)"
+                )
+                conn.commit()
+                self._connection = conn
+                self.evict()
+            return self._connection
+
+    def get(self, key: str, max_age_seconds: Optional[float] = None) -> Optional[str]:
+        """Return the cached value for key, or None if missing or expired."""
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > max_age:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        """Store value under key, evicting old entries periodically."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            evict = self._writes % self.EVICT_EVERY == 0
+        if evict:
+            self.evict()
+
+    def update(self, key: str, fn: Callable) -> str:
+        """Atomically replace the value under key with fn(current value, or None if missing or expired)."""
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            # An immediate transaction also keeps other processes from interleaving their updates
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT value, created_at FROM cache WHERE key = ?", (key,)).fetchone()
+                value = fn(row[0] if row is not None and now - row[1] <= self.max_age_seconds else None)
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, value, len(value), now, now)
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            self._writes += 1
+            evict = self._writes % self.EVICT_EVERY == 0
+        if evict:
+            self.evict()
+        return value
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE created_at < ?",
+                (time.time() - self.max_age_seconds,)
+            )
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT key, size FROM cache ORDER BY accessed_at ASC"
+                ).fetchall()
+                stale = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                self._conn.executemany("DELETE FROM cache WHERE key = ?", stale)
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return the value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl_seconds: float):
+        """Store value under key for ttl_seconds."""
+        with self._lock:
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class _Call:
+    """In-flight call shared by SingleFlight waiters."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution."""
+
+    def __init__(self):
+        self.shared = 0
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable):
+        """Run fn once per key at a time; concurrent callers share its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    async def ado(self, key: str, fn: Callable):
+        """Await fn() once per key and event loop; concurrent callers share its result."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._async_calls.get((loop, key))
+            leader = future is None
+            if leader:
+                future = loop.create_future()
+                self._async_calls[(loop, key)] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled rather than this caller, so make the call again
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.ado(key, fn)
+                raise
+
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no caller was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._async_calls[(loop, key)]
+            # A cancelled leader must still release the callers waiting on it
+            if not future.done():
+                future.cancel()
+        return result
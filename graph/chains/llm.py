@@ -1,7 +1,201 @@
 """LLM initialization and configuration."""
-from langchain_google_genai import ChatGoogleGenerativeAI
-from config import MODEL_NAME
+import hashlib
+import json
+import threading
+from typing import Callable
+from langchain_core.messages import convert_to_messages, message_to_dict, messages_from_dict
+from pydantic import BaseModel
+from graph.cache import DiskCache
+from graph.ratelimit import call_with_backoff, acall_with_backoff
+from graph.retrieval.text import estimate_tokens
+from graph.metrics import metrics
+from graph.logging_config import logger
+from config import (
+    require_api_key,
+    MODEL_NAME,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_BYPASS,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_MAX_AGE_SECONDS
+)
 
-# Initialize the LLM
-llm = ChatGoogleGenerativeAI(model=MODEL_NAME)
 
+def cache_key(model_name: str, messages, schema=None) -> str:
+    """Build a content-addressed key from model, prompt messages and output schema."""
+    serialized_messages = [
+        {"type": message.type, "name": message.name, "content": message.content}
+        for message in convert_to_messages(messages)
+    ]
+    if schema is None:
+        serialized_schema = None
+    elif isinstance(schema, type) and issubclass(schema, BaseModel):
+        serialized_schema = schema.model_json_schema()
+    else:
+        serialized_schema = schema
+    payload = json.dumps(
+        {"model": model_name, "messages": serialized_messages, "schema": serialized_schema},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def request_costs(messages) -> dict:
+    """Rate-limit costs of one LLM request, counting estimated prompt tokens."""
+    tokens = sum(estimate_tokens(str(message.content)) for message in convert_to_messages(messages))
+    return {"llm_requests": 1, "llm_tokens": tokens}
+
+
+class CachedChatModel:
+    """Chat model wrapper that serves repeated prompts from a persistent cache."""
+
+    def __init__(
+        self,
+        model,
+        model_name: str,
+        cache: DiskCache = None,
+        bypass: bool = False,
+        model_factory: Callable = None
+    ):
+        self._model = model
+        self._model_factory = model_factory
+        self.model_name = model_name
+        self.cache = cache
+        self.bypass = bypass
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        """The wrapped chat model, built by model_factory on first access."""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._model_factory()
+        return self._model
+
+    def _lookup(self, key: str):
+        if self.cache is None or self.bypass:
+            return None
+        return self.cache.get(key)
+
+    def _store(self, key: str, value: str):
+        if self.cache is not None:
+            self.cache.set(key, value)
+
+    def invoke(self, messages, **kwargs):
+        """Invoke the model, returning a cached AIMessage when available."""
+        key = cache_key(self.model_name, messages)
+        cached = self._lookup(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit: {key[:12]}")
+            metrics.record_call("llm", cache_hit=True)
+            return messages_from_dict([json.loads(cached)])[0]
+
+        response = call_with_backoff("llm", lambda: self.model.invoke(messages, **kwargs), request_costs(messages))
+        self._store(key, json.dumps(message_to_dict(response)))
+        return response
+
+    async def ainvoke(self, messages, **kwargs):
+        """Asynchronously invoke the model, returning a cached AIMessage when available."""
+        key = cache_key(self.model_name, messages)
+        cached = self._lookup(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit: {key[:12]}")
+            metrics.record_call("llm", cache_hit=True)
+            return messages_from_dict([json.loads(cached)])[0]
+
+        response = await acall_with_backoff(
+            "llm", lambda: self.model.ainvoke(messages, **kwargs), request_costs(messages)
+        )
+        self._store(key, json.dumps(message_to_dict(response)))
+        return response
+
+    def with_structured_output(self, schema, **kwargs):
+        """Return a cached runnable enforcing the given output schema."""
+        return CachedStructuredModel(self, schema, **kwargs)
+
+    def stats(self) -> dict:
+        """Return cache hit/miss counters."""
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "entries": 0}
+        return self.cache.stats()
+
+
+class CachedStructuredModel:
+    """Structured-output runnable that shares its parent's cache.
+
+    The wrapped runnable is only built on the first cache miss, so a fully
+    cached run never loads the chat model.
+    """
+
+    def __init__(self, parent: CachedChatModel, schema, **kwargs):
+        self.parent = parent
+        self.schema = schema
+        self._kwargs = kwargs
+        self._runnable = None
+        self._lock = threading.Lock()
+
+    @property
+    def runnable(self):
+        """The parent's model with structured output, built on first access."""
+        if self._runnable is None:
+            with self._lock:
+                if self._runnable is None:
+                    self._runnable = self.parent.model.with_structured_output(self.schema, **self._kwargs)
+        return self._runnable
+
+    def invoke(self, messages, **kwargs):
+        """Invoke the structured model, returning a cached result when available."""
+        key = cache_key(self.parent.model_name, messages, self.schema)
+        cached = self.parent._lookup(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit: {key[:12]}")
+            metrics.record_call("llm", cache_hit=True)
+            return self._load(cached)
+
+        result = call_with_backoff("llm", lambda: self.runnable.invoke(messages, **kwargs), request_costs(messages))
+        self.parent._store(key, self._dump(result))
+        return result
+
+    async def ainvoke(self, messages, **kwargs):
+        """Asynchronously invoke the structured model, returning a cached result when available."""
+        key = cache_key(self.parent.model_name, messages, self.schema)
+        cached = self.parent._lookup(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit: {key[:12]}")
+            metrics.record_call("llm", cache_hit=True)
+            return self._load(cached)
+
+        result = await acall_with_backoff(
+            "llm", lambda: self.runnable.ainvoke(messages, **kwargs), request_costs(messages)
+        )
+        self.parent._store(key, self._dump(result))
+        return result
+
+    def _dump(self, result) -> str:
+        if isinstance(result, BaseModel):
+            return result.model_dump_json()
+        return json.dumps(result, default=str)
+
+    def _load(self, value: str):
+        if isinstance(self.schema, type) and issubclass(self.schema, BaseModel):
+            return self.schema.model_validate_json(value)
+        return json.loads(value)
+
+
+def _create_chat_model():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    require_api_key("GOOGLE_API_KEY")
+    # Retries go through graph.ratelimit; 1 means a single attempt in the Google SDK
+    return ChatGoogleGenerativeAI(model=MODEL_NAME, max_retries=1)
+
+
+# Process-wide LLM; the Google client and SDK are only loaded on the first call
+llm = CachedChatModel(
+    None,
+    model_name=MODEL_NAME,
+    cache=DiskCache(LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES, LLM_CACHE_MAX_AGE_SECONDS) if LLM_CACHE_ENABLED else None,
+    bypass=LLM_CACHE_BYPASS,
+    model_factory=_create_chat_model
+)
@@ -17,10 +17,14 @@ Continue to ask questions to drill down and refine your understanding of the top
 When you are satisfied with your understanding, complete the interview with: "Thank you so much for your help!"
 Remember to stay in character throughout your response, reflecting the persona and goals provided to you."""
 
-SEARCH_INSTRUCTIONS = """You will be given a conversation between an analyst and an expert. 
-Your goal is to generate a well-structured query for use in retrieval and / or web-search related to the conversation.            
+QUERY_PLANNER_INSTRUCTIONS = """You will be given a conversation between an analyst and an expert. 
+Your goal is to plan well-structured queries for use in retrieval and / or web-search related to the conversation.
 First, analyze the full conversation. Pay particular attention to the final question posed by the analyst.
-Convert this final question into a well-structured web search query"""
+Convert this final question into {num_queries} diverse, well-structured general search queries that
+approach it from different angles: put the best one in search_query and the others in alternative_queries.
+Then, where it helps, write queries tailored to each of these retrieval backends:
+{backends}
+Only use the backend names listed above."""
 
 ANSWER_INSTRUCTIONS = """You are an expert being interviewed by an analyst.
 Here is analyst area of focus: {goals}. 
@@ -94,6 +98,15 @@ To format your report:
 [2] Source 2
 Here are the memos from your analysts to build your report from: {context}"""
 
+DIGEST_INSTRUCTIONS = """You are a technical writer condensing analyst memos for a report on this overall topic: {topic}
+You will be given a batch of memos. Merge them into a single memo that:
+    1. Keeps every distinct insight, dropping only repetition.
+    2. Preserves the citations, annotated in brackets, for example [1] or [2], renumbering them so they are consistent across the merged memo.
+    3. Ends with one combined list of sources under a `## Sources` header, without duplicates.
+    4. Uses markdown formatting, with no pre-amble and no analyst names.
+    5. Stays under {max_words} words.
+Here are the memos to merge: {context}"""
+
 INTRO_CONCLUSION_INSTRUCTIONS = """You are a technical writer finishing a report on {topic}
 You will be given all of the sections of the report.
 You job is to write a crisp and compelling introduction or conclusion section.
@@ -106,3 +119,13 @@ For your introduction, use ## Introduction as the section header.
 For your conclusion, use ## Conclusion as the section header.
 Here are the sections to reflect on for writing: {formatted_str_sections}"""
 
+FRAMING_INSTRUCTIONS = """You are a technical writer finishing a report on {topic}
+You will be given all of the sections of the report.
+You job is to write both a crisp and compelling introduction and a conclusion for the report.
+Include no pre-amble for either section.
+Target around 100 words each, crisply previewing (introduction) and recapping (conclusion) all of the sections of the report.
+Use markdown formatting.
+For the introduction, create a compelling title and use the # header for the title, then use ## Introduction as the section header.
+For the conclusion, use ## Conclusion as the section header.
+Here are the sections to reflect on for writing: {formatted_str_sections}"""
+
@@ -0,0 +1,147 @@
+"""Pluggable checkpointers with SQLite retention for crash resume."""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from graph.logging_config import logger
+from config import (
+    CHECKPOINT_BACKEND,
+    CHECKPOINT_PATH,
+    CHECKPOINT_KEEP_LAST,
+    CHECKPOINT_FINISHED_TTL_SECONDS
+)
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return sqlite3.connect(path, check_same_thread=False)
+
+
+# Project types kept in graph state, allowed through msgpack deserialization of checkpoints
+STATE_TYPES = (("graph.models", "Analyst"), ("graph.retrieval.documents", "Document"))
+
+
+def checkpoint_serde() -> JsonPlusSerializer:
+    """Checkpoint serializer that restores the project's state types."""
+    return JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES)
+
+
+def get_checkpointer(backend: str = CHECKPOINT_BACKEND, path: str = CHECKPOINT_PATH, use_async: bool = False):
+    """Create a checkpointer for the configured backend ("memory" or "sqlite")."""
+    if backend == "memory":
+        return MemorySaver(serde=checkpoint_serde())
+    if backend != "sqlite":
+        raise ValueError(f"Unknown checkpoint backend: {backend}")
+    if use_async:
+        raise ValueError("Async graphs need aopen_checkpointer() for the sqlite backend")
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    saver = SqliteSaver(_connect(path), serde=checkpoint_serde())
+    saver.setup()
+    return saver
+
+
+@asynccontextmanager
+async def aopen_checkpointer(backend: str = CHECKPOINT_BACKEND, path: str = CHECKPOINT_PATH):
+    """Open a checkpointer for async graphs and close its connection on exit.
+
+    The async SQLite saver binds to the running event loop, so graphs using
+    it must be built inside that loop.
+    """
+    if backend != "sqlite":
+        yield get_checkpointer(backend, path)
+        return
+
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as saver:
+        saver.serde = checkpoint_serde()
+        yield saver
+
+
+class CheckpointRetention:
+    """Retention policy for a SQLite checkpoint database.
+
+    Keeps the last ``keep_last`` checkpoints per thread and namespace, and drops
+    threads entirely once they have been finished for ``finished_ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: str = CHECKPOINT_PATH,
+        keep_last: int = CHECKPOINT_KEEP_LAST,
+        finished_ttl_seconds: float = CHECKPOINT_FINISHED_TTL_SECONDS
+    ):
+        self.path = path
+        self.keep_last = keep_last
+        self.finished_ttl_seconds = finished_ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS finished_threads ("
+            " thread_id TEXT PRIMARY KEY,"
+            " finished_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _has_checkpoint_tables(self) -> bool:
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('checkpoints', 'writes')"
+        ).fetchone()
+        return row[0] == 2
+
+    def mark_finished(self, thread_id: str):
+        """Record that a thread produced its final report."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO finished_threads (thread_id, finished_at) VALUES (?, ?)",
+                (thread_id, time.time())
+            )
+            self._conn.commit()
+
+    def prune(self) -> dict:
+        """Apply the retention policy and return how many rows were removed."""
+        with self._lock:
+            return self._prune()
+
+    def _prune(self) -> dict:
+        if not self._has_checkpoint_tables():
+            return {"threads": 0, "checkpoints": 0}
+
+        cutoff = time.time() - self.finished_ttl_seconds
+        expired = [
+            row[0] for row in self._conn.execute(
+                "SELECT thread_id FROM finished_threads WHERE finished_at < ?", (cutoff,)
+            )
+        ]
+        for thread_id in expired:
+            self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM finished_threads WHERE thread_id = ?", (thread_id,))
+
+        # Checkpoint ids are time-ordered, so the newest sort last
+        stale = self._conn.execute(
+            "SELECT thread_id, checkpoint_ns, checkpoint_id FROM ("
+            " SELECT thread_id, checkpoint_ns, checkpoint_id, ROW_NUMBER() OVER ("
+            "  PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC) AS position"
+            " FROM checkpoints)"
+            " WHERE position > ?",
+            (self.keep_last,)
+        ).fetchall()
+        self._conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", stale
+        )
+        self._conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?", stale
+        )
+        self._conn.commit()
+
+        logger.info(f"Pruned {len(expired)} finished threads and {len(stale)} old checkpoints")
+        return {"threads": len(expired), "checkpoints": len(stale)}
@@ -0,0 +1,62 @@
+"""Global concurrency limit and fan-out helpers for outbound calls."""
+import asyncio
+import contextvars
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from config import MAX_CONCURRENCY
+
+# Set in the context of an interview left running in the background, so that it can be stopped
+cancel_event = contextvars.ContextVar("cancel_event", default=None)
+
+
+class BranchCancelled(Exception):
+    """Raised when a node of a cancelled background branch is about to run."""
+
+
+def raise_if_cancelled():
+    """Raise BranchCancelled if the branch running this code has been cancelled."""
+    event = cancel_event.get()
+    if event is not None and event.is_set():
+        raise BranchCancelled()
+
+
+# One semaphore per event loop, since asyncio primitives are loop-bound
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_semaphore() -> asyncio.Semaphore:
+    """Return the concurrency semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+@asynccontextmanager
+async def concurrency_limit():
+    """Hold one of the MAX_CONCURRENCY slots for an outbound call."""
+    async with get_semaphore():
+        yield
+
+
+@lru_cache(maxsize=None)
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="fan-out")
+
+
+def fan_out(fn, items: list) -> list:
+    """Call fn on every item concurrently on a shared bounded thread pool, returning results in order."""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    # Each call runs in a copy of the caller's context so metrics keep their node and analyst labels
+    futures = [_executor().submit(contextvars.copy_context().run, fn, item) for item in items]
+    return [future.result() for future in futures]
+
+
+async def afan_out(fn, items: list) -> list:
+    """Await fn on every item concurrently, returning results in order."""
+    return list(await asyncio.gather(*(fn(item) for item in items)))
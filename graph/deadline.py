@@ -0,0 +1,163 @@
+"""Run deadline and quorum for the interview branches of a research run."""
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
+from graph.concurrency import cancel_event
+from graph.retrieval.store import run_id
+from graph.logging_config import logger
+from config import INTERVIEW_TRACKER_MAX_RUNS
+
+# How often a branch past the deadline checks whether the quorum has finished
+POLL_SECONDS = 0.05
+
+
+class InterviewTracker:
+    """Finished and late interviews of one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.finished = 0
+        self.late = []
+
+    def finish(self):
+        """Count one finished interview."""
+        with self._lock:
+            self.finished += 1
+
+    def quorum_reached(self, quorum: int) -> bool:
+        """Whether at least quorum interviews of the run have finished."""
+        with self._lock:
+            return self.finished >= quorum
+
+    def add_late(self, analyst_name: str, pending, cancel):
+        """Remember an interview that was still running at the deadline, and how to cancel it."""
+        with self._lock:
+            self.late.append((analyst_name, pending, cancel))
+
+
+class InterviewTrackers:
+    """One InterviewTracker per run id, held until the run releases it.
+
+    A tracker is only dropped by release(), from finalize_report or when
+    the run fails, so late interviews are always attached or cancelled.
+    Holding more than max_runs trackers means runs are not being released,
+    which is logged.
+    """
+
+    def __init__(self, max_runs: int = INTERVIEW_TRACKER_MAX_RUNS):
+        self.max_runs = max_runs
+        self._trackers = {}
+        self._lock = threading.Lock()
+
+    def get(self, run_id: str) -> InterviewTracker:
+        """Return the tracker of a run, creating it on first use."""
+        with self._lock:
+            tracker = self._trackers.get(run_id)
+            if tracker is None:
+                tracker = self._trackers[run_id] = InterviewTracker()
+                if len(self._trackers) > self.max_runs:
+                    logger.warning(f"{len(self._trackers)} interview trackers held, runs are not being released")
+            return tracker
+
+    def release(self, run_id: str) -> list:
+        """Drop the tracker of a finished run and return its late (analyst name, pending, cancel) entries."""
+        with self._lock:
+            tracker = self._trackers.pop(run_id, None)
+        return tracker.late if tracker else []
+
+
+interview_trackers = InterviewTrackers()
+
+
+def _outputs(result: dict) -> dict:
+    """The interview outputs shared with the research graph."""
+    return {"sections": result.get("sections") or []}
+
+
+def _late(state: dict, tracker: InterviewTracker, pending, cancel) -> dict:
+    analyst_name = state["analyst"].name
+    logger.warning(f"Interview of {analyst_name} missed the deadline, the report proceeds without it")
+    tracker.add_late(analyst_name, pending, cancel)
+    return {"late_interviews": [analyst_name]}
+
+
+def deadline_interview(interview_graph):
+    """Wrap the interview sub-graph so a straggler stops holding up the report.
+
+    Until the deadline in the branch state the branch waits for its
+    interview. After it, the branch gives up as soon as quorum interviews
+    of the run have finished; the interview keeps running in the
+    background and finalize_report attaches it as an addendum if it is done
+    by then, or cancels it.
+    """
+    def conduct_interview(state: dict, config: Optional[RunnableConfig] = None):
+        """Run one interview, proceeding without it after the run deadline once a quorum has finished."""
+        tracker = interview_trackers.get(run_id(config))
+        pending = concurrent.futures.Future()
+        cancelled = threading.Event()
+        context = contextvars.copy_context()
+        # Nodes of the interview check the event before they start
+        context.run(cancel_event.set, cancelled)
+
+        def run():
+            try:
+                pending.set_result(context.run(interview_graph.invoke, state, config))
+            except BaseException as error:
+                pending.set_exception(error)
+
+        # A daemon thread, since a late interview must not keep the process alive
+        threading.Thread(target=run, name="interview", daemon=True).start()
+        concurrent.futures.wait([pending], timeout=max(0.0, state["deadline"] - time.time()))
+        while not pending.done() and not tracker.quorum_reached(state["quorum"]):
+            concurrent.futures.wait([pending], timeout=POLL_SECONDS)
+        if not pending.done():
+            return _late(state, tracker, pending, cancelled.set)
+
+        tracker.finish()
+        return _outputs(pending.result())
+
+    return conduct_interview
+
+
+def adeadline_interview(interview_graph):
+    """Wrap the async interview sub-graph so a straggler stops holding up the report."""
+    async def conduct_interview(state: dict, config: Optional[RunnableConfig] = None):
+        """Run one interview, proceeding without it after the run deadline once a quorum has finished (async)."""
+        tracker = interview_trackers.get(run_id(config))
+        pending = asyncio.ensure_future(interview_graph.ainvoke(state, config))
+        try:
+            await asyncio.wait([pending], timeout=max(0.0, state["deadline"] - time.time()))
+            while not pending.done() and not tracker.quorum_reached(state["quorum"]):
+                await asyncio.wait([pending], timeout=POLL_SECONDS)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        if not pending.done():
+            return _late(state, tracker, pending, lambda: pending.get_loop().call_soon_threadsafe(pending.cancel))
+
+        tracker.finish()
+        return _outputs(pending.result())
+
+    return conduct_interview
+
+
+def collect_late_interviews(late: list):
+    """Split late interviews into the sections of those done by now and the names of the rest.
+
+    Late interviews that are still running are cancelled. Async ones stop
+    at their next await; threaded ones finish the node they are in and
+    raise before the next one starts, so they stop spending quota.
+    """
+    sections, missing = [], []
+    for analyst_name, pending, cancel in late:
+        if pending.done() and not pending.cancelled() and pending.exception() is None:
+            sections.extend(_outputs(pending.result())["sections"])
+            continue
+        missing.append(analyst_name)
+        if not pending.done():
+            cancel()
+    return sections, missing
@@ -1,42 +1,101 @@
 """Graph construction for the research agent."""
+import os
+import weakref
+from functools import lru_cache
 from langgraph.graph import START, END, StateGraph
 from langgraph.checkpoint.memory import MemorySaver
 from graph.state import GenerateAnalystsState, InterviewState, ResearchGraphState
 from graph.nodes.analyst_nodes import (
     create_analysts,
+    acreate_analysts,
     human_feedback,
     create_analysts_for_research,
+    acreate_analysts_for_research,
     human_feedback_research
 )
 from graph.nodes.interview_nodes import (
+    recall_interview,
+    route_recall,
+    remember_interview,
     generate_question,
+    agenerate_question,
+    plan_queries,
+    aplan_queries,
     search_web,
+    asearch_web,
     search_wikipedia,
+    asearch_wikipedia,
+    search_local,
+    asearch_local,
+    rerank_context,
     generate_answer,
+    agenerate_answer,
     save_interview,
     write_section,
+    awrite_section,
     route_messages
 )
 from graph.nodes.report_nodes import (
     initiate_all_interviews,
+    digest_sections,
+    adigest_sections,
     write_report,
+    awrite_report,
     write_introduction,
+    awrite_introduction,
     write_conclusion,
+    awrite_conclusion,
+    write_framing,
+    awrite_framing,
     finalize_report
 )
 from graph.routers import should_continue_analyst_generation
+from graph.checkpointing import get_checkpointer
+from graph.metrics import instrument_node
+from graph.deadline import deadline_interview, adeadline_interview
+from graph.retrieval.search import SEARCH_BACKENDS
 from graph.logging_config import logger
-from config import MAX_INTERVIEW_TURNS
+from config import INTERVIEW_DEADLINE_SECONDS, REPORT_COMBINED_FRAMING
 
+# Retrieval nodes fed by the query planner, keyed by node name; only enabled backends are wired in
+RETRIEVAL_NODES = {
+    f"search_{backend}": node
+    for backend, node in {"web": search_web, "wikipedia": search_wikipedia, "local": search_local}.items()
+    if backend in SEARCH_BACKENDS
+}
 
-def build_analyst_generation_graph():
+# Native async variants used when a graph is built with use_async=True
+ASYNC_NODES = {
+    create_analysts: acreate_analysts,
+    create_analysts_for_research: acreate_analysts_for_research,
+    generate_question: agenerate_question,
+    plan_queries: aplan_queries,
+    search_web: asearch_web,
+    search_wikipedia: asearch_wikipedia,
+    search_local: asearch_local,
+    generate_answer: agenerate_answer,
+    write_section: awrite_section,
+    digest_sections: adigest_sections,
+    write_report: awrite_report,
+    write_introduction: awrite_introduction,
+    write_conclusion: awrite_conclusion,
+    write_framing: awrite_framing
+}
+
+
+def _node(name: str, func, use_async: bool):
+    """Return the instrumented node, using its async variant when building an async graph."""
+    return instrument_node(name, ASYNC_NODES.get(func, func) if use_async else func)
+
+
+def build_analyst_generation_graph(use_async: bool = False, checkpointer=None):
     """Build the analyst generation graph."""
     logger.info("Building analyst generation graph")
     
     # Add nodes and edges
     builder = StateGraph(GenerateAnalystsState)
-    builder.add_node("create_analysts", create_analysts)
-    builder.add_node("human_feedback", human_feedback)
+    builder.add_node("create_analysts", _node("create_analysts", create_analysts, use_async))
+    builder.add_node("human_feedback", _node("human_feedback", human_feedback, use_async))
     
     # Flow
     builder.add_edge(START, "create_analysts")
@@ -48,82 +107,96 @@ def build_analyst_generation_graph():
     )
     
     # Compile
-    memory = MemorySaver()
-    graph = builder.compile(interrupt_before=['human_feedback'], checkpointer=memory)
-    
-    # Save visualization
-    try:
-        png_data = graph.get_graph(xray=1).draw_mermaid_png()
-        with open("analyst_graph.png", "wb") as f:
-            f.write(png_data)
-        logger.info("Analyst graph visualization saved to analyst_graph.png")
-    except Exception as e:
-        logger.warning(f"Could not save graph visualization: {e}")
+    if checkpointer is None:
+        checkpointer = get_checkpointer(use_async=use_async)
+    graph = builder.compile(interrupt_before=['human_feedback'], checkpointer=checkpointer)
     
     return graph
 
 
-def build_interview_graph():
-    """Build the interview sub-graph."""
-    logger.info("Building interview graph")
-    
+def _interview_builder(use_async: bool = False):
+    """Create the uncompiled interview sub-graph."""
     # Add nodes
     interview_builder = StateGraph(InterviewState)
-    interview_builder.add_node("ask_question", generate_question)
-    interview_builder.add_node("search_web", search_web)
-    interview_builder.add_node("search_wikipedia", search_wikipedia)
-    interview_builder.add_node("answer_question", generate_answer)
-    interview_builder.add_node("save_interview", save_interview)
-    interview_builder.add_node("write_section", write_section)
+    interview_builder.add_node("recall_interview", _node("recall_interview", recall_interview, use_async))
+    interview_builder.add_node("ask_question", _node("ask_question", generate_question, use_async))
+    interview_builder.add_node("plan_queries", _node("plan_queries", plan_queries, use_async))
+    for node_name, node in RETRIEVAL_NODES.items():
+        interview_builder.add_node(node_name, _node(node_name, node, use_async))
+    interview_builder.add_node("rerank_context", _node("rerank_context", rerank_context, use_async))
+    interview_builder.add_node("answer_question", _node("answer_question", generate_answer, use_async))
+    interview_builder.add_node("save_interview", _node("save_interview", save_interview, use_async))
+    interview_builder.add_node("write_section", _node("write_section", write_section, use_async))
+    interview_builder.add_node("remember_interview", _node("remember_interview", remember_interview, use_async))
     
     # Flow
-    interview_builder.add_edge(START, "ask_question")
-    interview_builder.add_edge("ask_question", "search_web")
-    interview_builder.add_edge("ask_question", "search_wikipedia")
-    interview_builder.add_edge("search_web", "answer_question")
-    interview_builder.add_edge("search_wikipedia", "answer_question")
+    interview_builder.add_edge(START, "recall_interview")
+    interview_builder.add_conditional_edges("recall_interview", route_recall, ["ask_question", END])
+    interview_builder.add_edge("ask_question", "plan_queries")
+    for node_name in RETRIEVAL_NODES:
+        interview_builder.add_edge("plan_queries", node_name)
+    interview_builder.add_edge(list(RETRIEVAL_NODES), "rerank_context")
+    interview_builder.add_edge("rerank_context", "answer_question")
     interview_builder.add_conditional_edges(
         "answer_question", 
         route_messages,
         ['ask_question', 'save_interview']
     )
     interview_builder.add_edge("save_interview", "write_section")
-    interview_builder.add_edge("write_section", END)
+    interview_builder.add_edge("write_section", "remember_interview")
+    interview_builder.add_edge("remember_interview", END)
+    return interview_builder
+
+
+@lru_cache(maxsize=None)
+def _interview_subgraph(use_async: bool):
+    """Compile the interview sub-graph once per execution path."""
+    return _interview_builder(use_async).compile().with_config(run_name="Conduct Interviews")
+
+
+def build_interview_graph(use_async: bool = False, checkpointer=None):
+    """Build the interview sub-graph."""
+    logger.info("Building interview graph")
     
     # Compile
-    memory = MemorySaver()
-    interview_graph = interview_builder.compile(checkpointer=memory).with_config(
+    if checkpointer is None:
+        checkpointer = get_checkpointer(use_async=use_async)
+    interview_graph = _interview_builder(use_async).compile(checkpointer=checkpointer).with_config(
         run_name="Conduct Interviews"
     )
     
-    # Save visualization
-    try:
-        png_data = interview_graph.get_graph(xray=1).draw_mermaid_png()
-        with open("interview_graph.png", "wb") as f:
-            f.write(png_data)
-        logger.info("Interview graph visualization saved to interview_graph.png")
-    except Exception as e:
-        logger.warning(f"Could not save graph visualization: {e}")
-    
     return interview_graph
 
 
-def build_research_graph():
+def build_research_graph(use_async: bool = False, checkpointer=None):
     """Build the complete research graph."""
     logger.info("Building research graph")
     
-    # Get the interview sub-graph
-    interview_graph = build_interview_graph()
+    # Get the interview sub-graph; it inherits the parent checkpointer so that
+    # finished interviews are not redone when an interrupted run is resumed
+    interview_graph = _interview_subgraph(use_async)
     
     # Add nodes and edges
     builder = StateGraph(ResearchGraphState)
-    builder.add_node("create_analysts", create_analysts_for_research)
-    builder.add_node("human_feedback", human_feedback_research)
-    builder.add_node("conduct_interview", interview_graph)
-    builder.add_node("write_report", write_report)
-    builder.add_node("write_introduction", write_introduction)
-    builder.add_node("write_conclusion", write_conclusion)
-    builder.add_node("finalize_report", finalize_report)
+    builder.add_node("create_analysts", _node("create_analysts", create_analysts_for_research, use_async))
+    builder.add_node("human_feedback", _node("human_feedback", human_feedback_research, use_async))
+    if INTERVIEW_DEADLINE_SECONDS > 0:
+        # Stragglers past the run deadline no longer hold up the report once a quorum has finished
+        wrap = adeadline_interview if use_async else deadline_interview
+        builder.add_node("conduct_interview", instrument_node("conduct_interview", wrap(interview_graph)))
+    else:
+        builder.add_node("conduct_interview", interview_graph)
+    builder.add_node("digest_sections", _node("digest_sections", digest_sections, use_async))
+    builder.add_node("write_report", _node("write_report", write_report, use_async))
+    # Introduction and conclusion come from one structured call, or from one call each
+    if REPORT_COMBINED_FRAMING:
+        framing_nodes = ["write_framing"]
+        builder.add_node("write_framing", _node("write_framing", write_framing, use_async))
+    else:
+        framing_nodes = ["write_introduction", "write_conclusion"]
+        builder.add_node("write_introduction", _node("write_introduction", write_introduction, use_async))
+        builder.add_node("write_conclusion", _node("write_conclusion", write_conclusion, use_async))
+    builder.add_node("finalize_report", _node("finalize_report", finalize_report, use_async))
     
     # Logic
     builder.add_edge(START, "create_analysts")
@@ -133,27 +206,60 @@ def build_research_graph():
         initiate_all_interviews, 
         ["create_analysts", "conduct_interview"]
     )
-    builder.add_edge("conduct_interview", "write_report")
-    builder.add_edge("conduct_interview", "write_introduction")
-    builder.add_edge("conduct_interview", "write_conclusion")
-    builder.add_edge(
-        ["write_conclusion", "write_report", "write_introduction"], 
-        "finalize_report"
-    )
+    builder.add_edge("conduct_interview", "digest_sections")
+    for report_node in ["write_report"] + framing_nodes:
+        builder.add_edge("digest_sections", report_node)
+    builder.add_edge(["write_report"] + framing_nodes, "finalize_report")
     builder.add_edge("finalize_report", END)
     
     # Compile
-    memory = MemorySaver()
-    graph = builder.compile(interrupt_before=['human_feedback'], checkpointer=memory)
-    
-    # Save visualization
-    try:
-        png_data = graph.get_graph(xray=1).draw_mermaid_png()
-        with open("research_graph.png", "wb") as f:
-            f.write(png_data)
-        logger.info("Research graph visualization saved to research_graph.png")
-    except Exception as e:
-        logger.warning(f"Could not save graph visualization: {e}")
+    if checkpointer is None:
+        checkpointer = get_checkpointer(use_async=use_async)
+    graph = builder.compile(interrupt_before=['human_feedback'], checkpointer=checkpointer)
     
     return graph
 
+
+
+GRAPH_BUILDERS = {
+    "analyst": build_analyst_generation_graph,
+    "interview": build_interview_graph,
+    "research": build_research_graph
+}
+
+# Compiled graphs per checkpointer, released together with the checkpointer
+_compiled_graphs = weakref.WeakKeyDictionary()
+
+
+def get_graph(name: str, checkpointer, use_async: bool = False):
+    """Return a compiled graph, reusing an earlier build for the same checkpointer."""
+    graphs = _compiled_graphs.setdefault(checkpointer, {})
+    key = (name, use_async)
+    if key not in graphs:
+        graphs[key] = GRAPH_BUILDERS[name](use_async=use_async, checkpointer=checkpointer)
+    return graphs[key]
+
+
+def draw_graphs(output_dir: str = ".") -> list:
+    """Render every graph to <name>_graph.png, falling back to Mermaid source.
+
+    PNG rendering goes through a remote Mermaid service, so this is only
+    run on request and never while building graphs.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for name, builder in GRAPH_BUILDERS.items():
+        drawable = builder(checkpointer=MemorySaver()).get_graph(xray=1)
+        path = os.path.join(output_dir, f"{name}_graph.png")
+        try:
+            png_data = drawable.draw_mermaid_png()
+            with open(path, "wb") as f:
+                f.write(png_data)
+        except Exception as e:
+            logger.warning(f"Could not render {path}, saving Mermaid source instead: {e}")
+            path = os.path.join(output_dir, f"{name}_graph.mmd")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(drawable.draw_mermaid())
+        logger.info(f"Graph visualization saved to {path}")
+        paths.append(path)
+    return paths
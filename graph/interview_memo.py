@@ -0,0 +1,100 @@
+"""Opt-in memo of finished interviews, reused when a topic is researched again."""
+import hashlib
+import json
+from typing import Optional
+from graph.cache import DiskCache
+from graph.models import Analyst
+from graph.retrieval.documents import Document
+from graph.retrieval.embeddings import HashingEmbedder, embedder
+from graph.metrics import metrics
+from graph.logging_config import logger
+from config import (
+    INTERVIEW_MEMO_ENABLED,
+    INTERVIEW_MEMO_PATH,
+    INTERVIEW_MEMO_MAX_BYTES,
+    INTERVIEW_MEMO_MAX_AGE_SECONDS,
+    INTERVIEW_REUSE_SIMILARITY
+)
+
+# Interview outputs that are stored and restored
+MEMO_FIELDS = ("interview", "sections", "context")
+# Part of every key, bumped when the stored format changes (3: Document dicts without content hashes)
+MEMO_VERSION = 3
+
+
+def _hash(*parts) -> str:
+    return hashlib.sha256(json.dumps((MEMO_VERSION,) + parts).encode("utf-8")).hexdigest()
+
+
+def _dump(outputs: dict) -> str:
+    stored = {field: outputs.get(field) for field in MEMO_FIELDS}
+    stored["context"] = [document.to_dict() for document in stored["context"] or []]
+    return json.dumps(stored)
+
+
+def _load(value: str) -> dict:
+    outputs = json.loads(value)
+    outputs["context"] = [Document(**document) for document in outputs["context"]]
+    return outputs
+
+
+class InterviewMemo:
+    """Interview outputs keyed by a stable hash of topic, turn budget and analyst persona.
+
+    Entries outlive the run that stored them, so a later run on the same
+    topic, e.g. rerun with feedback that replaced some analysts, only
+    interviews the new ones. Every (topic, turn budget) also keeps an index
+    of the personas stored for it, so an analyst whose persona changed only
+    slightly (cosine similarity of at least similarity) still reuses the
+    earlier interview; only personas of the same analyst name are compared,
+    so an analyst never gets another analyst's transcript.
+    """
+
+    def __init__(self, cache: DiskCache, similarity: float = INTERVIEW_REUSE_SIMILARITY, model: HashingEmbedder = embedder):
+        self.cache = cache
+        self.similarity = similarity
+        self.model = model
+        self.reused = 0
+
+    def _index(self, index_key: str) -> dict:
+        return json.loads(self.cache.get(index_key) or "{}")
+
+    def get(self, topic: str, max_num_turns: int, analyst: Analyst) -> Optional[dict]:
+        """Return the stored outputs for this analyst, or of the most similar stored persona."""
+        persona = analyst.persona
+        value = self.cache.get(_hash("interview", topic, max_num_turns, persona))
+        if value is None:
+            personas = self._index(_hash("index", topic, max_num_turns))
+            stored = [stored for stored in personas if stored.startswith(f"Name: {analyst.name}\n")]
+            if not stored:
+                return None
+            similarities = self.model.embed(stored) @ self.model.embed([persona])[0]
+            best = int(similarities.argmax())
+            if similarities[best] < self.similarity:
+                return None
+            logger.info(f"Persona of {analyst.name} is {similarities[best]:.2f} similar to a stored interview")
+            value = self.cache.get(personas[stored[best]])
+            if value is None:
+                return None
+
+        self.reused += 1
+        metrics.record_call("interview_memo", cache_hit=True)
+        return _load(value)
+
+    def put(self, topic: str, max_num_turns: int, analyst: Analyst, outputs: dict):
+        """Store an interview's outputs and add its persona to the topic's index."""
+        key = _hash("interview", topic, max_num_turns, analyst.persona)
+        self.cache.set(key, _dump(outputs))
+        
+        def add_persona(value: Optional[str]) -> str:
+            personas = json.loads(value or "{}")
+            personas[analyst.persona] = key
+            return json.dumps(personas)
+        
+        # Interview branches finish concurrently, so the index is updated in one transaction
+        self.cache.update(_hash("index", topic, max_num_turns), add_persona)
+
+
+interview_memo = InterviewMemo(
+    DiskCache(INTERVIEW_MEMO_PATH, INTERVIEW_MEMO_MAX_BYTES, INTERVIEW_MEMO_MAX_AGE_SECONDS)
+) if INTERVIEW_MEMO_ENABLED else None
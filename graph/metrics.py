@@ -0,0 +1,249 @@
+"""Per-node and per-call instrumentation with JSON and Prometheus exports."""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pydantic import BaseModel
+from graph.concurrency import raise_if_cancelled
+from graph.retrieval.text import estimate_tokens
+
+# Node and analyst of the code currently running, used to label outbound calls
+current_node = contextvars.ContextVar("current_node", default="")
+current_analyst = contextvars.ContextVar("current_analyst", default="")
+
+
+def _analyst_name(state) -> str:
+    analyst = state.get("analyst") if isinstance(state, dict) else None
+    return getattr(analyst, "name", "") or ""
+
+
+def token_usage(result, estimated_input_tokens: int = 0) -> tuple:
+    """Return (input, output) tokens, preferring provider usage over estimates."""
+    usage = getattr(result, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", estimated_input_tokens), usage.get("output_tokens", 0)
+    if isinstance(result, BaseModel):
+        return estimated_input_tokens, estimate_tokens(result.model_dump_json())
+    return estimated_input_tokens, 0
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Metrics:
+    """Thread-safe recorder for node executions and outbound LLM/search calls."""
+
+    CALL_FIELDS = (
+        "calls", "errors", "seconds", "queue_seconds", "input_tokens", "output_tokens", "retries", "cache_hits", "timeouts"
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far and restart the run clock."""
+        with self._lock:
+            self.started = time.perf_counter()
+            self.node_runs = []
+            self.calls = defaultdict(lambda: dict.fromkeys(self.CALL_FIELDS, 0))
+
+    def record_node(self, node: str, analyst: str, started: float, seconds: float, error: bool = False):
+        """Record one node execution."""
+        with self._lock:
+            self.node_runs.append({
+                "node": node,
+                "analyst": analyst,
+                "start_offset_seconds": round(started - self.started, 6),
+                "seconds": seconds,
+                "error": error
+            })
+
+    def record_call(
+        self,
+        backend: str,
+        seconds: float = 0.0,
+        queue_seconds: float = 0.0,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        retries: int = 0,
+        cache_hit: bool = False,
+        error: bool = False
+    ):
+        """Record one LLM or search call, labelled with the running node and analyst."""
+        key = (backend, current_node.get(), current_analyst.get())
+        with self._lock:
+            totals = self.calls[key]
+            totals["calls"] += 1
+            totals["errors"] += int(error)
+            totals["seconds"] += seconds
+            totals["queue_seconds"] += queue_seconds
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+            totals["retries"] += retries
+            totals["cache_hits"] += int(cache_hit)
+
+    def record_timeout(self, backend: str):
+        """Record a call the caller stopped waiting for; the call itself is recorded when it finishes."""
+        key = (backend, current_node.get(), current_analyst.get())
+        with self._lock:
+            self.calls[key]["timeouts"] += 1
+
+    def summary(self) -> dict:
+        """Aggregate the run into per-node, per-analyst and per-call statistics."""
+        with self._lock:
+            node_runs = list(self.node_runs)
+            calls = {key: dict(totals) for key, totals in self.calls.items()}
+
+        by_node = defaultdict(list)
+        by_node_analyst = defaultdict(list)
+        interviews = defaultdict(lambda: [float("inf"), 0.0])
+        for run in node_runs:
+            by_node[run["node"]].append(run["seconds"])
+            by_node_analyst[(run["node"], run["analyst"])].append(run["seconds"])
+            if run["analyst"]:
+                span = interviews[run["analyst"]]
+                span[0] = min(span[0], run["start_offset_seconds"])
+                span[1] = max(span[1], run["start_offset_seconds"] + run["seconds"])
+
+        def describe(seconds: list) -> dict:
+            return {
+                "runs": len(seconds),
+                "total_seconds": round(sum(seconds), 6),
+                "p50_seconds": round(_percentile(seconds, 0.5), 6),
+                "p95_seconds": round(_percentile(seconds, 0.95), 6),
+                "max_seconds": round(max(seconds), 6)
+            }
+
+        nodes = {node: describe(seconds) for node, seconds in by_node.items()}
+        return {
+            "wall_time_seconds": round(time.perf_counter() - self.started, 6),
+            "nodes": dict(sorted(nodes.items(), key=lambda item: -item[1]["total_seconds"])),
+            "nodes_by_analyst": [
+                {"node": node, "analyst": analyst, **describe(seconds)}
+                for (node, analyst), seconds in sorted(by_node_analyst.items())
+            ],
+            # Wall time from an analyst's first to last node; the largest bounds the interview stage
+            "interviews": {
+                analyst: round(end - start, 6) for analyst, (start, end) in sorted(interviews.items())
+            },
+            "calls": [
+                {"backend": backend, "node": node, "analyst": analyst, **totals}
+                for (backend, node, analyst), totals in sorted(calls.items())
+            ],
+            "node_runs": node_runs
+        }
+
+    def to_json(self) -> str:
+        """Render the run summary as JSON."""
+        return json.dumps(self.summary(), indent=2)
+
+    def write(self, output_dir: str, run_id: str) -> tuple:
+        """Write <run_id>.json and <run_id>.prom to output_dir and return their paths."""
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, f"{run_id}.json")
+        prometheus_path = os.path.join(output_dir, f"{run_id}.prom")
+        with open(json_path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+        with open(prometheus_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        return json_path, prometheus_path
+
+    def to_prometheus(self) -> str:
+        """Render counters in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: list):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        node_rows = summary["nodes_by_analyst"]
+        family("research_node_runs_total", "counter", "Node executions.", [
+            (_labels(node=row["node"], analyst=row["analyst"]), row["runs"]) for row in node_rows
+        ])
+        family("research_node_seconds_total", "counter", "Wall time spent in nodes.", [
+            (_labels(node=row["node"], analyst=row["analyst"]), row["total_seconds"]) for row in node_rows
+        ])
+        family("research_node_max_seconds", "gauge", "Slowest single node execution.", [
+            (_labels(node=row["node"], analyst=row["analyst"]), row["max_seconds"]) for row in node_rows
+        ])
+
+        call_families = {
+            "calls": ("research_calls_total", "Outbound LLM and search calls."),
+            "errors": ("research_call_errors_total", "Calls that failed after retries."),
+            "seconds": ("research_call_seconds_total", "Wall time of calls, including queueing."),
+            "queue_seconds": ("research_call_queue_seconds_total", "Time spent waiting in rate and concurrency limiters."),
+            "input_tokens": ("research_call_input_tokens_total", "Prompt tokens sent."),
+            "output_tokens": ("research_call_output_tokens_total", "Completion tokens received."),
+            "retries": ("research_call_retries_total", "Retried attempts."),
+            "cache_hits": ("research_call_cache_hits_total", "Calls served from the LLM or search cache."),
+            "timeouts": ("research_call_timeouts_total", "Calls abandoned after their backend timeout.")
+        }
+        for field, (name, help_text) in call_families.items():
+            family(name, "counter", help_text, [
+                (_labels(backend=row["backend"], node=row["node"], analyst=row["analyst"]), round(row[field], 6))
+                for row in summary["calls"]
+            ])
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def instrument_node(name: str, func):
+    """Wrap a node so its wall time is recorded and its calls are labelled with it.
+
+    Keyword arguments such as config are passed through; LangGraph sees the
+    wrapped function's signature, so it injects only what the node accepts.
+    Nodes of a cancelled background branch raise instead of running.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(state, **kwargs):
+            raise_if_cancelled()
+            node_token = current_node.set(name)
+            analyst_token = current_analyst.set(_analyst_name(state))
+            started = time.perf_counter()
+            error = True
+            try:
+                result = await func(state, **kwargs)
+                error = False
+                return result
+            finally:
+                metrics.record_node(name, current_analyst.get(), started, time.perf_counter() - started, error)
+                current_node.reset(node_token)
+                current_analyst.reset(analyst_token)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(state, **kwargs):
+        raise_if_cancelled()
+        node_token = current_node.set(name)
+        analyst_token = current_analyst.set(_analyst_name(state))
+        started = time.perf_counter()
+        error = True
+        try:
+            result = func(state, **kwargs)
+            error = False
+            return result
+        finally:
+            metrics.record_node(name, current_analyst.get(), started, time.perf_counter() - started, error)
+            current_node.reset(node_token)
+            current_analyst.reset(analyst_token)
+    return wrapper
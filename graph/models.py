@@ -21,7 +21,41 @@ class SearchQuery(BaseModel):
     search_query: str = Field(None, description="Search query for retrieval.")
 
 
+class BackendQuery(BaseModel):
+    """Search query targeted at a single retrieval backend."""
+    backend: str = Field(description="Name of the retrieval backend the query is for.")
+    search_query: str = Field(description="Search query tuned for this backend.")
+
+
+class QueryPlan(BaseModel):
+    """Search queries planned for one interview turn."""
+    search_query: str = Field(description="General search query used by any backend without a specific query.")
+    alternative_queries: List[str] = Field(
+        default_factory=list,
+        description="Further general queries that approach the question from different angles."
+    )
+    backend_queries: List[BackendQuery] = Field(
+        default_factory=list,
+        description="Optional backend-specific queries."
+    )
+    
+    def queries_by_backend(self, backends: List[str], max_queries: int = 1) -> dict:
+        """Map every backend to up to max_queries distinct queries, its specific ones first."""
+        general = [self.search_query] + self.alternative_queries
+        plan = {}
+        for backend in backends:
+            specific = [query.search_query for query in self.backend_queries if query.backend == backend]
+            queries = [query for query in specific + general if query]
+            plan[backend] = list(dict.fromkeys(queries))[:max_queries]
+        return plan
+
+
 class Perspectives(BaseModel):
     """Collection of analyst perspectives."""
     analysts: List[Analyst] = Field(description="Comprehensive list of analysts with their roles and affiliations.")
 
+
+class ReportFraming(BaseModel):
+    """Introduction and conclusion of a report, written together."""
+    introduction: str = Field(description="Report introduction: a # title, then a ## Introduction section.")
+    conclusion: str = Field(description="Report conclusion: a ## Conclusion section.")
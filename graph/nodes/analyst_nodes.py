@@ -7,29 +7,44 @@ from graph.chains.prompts import ANALYST_INSTRUCTIONS
 from graph.logging_config import logger
 
 
-def create_analysts(state: GenerateAnalystsState):
-    """Create analysts based on topic and feedback."""
-    logger.info("Creating analysts")
+def _analyst_messages(state):
+    """Build the prompt messages for analyst generation."""
     topic = state['topic']
     max_analysts = state['max_analysts']
     human_analyst_feedback = state.get('human_analyst_feedback', '')
-    
-    # Enforce structured output
-    structured_llm = llm.with_structured_output(Perspectives)
-    
+
     # System message
     system_message = ANALYST_INSTRUCTIONS.format(
-        topic=topic, 
-        human_analyst_feedback=human_analyst_feedback, 
+        topic=topic,
+        human_analyst_feedback=human_analyst_feedback,
         max_analysts=max_analysts
     )
-    
-    # Generate analysts
-    analysts = structured_llm.invoke([
+    return [
         SystemMessage(content=system_message),
         HumanMessage(content="Generate the set of analysts.")
-    ])
-    
+    ]
+
+
+def create_analysts(state: GenerateAnalystsState):
+    """Create analysts based on topic and feedback."""
+    logger.info("Creating analysts")
+
+    # Enforce structured output
+    structured_llm = llm.with_structured_output(Perspectives)
+
+    # Generate analysts
+    analysts = structured_llm.invoke(_analyst_messages(state))
+
+    logger.info(f"Created {len(analysts.analysts)} analysts")
+    return {"analysts": analysts.analysts}
+
+
+async def acreate_analysts(state: GenerateAnalystsState):
+    """Create analysts based on topic and feedback (async)."""
+    logger.info("Creating analysts")
+    structured_llm = llm.with_structured_output(Perspectives)
+    analysts = await structured_llm.ainvoke(_analyst_messages(state))
+
     logger.info(f"Created {len(analysts.analysts)} analysts")
     return {"analysts": analysts.analysts}
 
@@ -37,26 +52,23 @@ def create_analysts(state: GenerateAnalystsState):
 def create_analysts_for_research(state: ResearchGraphState):
     """Create analysts for the main research graph."""
     logger.info("Creating analysts for research")
-    topic = state['topic']
-    max_analysts = state['max_analysts']
-    human_analyst_feedback = state.get('human_analyst_feedback', '')
-    
+
     # Enforce structured output
     structured_llm = llm.with_structured_output(Perspectives)
-    
-    # System message
-    system_message = ANALYST_INSTRUCTIONS.format(
-        topic=topic, 
-        human_analyst_feedback=human_analyst_feedback, 
-        max_analysts=max_analysts
-    )
-    
+
     # Generate analysts
-    analysts = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Generate the set of analysts.")
-    ])
-    
+    analysts = structured_llm.invoke(_analyst_messages(state))
+
+    logger.info(f"Created {len(analysts.analysts)} analysts for research")
+    return {"analysts": analysts.analysts}
+
+
+async def acreate_analysts_for_research(state: ResearchGraphState):
+    """Create analysts for the main research graph (async)."""
+    logger.info("Creating analysts for research")
+    structured_llm = llm.with_structured_output(Perspectives)
+    analysts = await structured_llm.ainvoke(_analyst_messages(state))
+
     logger.info(f"Created {len(analysts.analysts)} analysts for research")
     return {"analysts": analysts.analysts}
 
@@ -71,4 +83,3 @@ def human_feedback_research(state: ResearchGraphState):
     """No-op node that should be interrupted on for research graph."""
     logger.info("Waiting for human feedback on research")
     pass
-
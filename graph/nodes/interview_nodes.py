@@ -1,92 +1,317 @@
 """Node functions for conducting interviews."""
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, get_buffer_string
-from langchain_tavily import TavilySearch
-from langchain_community.document_loaders import WikipediaLoader
+from langgraph.graph import END
 from graph.state import InterviewState
-from graph.models import SearchQuery
+from graph.models import QueryPlan
 from graph.chains.llm import llm
 from graph.chains.prompts import (
     QUESTION_INSTRUCTIONS, 
-    SEARCH_INSTRUCTIONS, 
+    QUERY_PLANNER_INSTRUCTIONS,
     ANSWER_INSTRUCTIONS,
     SECTION_WRITER_INSTRUCTIONS
 )
+from graph.retrieval.search import (
+    SEARCH_BACKENDS,
+    web_search,
+    aweb_search,
+    wikipedia_search,
+    awikipedia_search,
+    local_search
+)
+from graph.concurrency import fan_out, afan_out
+from graph.interview_memo import interview_memo
+from graph.retrieval.embeddings import embedder, rerank
+from graph.retrieval.novelty import measure_novelty
+from graph.retrieval.documents import Document
+from graph.retrieval.packing import pack_context, pack_passages, unique_passages
+from graph.retrieval.store import document_stores, run_id
 from graph.logging_config import logger
-from config import WEB_SEARCH_MAX_RESULTS, WIKIPEDIA_MAX_DOCS
+from config import (
+    ANSWER_CONTEXT_TOKEN_BUDGET,
+    SECTION_CONTEXT_TOKEN_BUDGET,
+    RERANK_TOP_K,
+    NOVELTY_THRESHOLD,
+    NOVELTY_DUPLICATE_SIMILARITY,
+    QUERIES_PER_TURN
+)
+
+# LLM calls per interview turn: question, query plan and answer
+LLM_CALLS_PER_TURN = 3
+
+
+def _question_messages(state: InterviewState):
+    """Build the prompt messages for the analyst's next question."""
+    analyst = state["analyst"]
+    system_message = QUESTION_INSTRUCTIONS.format(goals=analyst.persona)
+    return [SystemMessage(content=system_message)] + state["messages"]
+
+
+def recall_interview(state: InterviewState):
+    """Restore the outputs of an earlier interview with the same, or a nearly identical, analyst."""
+    if interview_memo is None or getattr(llm, "bypass", False) or not state.get("interview_topic"):
+        return {}
+    analyst = state["analyst"]
+    max_num_turns = state.get("max_num_turns", 2)
+    outputs = interview_memo.get(state["interview_topic"], max_num_turns, analyst)
+    if outputs is None:
+        return {}
+    
+    logger.info(
+        f"Reusing the earlier interview of {analyst.name}, "
+        f"up to {max_num_turns * LLM_CALLS_PER_TURN + 1} LLM calls saved"
+    )
+    return outputs
+
+
+def route_recall(state: InterviewState):
+    """End the interview right away when its outputs were restored from the memo."""
+    return END if state.get("sections") else "ask_question"
 
 
-# Initialize search tools
-tavily_search = TavilySearch(max_results=WEB_SEARCH_MAX_RESULTS)
+def remember_interview(state: InterviewState):
+    """Memoize the finished interview so a later run on the topic can reuse it."""
+    if interview_memo is not None and state.get("interview_topic"):
+        interview_memo.put(state["interview_topic"], state.get("max_num_turns", 2), state["analyst"], state)
+    return {}
 
 
 def generate_question(state: InterviewState):
     """Generate a question for the interview."""
     logger.info("Generating interview question")
     analyst = state["analyst"]
-    messages = state["messages"]
     
     # Generate question
-    system_message = QUESTION_INSTRUCTIONS.format(goals=analyst.persona)
-    question = llm.invoke([SystemMessage(content=system_message)] + messages)
+    question = llm.invoke(_question_messages(state))
     
     logger.info(f"Generated question from {analyst.name}")
     return {"messages": [question]}
 
 
-def search_web(state: InterviewState):
-    """Retrieve docs from web search."""
+async def agenerate_question(state: InterviewState):
+    """Generate a question for the interview (async)."""
+    logger.info("Generating interview question")
+    question = await llm.ainvoke(_question_messages(state))
+    
+    logger.info(f"Generated question from {state['analyst'].name}")
+    return {"messages": [question]}
+
+
+def _planner_messages(state: InterviewState):
+    """Build the prompt messages for the query planner."""
+    backends = "\n".join(f"- {name}: {description}" for name, description in SEARCH_BACKENDS.items())
+    planner_instructions_msg = SystemMessage(
+        content=QUERY_PLANNER_INSTRUCTIONS.format(backends=backends, num_queries=QUERIES_PER_TURN)
+    )
+    return [planner_instructions_msg] + state['messages']
+
+
+def plan_queries(state: InterviewState):
+    """Plan the search queries for every retrieval backend in one call."""
+    logger.info("Planning search queries")
+    structured_llm = llm.with_structured_output(QueryPlan)
+    query_plan = structured_llm.invoke(_planner_messages(state))
+    
+    search_queries = query_plan.queries_by_backend(list(SEARCH_BACKENDS), QUERIES_PER_TURN)
+    logger.info(f"Planned search queries: {search_queries}")
+    return {"search_queries": search_queries}
+
+
+async def aplan_queries(state: InterviewState):
+    """Plan the search queries for every retrieval backend in one call (async)."""
+    logger.info("Planning search queries")
+    structured_llm = llm.with_structured_output(QueryPlan)
+    query_plan = await structured_llm.ainvoke(_planner_messages(state))
+    
+    search_queries = query_plan.queries_by_backend(list(SEARCH_BACKENDS), QUERIES_PER_TURN)
+    logger.info(f"Planned search queries: {search_queries}")
+    return {"search_queries": search_queries}
+
+
+def _dedup(items: list, key) -> list:
+    """Drop items whose key was already seen, keeping the first occurrence."""
+    seen = set()
+    unique = []
+    for item in items:
+        item_key = key(item)
+        if item_key not in seen:
+            seen.add(item_key)
+            unique.append(item)
+    return unique
+
+
+def _web_results(response) -> list:
+    """Normalize a TavilySearch response into a list of result dicts."""
+    if isinstance(response, dict):
+        response = response.get("results", [response])
+    if isinstance(response, list):
+        return [doc if isinstance(doc, dict) else {"content": str(doc)} for doc in response]
+    return [{"content": str(response)}]
+
+
+def _web_documents(search_docs: list) -> list:
+    """Turn Tavily results into documents."""
+    documents = [Document("web", doc.get("url") or "", doc.get("content", "")) for doc in search_docs]
+    
+    logger.info(f"Web search completed, found {len(documents)} results")
+    return documents
+
+
+def _plan_fetches(backend: str, search_queries: list, config):
+    """Split queries into documents reused from the run's document store and queries still to fetch."""
+    store = document_stores.get(run_id(config))
+    reused, to_fetch = [], []
+    for search_query in search_queries:
+        documents = store.lookup(backend, search_query)
+        if documents is None:
+            to_fetch.append(search_query)
+        else:
+            reused.extend(documents)
+    return store, reused, to_fetch
+
+
+def _merge_documents(backend: str, store, reused: list, search_queries: list, results: list) -> list:
+    """Store freshly fetched documents and merge them with the reused ones, dropping repeats."""
+    # Empty results are not stored, so a search that timed out is retried by later similar queries
+    for search_query, documents in zip(search_queries, results):
+        if documents:
+            store.add(backend, search_query, documents)
+    return _dedup(reused + [document for documents in results for document in documents], lambda document: document.key)
+
+
+def search_web(state: InterviewState, config: Optional[RunnableConfig] = None):
+    """Retrieve docs from web search, one concurrent search per planned query not served by the run's store."""
+    logger.info("Performing web search")
+    store, reused, search_queries = _plan_fetches("web", state["search_queries"]["web"], config)
+    
+    logger.info(f"Web search queries: {search_queries}")
+    results = [_web_documents(_web_results(response)) for response in fan_out(web_search, search_queries)]
+    return {"context": _merge_documents("web", store, reused, search_queries, results)}
+
+
+async def asearch_web(state: InterviewState, config: Optional[RunnableConfig] = None):
+    """Retrieve docs from web search, one concurrent search per planned query not served by the run's store (async)."""
     logger.info("Performing web search")
-    structured_llm = llm.with_structured_output(SearchQuery)
-    search_instructions_msg = SystemMessage(content=SEARCH_INSTRUCTIONS)
-    search_query = structured_llm.invoke([search_instructions_msg] + state['messages'])
-    
-    logger.info(f"Web search query: {search_query.search_query}")
-    search_docs = tavily_search.invoke(search_query.search_query)
-    
-    # Handle both string and dict responses from TavilySearch
-    if isinstance(search_docs, str):
-        formatted_search_docs = f'<Document source="web_search"/>\n{search_docs}\n</Document>'
-    elif isinstance(search_docs, list) and len(search_docs) > 0 and isinstance(search_docs[0], dict):
-        formatted_search_docs = "\n\n---\n\n".join([
-            f'<Document href="{doc.get("url", "")}"/>\n{doc.get("content", doc)}\n</Document>' 
-            for doc in search_docs
-        ])
-    else:
-        formatted_search_docs = f'<Document source="web_search"/>\n{str(search_docs)}\n</Document>'
-    
-    logger.info(f"Web search completed, found {len(search_docs) if isinstance(search_docs, list) else 1} results")
-    return {"context": [formatted_search_docs]}
-
-
-def search_wikipedia(state: InterviewState):
-    """Retrieve docs from wikipedia."""
+    store, reused, search_queries = _plan_fetches("web", state["search_queries"]["web"], config)
+    
+    logger.info(f"Web search queries: {search_queries}")
+    results = [_web_documents(_web_results(response)) for response in await afan_out(aweb_search, search_queries)]
+    return {"context": _merge_documents("web", store, reused, search_queries, results)}
+
+
+def _wikipedia_documents(search_docs) -> list:
+    """Turn Wikipedia pages or chunks into documents."""
+    documents = [
+        Document(
+            "wikipedia",
+            doc.metadata["source"],
+            doc.page_content,
+            title=doc.metadata.get("title", ""),
+            section=doc.metadata.get("section", "")
+        )
+        for doc in search_docs
+    ]
+    
+    logger.info(f"Wikipedia search completed, found {len(documents)} documents")
+    return documents
+
+
+def search_wikipedia(state: InterviewState, config: Optional[RunnableConfig] = None):
+    """Retrieve docs from wikipedia, one concurrent search per planned query not served by the run's store."""
     logger.info("Performing Wikipedia search")
-    structured_llm = llm.with_structured_output(SearchQuery)
-    search_instructions_msg = SystemMessage(content=SEARCH_INSTRUCTIONS)
-    search_query = structured_llm.invoke([search_instructions_msg] + state['messages'])
+    store, reused, search_queries = _plan_fetches("wikipedia", state["search_queries"]["wikipedia"], config)
     
-    logger.info(f"Wikipedia search query: {search_query.search_query}")
-    search_docs = WikipediaLoader(query=search_query.search_query, load_max_docs=WIKIPEDIA_MAX_DOCS).load()
+    logger.info(f"Wikipedia search queries: {search_queries}")
+    results = [_wikipedia_documents(docs) for docs in fan_out(wikipedia_search, search_queries)]
+    return {"context": _merge_documents("wikipedia", store, reused, search_queries, results)}
+
+
+async def asearch_wikipedia(state: InterviewState, config: Optional[RunnableConfig] = None):
+    """Retrieve docs from wikipedia, one concurrent search per planned query not served by the run's store (async)."""
+    logger.info("Performing Wikipedia search")
+    store, reused, search_queries = _plan_fetches("wikipedia", state["search_queries"]["wikipedia"], config)
     
-    formatted_search_docs = "\n\n---\n\n".join([
-        f'<Document source="{doc.metadata["source"]}" page="{doc.metadata.get("page", "")}"/>\n{doc.page_content}\n</Document>'
+    logger.info(f"Wikipedia search queries: {search_queries}")
+    results = [_wikipedia_documents(docs) for docs in await afan_out(awikipedia_search, search_queries)]
+    return {"context": _merge_documents("wikipedia", store, reused, search_queries, results)}
+
+
+def _local_documents(search_docs) -> list:
+    """Turn local corpus passages into documents."""
+    documents = [
+        Document("local", doc.metadata["source"], doc.page_content, section=doc.metadata.get("section", ""))
         for doc in search_docs
-    ])
+    ]
     
-    logger.info(f"Wikipedia search completed, found {len(search_docs)} documents")
-    return {"context": [formatted_search_docs]}
+    logger.info(f"Local search completed, found {len(documents)} passages")
+    return documents
+
+
+def search_local(state: InterviewState):
+    """Retrieve passages from the local BM25 index."""
+    logger.info("Performing local search")
+    search_queries = state["search_queries"]["local"]
+    
+    # Index lookups take milliseconds, so the queries run one after another
+    logger.info(f"Local search queries: {search_queries}")
+    documents = _local_documents([doc for search_query in search_queries for doc in local_search(search_query)])
+    return {"context": _dedup(documents, lambda document: document.key)}
+
+
+async def asearch_local(state: InterviewState):
+    """Retrieve passages from the local BM25 index (async)."""
+    # A memory-mapped index lookup takes milliseconds, so it runs inline on the loop
+    return search_local(state)
+
+
+def rerank_context(state: InterviewState):
+    """Keep the passages most similar to the latest question and measure the turn's novelty."""
+    logger.info("Reranking retrieved passages")
+    question = state["messages"][-1].content
+    
+    # Documents added since the last rerank came from this turn's retrieval
+    seen_context = state.get("seen_context", 0)
+    previous = unique_passages(state["context"][:seen_context])
+    current = unique_passages(state["context"][seen_context:])
+    novelty = measure_novelty(previous, current, NOVELTY_DUPLICATE_SIMILARITY)
+    
+    # Same order as unique_passages(state["context"]), which _answer_messages rebuilds from the indices
+    previous_hashes = {passage.content_hash for passage in previous}
+    passages = previous + [passage for passage in current if passage.content_hash not in previous_hashes]
+    
+    hits = embedder.hits
+    ranked = rerank(question, [passage.text for passage in passages], RERANK_TOP_K)
+    
+    logger.info(
+        f"Reranked {len(passages)} passages, kept {len(ranked)} "
+        f"({embedder.hits - hits} embeddings from cache), turn novelty: {novelty}"
+    )
+    return {
+        "ranked_context": [index for index, _ in ranked],
+        "seen_context": len(state["context"]),
+        "novelty": novelty
+    }
+
+
+def _answer_messages(state: InterviewState):
+    """Build the prompt messages for the expert's answer."""
+    analyst = state["analyst"]
+    messages = state["messages"]
+    
+    # Passages were already reranked against the latest question; only their indices are checkpointed
+    passages = unique_passages(state["context"])
+    context = pack_passages([passages[index] for index in state["ranked_context"]], ANSWER_CONTEXT_TOKEN_BUDGET)
+    system_message = ANSWER_INSTRUCTIONS.format(goals=analyst.persona, context=context)
+    return [SystemMessage(content=system_message)] + messages
 
 
 def generate_answer(state: InterviewState):
     """Generate an answer to the analyst's question."""
     logger.info("Generating answer")
-    analyst = state["analyst"]
-    messages = state["messages"]
-    context = state["context"]
     
     # Answer question
-    system_message = ANSWER_INSTRUCTIONS.format(goals=analyst.persona, context=context)
-    answer = llm.invoke([SystemMessage(content=system_message)] + messages)
+    answer = llm.invoke(_answer_messages(state))
     
     # Name the message as coming from the expert
     answer.name = "expert"
@@ -95,6 +320,16 @@ def generate_answer(state: InterviewState):
     return {"messages": [answer]}
 
 
+async def agenerate_answer(state: InterviewState):
+    """Generate an answer to the analyst's question (async)."""
+    logger.info("Generating answer")
+    answer = await llm.ainvoke(_answer_messages(state))
+    answer.name = "expert"
+    
+    logger.info("Answer generated from expert")
+    return {"messages": [answer]}
+
+
 def save_interview(state: InterviewState):
     """Save the interview transcript."""
     logger.info("Saving interview transcript")
@@ -107,19 +342,32 @@ def save_interview(state: InterviewState):
     return {"interview": interview}
 
 
-def write_section(state: InterviewState):
-    """Write a report section based on the interview."""
-    logger.info("Writing report section")
-    interview = state["interview"]
-    context = state["context"]
+def _section_messages(state: InterviewState):
+    """Build the prompt messages for the section writer."""
     analyst = state["analyst"]
+    context = pack_context(state["context"], analyst.description, SECTION_CONTEXT_TOKEN_BUDGET)
     
     # Write section using the gathered source docs from interview
     system_message = SECTION_WRITER_INSTRUCTIONS.format(focus=analyst.description)
-    section = llm.invoke([
+    return [
         SystemMessage(content=system_message),
         HumanMessage(content=f"Use this source to write your section: {context}")
-    ])
+    ]
+
+
+def write_section(state: InterviewState):
+    """Write a report section based on the interview."""
+    logger.info("Writing report section")
+    section = llm.invoke(_section_messages(state))
+    
+    logger.info(f"Section written, length: {len(section.content)} characters")
+    return {"sections": [section.content]}
+
+
+async def awrite_section(state: InterviewState):
+    """Write a report section based on the interview (async)."""
+    logger.info("Writing report section")
+    section = await llm.ainvoke(_section_messages(state))
     
     logger.info(f"Section written, length: {len(section.content)} characters")
     return {"sections": [section.content]}
@@ -144,6 +392,16 @@ def route_messages(state: InterviewState, name: str = "expert"):
         logger.info("Interview concluded by analyst, saving")
         return 'save_interview'
     
+    # End early once retrieval stops turning up new material; a turn that retrieved nothing has no score
+    novelty = state.get("novelty")
+    if novelty is not None and novelty["score"] is not None and novelty["score"] < NOVELTY_THRESHOLD:
+        skipped_turns = max_num_turns - num_responses
+        logger.info(
+            f"Retrieval novelty {novelty['score']:.2f} below {NOVELTY_THRESHOLD}, saving interview; "
+            f"skipped {skipped_turns} turns ({skipped_turns * LLM_CALLS_PER_TURN} LLM calls saved)"
+        )
+        return 'save_interview'
+    
     logger.info("Continuing interview")
     return "ask_question"
 
@@ -1,13 +1,31 @@
 """Node functions for report writing."""
+import math
+import time
+from typing import Optional
+from langchain_core.runnables import RunnableConfig
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.types import Send
 from graph.state import ResearchGraphState
 from graph.chains.llm import llm
 from graph.chains.prompts import (
     REPORT_WRITER_INSTRUCTIONS,
-    INTRO_CONCLUSION_INSTRUCTIONS
+    DIGEST_INSTRUCTIONS,
+    INTRO_CONCLUSION_INSTRUCTIONS,
+    FRAMING_INSTRUCTIONS
 )
+from graph.models import ReportFraming
+from graph.concurrency import fan_out, afan_out
+from graph.deadline import interview_trackers, collect_late_interviews
+from graph.retrieval.store import document_stores, run_id
+from graph.retrieval.text import estimate_tokens
 from graph.logging_config import logger
+from config import (
+    MAX_INTERVIEW_TURNS,
+    INTERVIEW_DEADLINE_SECONDS,
+    INTERVIEW_QUORUM,
+    REPORT_FAN_IN,
+    REPORT_DIGEST_TOKEN_BUDGET
+)
 
 
 def initiate_all_interviews(state: ResearchGraphState):
@@ -23,30 +41,166 @@ def initiate_all_interviews(state: ResearchGraphState):
     # Kick off interviews in parallel via Send() API
     topic = state["topic"]
     logger.info(f"Starting {len(state['analysts'])} parallel interviews")
+    # The report proceeds without stragglers after the deadline, once a quorum has finished
+    deadline = {}
+    if INTERVIEW_DEADLINE_SECONDS > 0:
+        deadline = {
+            "deadline": time.time() + INTERVIEW_DEADLINE_SECONDS,
+            "quorum": math.ceil(INTERVIEW_QUORUM * len(state["analysts"]))
+        }
     return [
         Send("conduct_interview", {
+            "interview_topic": topic,
             "analyst": analyst,
-            "messages": [HumanMessage(content=f"So you said you were writing an article on {topic}?")]
+            "messages": [HumanMessage(content=f"So you said you were writing an article on {topic}?")],
+            "max_num_turns": MAX_INTERVIEW_TURNS,
+            **deadline
         }) 
         for analyst in state["analysts"]
     ]
 
 
+def _join_memos(memos: list) -> str:
+    """Concat memos together."""
+    return "\n\n".join([f"{memo}" for memo in memos])
+
+
+def _format_sections(state: ResearchGraphState) -> str:
+    """The run's shared digest, or all sections concatenated when there is none."""
+    return state.get("digest") or _join_memos(state["sections"])
+
+
+def _fan_in() -> int:
+    return max(2, REPORT_FAN_IN)
+
+
+def _total_tokens(memos: list) -> int:
+    return sum(estimate_tokens(memo) for memo in memos)
+
+
+def _memo_budget() -> int:
+    """Tokens of one merged memo, so that a full level of REPORT_FAN_IN memos fits the digest budget."""
+    return REPORT_DIGEST_TOKEN_BUDGET // _fan_in()
+
+
+def _needs_reduction(memos: list) -> bool:
+    """Whether the memos are too long together for one writer prompt."""
+    return _total_tokens(memos) > REPORT_DIGEST_TOKEN_BUDGET
+
+
+def _digest_batches(memos: list) -> list:
+    """Split one reduction level into batches of at most REPORT_FAN_IN memos."""
+    return [memos[start:start + _fan_in()] for start in range(0, len(memos), _fan_in())]
+
+
+def _passes_through(batch: list) -> bool:
+    """A lone memo within the per-memo budget is kept as is; a longer one is condensed."""
+    return len(batch) == 1 and estimate_tokens(batch[0]) <= _memo_budget()
+
+
+def _digest_messages(topic: str, batch: list):
+    """Build the prompt messages that merge a batch of memos into one."""
+    # ~0.75 words per token
+    max_words = _memo_budget() * 3 // 4
+    system_message = DIGEST_INSTRUCTIONS.format(topic=topic, max_words=max_words, context=_join_memos(batch))
+    return [
+        SystemMessage(content=system_message),
+        HumanMessage(content="Merge these memos into one.")
+    ]
+
+
+def digest_sections(state: ResearchGraphState):
+    """Tree-reduce the sections in parallel batches until they fit the digest token budget."""
+    memos = list(state["sections"])
+    level = 0
+    while _needs_reduction(memos):
+        level += 1
+        batches = _digest_batches(memos)
+        logger.info(f"Digest level {level}: merging {len(memos)} memos in {len(batches)} parallel batches")
+        
+        def merge(batch):
+            return batch[0] if _passes_through(batch) else llm.invoke(_digest_messages(state["topic"], batch)).content
+        
+        memos, previous_tokens = fan_out(merge, batches), _total_tokens(memos)
+        if _total_tokens(memos) >= previous_tokens:
+            logger.warning(f"Digest level {level} did not shrink the memos, stopping the reduction")
+            break
+    
+    logger.info(f"Digest ready after {level} levels: {len(memos)} memos from {len(state['sections'])} sections")
+    return {"digest": _join_memos(memos)}
+
+
+async def adigest_sections(state: ResearchGraphState):
+    """Tree-reduce the sections in parallel batches until they fit the digest token budget (async)."""
+    memos = list(state["sections"])
+    level = 0
+    while _needs_reduction(memos):
+        level += 1
+        batches = _digest_batches(memos)
+        logger.info(f"Digest level {level}: merging {len(memos)} memos in {len(batches)} parallel batches")
+        
+        async def merge(batch):
+            if _passes_through(batch):
+                return batch[0]
+            return (await llm.ainvoke(_digest_messages(state["topic"], batch))).content
+        
+        memos, previous_tokens = await afan_out(merge, batches), _total_tokens(memos)
+        if _total_tokens(memos) >= previous_tokens:
+            logger.warning(f"Digest level {level} did not shrink the memos, stopping the reduction")
+            break
+    
+    logger.info(f"Digest ready after {level} levels: {len(memos)} memos from {len(state['sections'])} sections")
+    return {"digest": _join_memos(memos)}
+
+
+def _report_messages(state: ResearchGraphState):
+    """Build the prompt messages for the main report."""
+    system_message = REPORT_WRITER_INSTRUCTIONS.format(topic=state["topic"], context=_format_sections(state))
+    return [
+        SystemMessage(content=system_message),
+        HumanMessage(content="Write a report based upon these memos.")
+    ]
+
+
+def _intro_conclusion_messages(state: ResearchGraphState, request: str):
+    """Build the prompt messages for the introduction or conclusion."""
+    instructions = INTRO_CONCLUSION_INSTRUCTIONS.format(
+        topic=state["topic"],
+        formatted_str_sections=_format_sections(state)
+    )
+    return [
+        instructions,
+        HumanMessage(content=request)
+    ]
+
+
+def _framing_messages(state: ResearchGraphState):
+    """Build the prompt messages for the introduction and conclusion together."""
+    system_message = FRAMING_INSTRUCTIONS.format(
+        topic=state["topic"],
+        formatted_str_sections=_format_sections(state)
+    )
+    return [
+        SystemMessage(content=system_message),
+        HumanMessage(content="Write the report introduction and conclusion")
+    ]
+
+
 def write_report(state: ResearchGraphState):
     """Write the main report content."""
     logger.info("Writing main report")
-    sections = state["sections"]
-    topic = state["topic"]
-    
-    # Concat all sections together
-    formatted_str_sections = "\n\n".join([f"{section}" for section in sections])
     
     # Summarize the sections into a final report
-    system_message = REPORT_WRITER_INSTRUCTIONS.format(topic=topic, context=formatted_str_sections)
-    report = llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Write a report based upon these memos.")
-    ])
+    report = llm.invoke(_report_messages(state))
+    
+    logger.info(f"Main report written, length: {len(report.content)} characters")
+    return {"content": report.content}
+
+
+async def awrite_report(state: ResearchGraphState):
+    """Write the main report content (async)."""
+    logger.info("Writing main report")
+    report = await llm.ainvoke(_report_messages(state))
     
     logger.info(f"Main report written, length: {len(report.content)} characters")
     return {"content": report.content}
@@ -55,21 +209,16 @@ def write_report(state: ResearchGraphState):
 def write_introduction(state: ResearchGraphState):
     """Write the report introduction."""
     logger.info("Writing introduction")
-    sections = state["sections"]
-    topic = state["topic"]
+    intro = llm.invoke(_intro_conclusion_messages(state, "Write the report introduction"))
     
-    # Concat all sections together
-    formatted_str_sections = "\n\n".join([f"{section}" for section in sections])
-    
-    # Write introduction
-    instructions = INTRO_CONCLUSION_INSTRUCTIONS.format(
-        topic=topic, 
-        formatted_str_sections=formatted_str_sections
-    )
-    intro = llm.invoke([
-        instructions,
-        HumanMessage(content="Write the report introduction")
-    ])
+    logger.info(f"Introduction written, length: {len(intro.content)} characters")
+    return {"introduction": intro.content}
+
+
+async def awrite_introduction(state: ResearchGraphState):
+    """Write the report introduction (async)."""
+    logger.info("Writing introduction")
+    intro = await llm.ainvoke(_intro_conclusion_messages(state, "Write the report introduction"))
     
     logger.info(f"Introduction written, length: {len(intro.content)} characters")
     return {"introduction": intro.content}
@@ -78,29 +227,61 @@ def write_introduction(state: ResearchGraphState):
 def write_conclusion(state: ResearchGraphState):
     """Write the report conclusion."""
     logger.info("Writing conclusion")
-    sections = state["sections"]
-    topic = state["topic"]
-    
-    # Concat all sections together
-    formatted_str_sections = "\n\n".join([f"{section}" for section in sections])
+    conclusion = llm.invoke(_intro_conclusion_messages(state, "Write the report conclusion"))
     
-    # Write conclusion
-    instructions = INTRO_CONCLUSION_INSTRUCTIONS.format(
-        topic=topic, 
-        formatted_str_sections=formatted_str_sections
-    )
-    conclusion = llm.invoke([
-        instructions,
-        HumanMessage(content="Write the report conclusion")
-    ])
+    logger.info(f"Conclusion written, length: {len(conclusion.content)} characters")
+    return {"conclusion": conclusion.content}
+
+
+async def awrite_conclusion(state: ResearchGraphState):
+    """Write the report conclusion (async)."""
+    logger.info("Writing conclusion")
+    conclusion = await llm.ainvoke(_intro_conclusion_messages(state, "Write the report conclusion"))
     
     logger.info(f"Conclusion written, length: {len(conclusion.content)} characters")
     return {"conclusion": conclusion.content}
 
 
-def finalize_report(state: ResearchGraphState):
+def write_framing(state: ResearchGraphState):
+    """Write the report introduction and conclusion in one structured call."""
+    logger.info("Writing introduction and conclusion")
+    framing = llm.with_structured_output(ReportFraming).invoke(_framing_messages(state))
+    
+    logger.info(
+        f"Introduction and conclusion written, lengths: "
+        f"{len(framing.introduction)} and {len(framing.conclusion)} characters"
+    )
+    return {"introduction": framing.introduction, "conclusion": framing.conclusion}
+
+
+async def awrite_framing(state: ResearchGraphState):
+    """Write the report introduction and conclusion in one structured call (async)."""
+    logger.info("Writing introduction and conclusion")
+    framing = await llm.with_structured_output(ReportFraming).ainvoke(_framing_messages(state))
+    
+    logger.info(
+        f"Introduction and conclusion written, lengths: "
+        f"{len(framing.introduction)} and {len(framing.conclusion)} characters"
+    )
+    return {"introduction": framing.introduction, "conclusion": framing.conclusion}
+
+
+def finalize_report(state: ResearchGraphState, config: Optional[RunnableConfig] = None):
     """Finalize and assemble the complete report."""
     logger.info("Finalizing report")
+    
+    # The interviews are over, so the run's shared documents are no longer needed
+    store_stats = document_stores.release(run_id(config))
+    if store_stats:
+        logger.info(
+            f"Document store: {store_stats['documents']} documents, "
+            f"{store_stats['fetches_avoided']}/{store_stats['lookups']} fetches avoided"
+        )
+    # Late interviews of a run resumed in another process are not tracked here and count as missing
+    late = interview_trackers.release(run_id(config))
+    late_sections, missing = collect_late_interviews(late) if late else ([], state.get("late_interviews") or [])
+    if late_sections or missing:
+        logger.info(f"{len(late_sections)} late sections attached as addendum, {len(missing)} interviews left out")
     content = state["content"]
     
     # Clean up content
@@ -122,6 +303,12 @@ def finalize_report(state: ResearchGraphState):
     if sources is not None:
         final_report += "\n\n## Sources\n" + sources
     
+    # Interviews that missed the deadline but finished while the report was written
+    if late_sections:
+        final_report += "\n\n---\n\n## Addendum\n\n" + _join_memos(late_sections)
+    if missing:
+        final_report += f"\n\n---\n\n*Interviews left out after the deadline: {', '.join(missing)}*"
+    
     logger.info(f"Report finalized, total length: {len(final_report)} characters")
     return {"final_report": final_report}
 
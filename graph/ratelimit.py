@@ -0,0 +1,187 @@
+"""Process-wide token-bucket rate limits and jittered retry for outbound calls."""
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable
+from graph.concurrency import concurrency_limit
+from graph.metrics import metrics, token_usage
+from graph.logging_config import logger
+from config import (
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    TAVILY_REQUESTS_PER_MINUTE,
+    WIKIPEDIA_REQUESTS_PER_SECOND,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS
+)
+
+# HTTP statuses worth retrying: timeouts, rate limits and transient server errors
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = ("RateLimit", "ResourceExhausted", "Timeout", "Unavailable", "ConnectError", "Connection")
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking.
+
+    A caller takes its tokens immediately, possibly driving the bucket into
+    debt, and is told how long to wait before using them. Both threads and
+    coroutines can therefore share one bucket and are served in arrival order.
+    A non-positive rate disables the limit.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = max(capacity, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def reserve(self, amount: float = 1) -> float:
+        """Take amount tokens and return the seconds to wait before using them."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            wait = max(0.0, -self._tokens / self.rate)
+            self.acquisitions += 1
+            if wait > 0:
+                self.throttled += 1
+                self.wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            return wait
+
+    def stats(self) -> dict:
+        """Return acquisition and wait-time counters."""
+        return {
+            "acquisitions": self.acquisitions,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3)
+        }
+
+
+def per_minute(limit: float) -> TokenBucket:
+    """Create a bucket allowing limit acquisitions per minute."""
+    return TokenBucket(limit / 60, limit)
+
+
+def per_second(limit: float) -> TokenBucket:
+    """Create a bucket allowing limit acquisitions per second."""
+    return TokenBucket(limit, limit)
+
+
+# Shared by every interview branch in the process
+BUCKETS = {
+    "llm_requests": per_minute(LLM_REQUESTS_PER_MINUTE),
+    "llm_tokens": per_minute(LLM_TOKENS_PER_MINUTE),
+    "tavily_requests": per_minute(TAVILY_REQUESTS_PER_MINUTE),
+    "wikipedia_requests": per_second(WIKIPEDIA_REQUESTS_PER_SECOND)
+}
+retries = Counter()
+
+
+def _reserve(costs: dict) -> float:
+    return max((BUCKETS[name].reserve(amount) for name, amount in costs.items()), default=0.0)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Return True for rate limits, timeouts and transient server or network errors."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    if any(marker in type(error).__name__ for marker in RETRYABLE_ERROR_NAMES):
+        return True
+    message = str(error)
+    return "429" in message or "RESOURCE_EXHAUSTED" in message
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY_SECONDS, cap: float = RETRY_MAX_DELAY_SECONDS) -> float:
+    """Full-jitter exponential backoff delay for the given zero-based attempt."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _record(backend: str, started: float, queue_seconds: float, result, costs: dict, retry_count: int, error: bool):
+    input_tokens, output_tokens = token_usage(result, costs.get("llm_tokens", 0))
+    metrics.record_call(
+        backend,
+        seconds=time.perf_counter() - started,
+        queue_seconds=queue_seconds,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        retries=retry_count,
+        error=error
+    )
+
+
+def call_with_backoff(backend: str, fn: Callable, costs: dict, max_attempts: int = RETRY_MAX_ATTEMPTS):
+    """Call fn under the backend's rate limits, retrying transient failures."""
+    started = time.perf_counter()
+    queue_seconds = 0.0
+    for attempt in range(max_attempts):
+        wait = _reserve(costs)
+        if wait > 0:
+            queue_seconds += wait
+            time.sleep(wait)
+        try:
+            result = fn()
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not is_retryable(e):
+                _record(backend, started, queue_seconds, None, costs, attempt, error=True)
+                raise
+            delay = backoff_delay(attempt)
+            retries[backend] += 1
+            logger.warning(f"{backend} call failed ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+            time.sleep(delay)
+        else:
+            _record(backend, started, queue_seconds, result, costs, attempt, error=False)
+            return result
+
+
+async def acall_with_backoff(backend: str, fn: Callable, costs: dict, max_attempts: int = RETRY_MAX_ATTEMPTS):
+    """Await fn() under the backend's rate limits and the global concurrency limit, retrying transient failures."""
+    started = time.perf_counter()
+    queue_seconds = 0.0
+    for attempt in range(max_attempts):
+        # Wait for the rate limit before taking a concurrency slot
+        wait = _reserve(costs)
+        if wait > 0:
+            queue_seconds += wait
+            await asyncio.sleep(wait)
+        try:
+            queued = time.perf_counter()
+            async with concurrency_limit():
+                queue_seconds += time.perf_counter() - queued
+                result = await fn()
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not is_retryable(e):
+                _record(backend, started, queue_seconds, None, costs, attempt, error=True)
+                raise
+            delay = backoff_delay(attempt)
+            retries[backend] += 1
+            logger.warning(f"{backend} call failed ({type(e).__name__}), retry {attempt + 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+        else:
+            _record(backend, started, queue_seconds, result, costs, attempt, error=False)
+            return result
+
+
+def stats() -> dict:
+    """Return per-bucket wait metrics and per-backend retry counts."""
+    return {
+        "buckets": {name: bucket.stats() for name, bucket in BUCKETS.items()},
+        "retries": dict(retries)
+    }
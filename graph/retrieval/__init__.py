@@ -0,0 +1 @@
+"""Retrieval components for the research agent."""
@@ -0,0 +1,191 @@
+"""Persistent BM25 index over a local text corpus, memory-mapped on load.
+
+Postings are stored term by term in flat numpy arrays with the BM25 weight
+of every (term, passage) pair precomputed at build time, so a query only
+sums the weights of its terms' postings. The few very frequent terms are
+additionally stored as dense per-passage weight rows.
+"""
+import json
+import os
+from array import array
+from collections import Counter
+import numpy as np
+from graph.retrieval.chunking import chunk_text
+from graph.retrieval.text import tokenize
+from graph.logging_config import logger
+
+# Plain-text inputs; PDFs must be extracted to text first (e.g. with pdftotext)
+CORPUS_SUFFIXES = (".txt", ".text", ".md", ".markdown")
+
+# Terms in more than 1/DENSE_FRACTION of all passages also get a dense weight row,
+# which is added in one vectorized pass instead of scattering their long postings
+DENSE_FRACTION = 8
+
+
+def iter_corpus(corpus_dir: str):
+    """Yield (relative path, text) for every corpus file, in a stable order."""
+    for directory, subdirectories, files in os.walk(corpus_dir):
+        subdirectories.sort()
+        for name in sorted(files):
+            if not name.lower().endswith(CORPUS_SUFFIXES):
+                continue
+            path = os.path.join(directory, name)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield os.path.relpath(path, corpus_dir), f.read()
+
+
+def build_index(corpus_dir: str, index_dir: str, chunk_tokens: int, k1: float = 1.2, b: float = 0.75) -> dict:
+    """Chunk every corpus file into passages and write a BM25 index to index_dir."""
+    os.makedirs(index_dir, exist_ok=True)
+    vocabulary = {}
+    sources, section_ids = [], {}
+    posting_terms, posting_passages, posting_counts = array("i"), array("i"), array("i")
+    passage_lengths, passage_sources, passage_sections = array("i"), array("i"), array("i")
+    passage_offsets = array("q", [0])
+
+    with open(os.path.join(index_dir, "passages.bin"), "wb") as passages_file:
+        for source, text in iter_corpus(corpus_dir):
+            sources.append(source)
+            for chunk in chunk_text(text, chunk_tokens):
+                passage_id = len(passage_lengths)
+                counts = Counter(tokenize(chunk.text))
+                for term, count in counts.items():
+                    posting_terms.append(vocabulary.setdefault(term, len(vocabulary)))
+                    posting_passages.append(passage_id)
+                    posting_counts.append(count)
+                passage_lengths.append(sum(counts.values()))
+                passage_sources.append(len(sources) - 1)
+                passage_sections.append(section_ids.setdefault(chunk.section, len(section_ids)))
+
+                encoded = chunk.text.encode("utf-8")
+                passages_file.write(encoded)
+                passage_offsets.append(passage_offsets[-1] + len(encoded))
+    sections = sorted(section_ids, key=section_ids.get)
+
+    terms = np.frombuffer(posting_terms, dtype=np.int32)
+    passages = np.frombuffer(posting_passages, dtype=np.int32)
+    counts = np.frombuffer(posting_counts, dtype=np.int32).astype(np.float32)
+    lengths = np.frombuffer(passage_lengths, dtype=np.int32).astype(np.float32)
+
+    # Group postings by term, passages ascending within a term
+    order = np.lexsort((passages, terms))
+    terms, passages, counts = terms[order], passages[order], counts[order]
+
+    passage_count = len(lengths)
+    average_length = float(lengths.mean()) if passage_count else 0.0
+    document_frequency = np.bincount(terms, minlength=len(vocabulary)).astype(np.float64)
+    idf = np.log(1 + (passage_count - document_frequency + 0.5) / (document_frequency + 0.5))
+    norms = k1 * (1 - b + b * lengths[passages] / max(average_length, 1e-9))
+    weights = (idf[terms] * counts * (k1 + 1) / (counts + norms)).astype(np.float32)
+    term_offsets = np.concatenate([[0], np.cumsum(document_frequency)]).astype(np.int64)
+
+    dense_terms = np.flatnonzero(document_frequency * DENSE_FRACTION >= max(passage_count, 1))
+    dense_rows = np.full(len(vocabulary), -1, dtype=np.int32)
+    dense_rows[dense_terms] = np.arange(len(dense_terms), dtype=np.int32)
+    dense_weights = np.zeros((len(dense_terms), passage_count), dtype=np.float32)
+    for row, term in enumerate(dense_terms):
+        start, end = term_offsets[term], term_offsets[term + 1]
+        dense_weights[row, passages[start:end]] = weights[start:end]
+
+    np.save(os.path.join(index_dir, "postings_passages.npy"), passages)
+    np.save(os.path.join(index_dir, "postings_weights.npy"), weights)
+    np.save(os.path.join(index_dir, "term_offsets.npy"), term_offsets)
+    np.save(os.path.join(index_dir, "dense_rows.npy"), dense_rows)
+    np.save(os.path.join(index_dir, "dense_weights.npy"), dense_weights)
+    np.save(os.path.join(index_dir, "passage_offsets.npy"), np.frombuffer(passage_offsets, dtype=np.int64))
+    np.save(os.path.join(index_dir, "passage_sources.npy"), np.frombuffer(passage_sources, dtype=np.int32))
+    np.save(os.path.join(index_dir, "passage_sections.npy"), np.frombuffer(passage_sections, dtype=np.int32))
+    with open(os.path.join(index_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+        json.dump(vocabulary, f)
+    stats = {
+        "files": len(sources),
+        "passages": passage_count,
+        "terms": len(vocabulary),
+        "postings": int(len(weights)),
+        "dense_terms": int(len(dense_terms)),
+        "average_passage_terms": round(average_length, 2),
+        "k1": k1,
+        "b": b
+    }
+    with open(os.path.join(index_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({**stats, "sources": sources, "sections": sections}, f)
+
+    logger.info(f"Built BM25 index in {index_dir}: {stats}")
+    return stats
+
+
+class BM25Index:
+    """Read-only BM25 index whose arrays are memory-mapped from index_dir."""
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(index_dir, "vocabulary.json"), encoding="utf-8") as f:
+            self.vocabulary = json.load(f)
+        self.sources = meta["sources"]
+        self.sections = meta["sections"]
+        self.passage_count = meta["passages"]
+
+        def load(name: str):
+            return np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r")
+
+        self.postings_passages = load("postings_passages")
+        self.postings_weights = load("postings_weights")
+        self.term_offsets = load("term_offsets")
+        self.dense_rows = load("dense_rows")
+        self.dense_weights = load("dense_weights")
+        self.passage_offsets = load("passage_offsets")
+        self.passage_sources = load("passage_sources")
+        self.passage_sections = load("passage_sections")
+        text_path = os.path.join(index_dir, "passages.bin")
+        self.text = np.memmap(text_path, dtype=np.uint8, mode="r") if os.path.getsize(text_path) else b""
+
+    def __len__(self) -> int:
+        return self.passage_count
+
+    def search(self, query: str, top_k: int) -> list:
+        """Return up to top_k (passage id, score) pairs, best first."""
+        term_ids = {self.vocabulary[term] for term in tokenize(query) if term in self.vocabulary}
+        if not term_ids or top_k <= 0:
+            return []
+
+        dense_rows = [int(self.dense_rows[term]) for term in term_ids if self.dense_rows[term] >= 0]
+        spans = [
+            (int(self.term_offsets[term]), int(self.term_offsets[term + 1]))
+            for term in term_ids if self.dense_rows[term] < 0
+        ]
+        postings = sum(end - start for start, end in spans)
+
+        # Few postings: aggregate over the candidates only; otherwise accumulate into a dense score array
+        if not dense_rows and postings * DENSE_FRACTION < self.passage_count:
+            passages = np.concatenate([self.postings_passages[start:end] for start, end in spans])
+            weights = np.concatenate([self.postings_weights[start:end] for start, end in spans])
+            candidates, inverse = np.unique(passages, return_inverse=True)
+            scores = np.bincount(inverse, weights=weights)
+        else:
+            scores = np.zeros(self.passage_count, dtype=np.float32)
+            for row in dense_rows:
+                scores += self.dense_weights[row]
+            for start, end in spans:
+                # Passages are unique within a term's postings, so fancy-index += is safe
+                scores[self.postings_passages[start:end]] += self.postings_weights[start:end]
+            candidates = np.arange(self.passage_count)
+
+        if len(scores) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(scores))
+        best = best[scores[best] > 0]
+        best = best[np.lexsort((candidates[best], -scores[best]))]
+        return [(int(candidates[index]), float(scores[index])) for index in best]
+
+    def passage(self, passage_id: int) -> dict:
+        """Return the text, source file and section of a passage."""
+        start, end = int(self.passage_offsets[passage_id]), int(self.passage_offsets[passage_id + 1])
+        return {
+            "text": bytes(self.text[start:end]).decode("utf-8"),
+            "source": self.sources[int(self.passage_sources[passage_id])],
+            "section": self.sections[int(self.passage_sections[passage_id])]
+        }
+
@@ -0,0 +1,89 @@
+"""Section and paragraph aware chunking with top-k passage selection."""
+import re
+from typing import NamedTuple
+from graph.retrieval.text import estimate_tokens, score_texts
+
+# Wikipedia plain-text section headings look like "== History ==" or "=== Early life ===",
+# markdown ones like "## History"
+HEADING_PATTERN = re.compile(r"^\s*(?:(=+)\s*(.*?)\s*\1|#{1,6}\s+(.*?))\s*$", re.M)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+class Chunk(NamedTuple):
+    """A passage of a larger text and the section it came from."""
+    section: str
+    text: str
+
+
+def split_sections(text: str) -> list:
+    """Split text into (section title, body) pairs on heading lines."""
+    sections = []
+    title = ""
+    position = 0
+    for match in HEADING_PATTERN.finditer(text):
+        sections.append((title, text[position:match.start()]))
+        title = match.group(2) if match.group(1) else match.group(3)
+        position = match.end()
+    sections.append((title, text[position:]))
+    return [(title, body.strip()) for title, body in sections if body.strip()]
+
+
+def _split_long_paragraph(paragraph: str, chunk_tokens: int) -> list:
+    """Split a paragraph that is larger than one chunk on sentence boundaries."""
+    pieces = []
+    current = ""
+    for sentence in SENTENCE_PATTERN.split(paragraph):
+        if current and estimate_tokens(current) + estimate_tokens(sentence) > chunk_tokens:
+            pieces.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_text(text: str, chunk_tokens: int, overlap_tokens: int = 0) -> list:
+    """Chunk text into passages of roughly chunk_tokens without crossing sections.
+
+    Consecutive chunks of the same section share up to overlap_tokens of
+    trailing paragraphs so that facts spanning a boundary stay retrievable.
+    """
+    chunks = []
+    for section, body in split_sections(text):
+        paragraphs = []
+        for paragraph in re.split(r"\n\s*\n|\n", body):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if estimate_tokens(paragraph) > chunk_tokens:
+                paragraphs.extend(_split_long_paragraph(paragraph, chunk_tokens))
+            else:
+                paragraphs.append(paragraph)
+
+        current = []
+        current_tokens = 0
+        for paragraph in paragraphs:
+            paragraph_tokens = estimate_tokens(paragraph)
+            if current and current_tokens + paragraph_tokens > chunk_tokens:
+                chunks.append(Chunk(section, "\n\n".join(current)))
+                # Carry trailing paragraphs over as overlap, never the whole chunk
+                overlap = []
+                overlap_size = 0
+                for previous in reversed(current[1:]):
+                    size = estimate_tokens(previous)
+                    if overlap_size + size > overlap_tokens:
+                        break
+                    overlap.insert(0, previous)
+                    overlap_size += size
+                current, current_tokens = overlap, overlap_size
+            current.append(paragraph)
+            current_tokens += paragraph_tokens
+        if current:
+            chunks.append(Chunk(section, "\n\n".join(current)))
+    return chunks
+
+
+def rank_chunks(chunks: list, query: str) -> list:
+    """Return chunk indices ordered from most to least relevant to query."""
+    scores = score_texts(query, [f"{chunk.section} {chunk.text}" for chunk in chunks])
+    return sorted(range(len(chunks)), key=lambda index: (-scores[index], index))
@@ -0,0 +1,50 @@
+"""Compact retrieved-document records, rendered to prompt text only when a prompt is built."""
+from dataclasses import dataclass, fields, replace
+from graph.retrieval.text import content_hash
+
+
+@dataclass(frozen=True, slots=True)
+class Document:
+    """One retrieved document or passage, as kept in graph state and checkpoints."""
+    source: str                 # Retrieval backend: web, wikipedia or local
+    url: str                    # Web URL, Wikipedia page URL or local file path
+    text: str
+    title: str = ""             # Wikipedia page title
+    section: str = ""           # Section a Wikipedia or local chunk came from
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of the whitespace-normalized text, computed when needed rather than checkpointed."""
+        return content_hash(self.text)
+
+    @property
+    def key(self) -> str:
+        """Identity of the document: the URL of a web result, otherwise the hash of its text."""
+        return self.url if self.source == "web" and self.url else self.content_hash
+
+    @property
+    def header(self) -> str:
+        """The <Document .../> header naming the document's source in prompts."""
+        section = f' section="{self.section}"' if self.section else ""
+        if self.source == "web":
+            return f'<Document href="{self.url}"/>' if self.url else '<Document source="web_search"/>'
+        if self.source == "wikipedia":
+            return f'<Document source="{self.url}" page="{self.title}"{section}/>'
+        return f'<Document source="{self.url}"{section}/>'
+
+    def render(self) -> str:
+        """Render the document into prompt format."""
+        return f"{self.header}\n{self.text}\n</Document>"
+
+    def passage(self, text: str) -> "Document":
+        """A passage of this document: the same source with part of its text."""
+        return replace(self, text=text)
+
+    def to_dict(self) -> dict:
+        """Plain-dict form for JSON caches."""
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+def render_documents(documents: list) -> str:
+    """Render documents into one prompt string."""
+    return "\n\n---\n\n".join(document.render() for document in documents)
@@ -0,0 +1,79 @@
+"""Local hashing embeddings and batched cosine reranking."""
+import math
+import zlib
+from functools import lru_cache
+import numpy as np
+from graph.cache import LRUCache
+from graph.retrieval.text import content_hash, tokenize
+from config import EMBEDDING_DIMENSIONS, EMBEDDING_CACHE_ENTRIES
+
+
+@lru_cache(maxsize=200000)
+def _feature(term: str, dimensions: int) -> tuple:
+    """Return the (column, sign) a term is hashed to."""
+    hashed = zlib.crc32(term.encode("utf-8"))
+    return hashed % dimensions, 1.0 if hashed & 0x80000000 else -1.0
+
+
+def _terms(text: str) -> list:
+    """Unigrams and bigrams of the text's content words."""
+    tokens = tokenize(text)
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+class HashingEmbedder:
+    """Signed feature-hashing embedder with an in-memory cache keyed by content hash.
+
+    The signed count c of every hashed feature is damped to
+    sign(c) * log(1 + |c|) and rows are L2-normalized, so a dot product
+    between two embeddings is their cosine similarity.
+    """
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS, cache_entries: int = EMBEDDING_CACHE_ENTRIES):
+        self.dimensions = dimensions
+        self.cache = LRUCache(cache_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def _embed_batch(self, texts: list) -> np.ndarray:
+        rows, columns, signs = [], [], []
+        for row, text in enumerate(texts):
+            for term in _terms(text):
+                column, sign = _feature(term, self.dimensions)
+                rows.append(row)
+                columns.append(column)
+                signs.append(sign)
+
+        counts = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(counts, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), np.array(signs, dtype=np.float32))
+        vectors = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def embed(self, texts: list) -> np.ndarray:
+        """Return one unit-length row per text, embedding only texts not seen before."""
+        keys = [content_hash(text) for text in texts]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = [index for index, vector in enumerate(vectors) if vector is None]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            for index, vector in zip(missing, self._embed_batch([texts[index] for index in missing])):
+                vectors[index] = vector
+                self.cache.set(keys[index], vector, math.inf)
+        if not vectors:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.vstack(vectors)
+
+
+embedder = HashingEmbedder()
+
+
+def rerank(query: str, texts: list, top_k: int, model: HashingEmbedder = embedder) -> list:
+    """Return up to top_k (index, cosine similarity) pairs of the texts most similar to query, best first."""
+    if not texts or top_k <= 0:
+        return []
+    query_vector = model.embed([query])[0]
+    scores = model.embed(texts) @ query_vector
+    best = np.argsort(-scores, kind="stable")[:top_k]
+    return [(int(index), float(scores[index])) for index in best]
@@ -0,0 +1,38 @@
+"""Novelty of a retrieval turn relative to the context gathered before it."""
+import numpy as np
+from graph.retrieval.embeddings import HashingEmbedder, embedder
+
+
+def measure_novelty(previous: list, current: list, duplicate_similarity: float, model: HashingEmbedder = embedder) -> dict:
+    """Compare this turn's passages with earlier ones.
+
+    A passage is new when its content hash was not seen before and it is
+    less than duplicate_similarity (cosine) away from every earlier passage.
+    The score is the fraction of new passages. A turn that retrieved
+    nothing, e.g. because its searches timed out, has no score: that is a
+    failed retrieval, not material that was already seen.
+    """
+    if not current:
+        return {"passages": 0, "new_sources": None, "new_passages": None, "overlap": None, "score": None}
+
+    seen_hashes = {passage.content_hash for passage in previous}
+    seen_sources = {passage.url for passage in previous}
+    sources = {passage.url for passage in current}
+
+    if previous:
+        similarity = model.embed([passage.text for passage in current]) @ model.embed([passage.text for passage in previous]).T
+        closest = similarity.max(axis=1)
+    else:
+        closest = np.zeros(len(current), dtype=np.float32)
+
+    new = [
+        passage.content_hash not in seen_hashes and bool(closest[index] < duplicate_similarity)
+        for index, passage in enumerate(current)
+    ]
+    return {
+        "passages": len(current),
+        "new_sources": round(len(sources - seen_sources) / len(sources), 4),
+        "new_passages": round(sum(passage.content_hash not in seen_hashes for passage in current) / len(current), 4),
+        "overlap": round(float(closest.mean()), 4),
+        "score": round(sum(new) / len(current), 4)
+    }
@@ -0,0 +1,58 @@
+"""Relevance-ranked context packing under a token budget."""
+from graph.retrieval.chunking import chunk_text
+from graph.retrieval.documents import Document
+from graph.retrieval.text import estimate_tokens, score_texts
+from graph.logging_config import logger
+
+# Target size of the passages documents are split into before ranking
+CHUNK_TOKENS = 256
+
+
+def split_passages(document: Document, chunk_tokens: int = CHUNK_TOKENS) -> list:
+    """Split a document into paragraph-aligned passages of roughly chunk_tokens."""
+    chunks = chunk_text(document.text, chunk_tokens)
+    # A document that fits one chunk is its own passage, keeping its hash and sharing its text
+    if len(chunks) == 1 and chunks[0].text == document.text:
+        return [document]
+    return [document.passage(chunk.text) for chunk in chunks]
+
+
+def unique_passages(documents: list) -> list:
+    """Split documents into passages, dropping repeated passages."""
+    passages = []
+    seen = set()
+    for document in documents:
+        for passage in split_passages(document):
+            if passage.content_hash not in seen:
+                seen.add(passage.content_hash)
+                passages.append(passage)
+    return passages
+
+
+def pack_passages(passages: list, token_budget: int) -> str:
+    """Render already ranked passages into a prompt string within token_budget."""
+    packed = []
+    used_tokens = 0
+    dropped_tokens = 0
+    for passage in passages:
+        rendered = passage.render()
+        tokens = estimate_tokens(rendered)
+        if used_tokens + tokens <= token_budget:
+            packed.append(rendered)
+            used_tokens += tokens
+        else:
+            dropped_tokens += tokens
+
+    logger.info(
+        f"Packed context: {len(packed)}/{len(passages)} passages, "
+        f"{used_tokens} tokens kept, {dropped_tokens} tokens dropped"
+    )
+    return "\n\n---\n\n".join(packed)
+
+
+def pack_context(documents: list, query: str, token_budget: int) -> str:
+    """Dedup, rank and pack document passages into a prompt string within token_budget."""
+    passages = unique_passages(documents)
+    scores = score_texts(query, [passage.text for passage in passages])
+    ranked = sorted(zip(scores, range(len(passages))), key=lambda item: (-item[0], item[1]))
+    return pack_passages([passages[index] for _, index in ranked], token_budget)
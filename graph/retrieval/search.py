@@ -0,0 +1,375 @@
+"""Cached search backends for Tavily and Wikipedia."""
+import asyncio
+import concurrent.futures
+import contextvars
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Callable
+from langchain_core.documents import Document
+from graph.cache import DiskCache, LRUCache, SingleFlight
+from graph.ratelimit import call_with_backoff, acall_with_backoff
+from graph.retrieval.chunking import chunk_text, rank_chunks
+from graph.metrics import metrics
+from graph.logging_config import logger
+from config import (
+    require_api_key,
+    RETRIEVAL_BACKENDS,
+    LOCAL_INDEX_DIR,
+    LOCAL_TOP_K,
+    WEB_SEARCH_MAX_RESULTS,
+    WIKIPEDIA_MAX_DOCS,
+    WIKIPEDIA_MODE,
+    WIKIPEDIA_CHUNK_TOKENS,
+    WIKIPEDIA_CHUNK_OVERLAP_TOKENS,
+    WIKIPEDIA_TOP_K_CHUNKS,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_MAX_BYTES,
+    SEARCH_CACHE_MEMORY_ENTRIES,
+    TAVILY_CACHE_TTL_SECONDS,
+    WIKIPEDIA_CACHE_TTL_SECONDS,
+    TAVILY_TIMEOUT_SECONDS,
+    WIKIPEDIA_TIMEOUT_SECONDS,
+    MAX_CONCURRENCY
+)
+
+BACKEND_DESCRIPTIONS = {
+    "web": "General web search (Tavily). Works best with specific, natural-language queries.",
+    "wikipedia": "Wikipedia article search. Works best with short encyclopedic topic names.",
+    "local": "Keyword (BM25) search over the local document corpus. Works best with distinctive terms."
+}
+
+if not RETRIEVAL_BACKENDS:
+    raise ValueError("RETRIEVAL_BACKENDS must name at least one retrieval backend")
+unknown_backends = set(RETRIEVAL_BACKENDS) - set(BACKEND_DESCRIPTIONS)
+if unknown_backends:
+    raise ValueError(f"Unknown retrieval backends {sorted(unknown_backends)}, expected {sorted(BACKEND_DESCRIPTIONS)}")
+
+# Retrieval backends the query planner writes queries for
+SEARCH_BACKENDS = {name: BACKEND_DESCRIPTIONS[name] for name in RETRIEVAL_BACKENDS}
+
+
+# Words of a query, in any script; everything between them is punctuation or whitespace
+QUERY_WORD = re.compile(r"\w+")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, punctuation and whitespace so trivially different spellings share a cache entry.
+
+    Word order and question words are kept: "how" and "why" questions about
+    the same subject are different searches.
+    """
+    return " ".join(QUERY_WORD.findall(query.casefold()))
+
+
+@lru_cache(maxsize=None)
+def _timeout_executor() -> concurrent.futures.ThreadPoolExecutor:
+    return concurrent.futures.ThreadPoolExecutor(max_workers=MAX_CONCURRENCY, thread_name_prefix="search")
+
+
+class SearchCache:
+    """Two-tier (memory LRU + disk) search cache with single-flight coalescing.
+
+    With a timeout, a load that takes longer is no longer waited for: the
+    caller gets the stale disk entry for the query, if any, or the default.
+    The load keeps running and fills the cache for later turns.
+    """
+
+    def __init__(self, disk: DiskCache, memory: LRUCache):
+        self.disk = disk
+        self.memory = memory
+        self.flight = SingleFlight()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.timeouts = 0
+
+    def key(self, backend: str, query: str, params: str = "") -> str:
+        """Build the cache key for a backend query."""
+        raw = f"{backend}|{params}|{normalize_query(query)}"
+        return f"{backend}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+    def fetch(
+        self,
+        backend: str,
+        query: str,
+        ttl_seconds: float,
+        loader: Callable,
+        params: str = "",
+        timeout_seconds: float = 0.0,
+        default=None
+    ):
+        """Return the cached payload for a query, calling loader at most once per key."""
+        key = self.key(backend, query, params)
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            metrics.record_call(backend, cache_hit=True)
+            return value
+        if timeout_seconds <= 0:
+            return self.flight.do(key, lambda: self._load(backend, key, ttl_seconds, loader))
+
+        # The load runs in a copy of the caller's context so its metrics keep their labels
+        pending = _timeout_executor().submit(
+            contextvars.copy_context().run, self.flight.do, key, lambda: self._load(backend, key, ttl_seconds, loader)
+        )
+        try:
+            return pending.result(timeout=timeout_seconds)
+        except concurrent.futures.TimeoutError:
+            return self._stale(backend, key, query, timeout_seconds, default)
+
+    def _stale(self, backend: str, key: str, query: str, timeout_seconds: float, default):
+        """Fallback of a load that timed out: the disk entry regardless of age, or the default."""
+        self.timeouts += 1
+        metrics.record_timeout(backend)
+        cached = self.disk.get(key, max_age_seconds=math.inf)
+        logger.warning(
+            f"{backend} search for '{query}' took over {timeout_seconds}s, "
+            f"proceeding with {'a stale cached result' if cached is not None else 'no result'}"
+        )
+        return json.loads(cached) if cached is not None else default
+
+    def _load(self, backend: str, key: str, ttl_seconds: float, loader: Callable):
+        cached = self.disk.get(key, max_age_seconds=ttl_seconds)
+        if cached is not None:
+            self.disk_hits += 1
+            metrics.record_call(backend, cache_hit=True)
+            value = json.loads(cached)
+        else:
+            self.misses += 1
+            value = loader()
+            self.disk.set(key, json.dumps(value, default=str))
+        self.memory.set(key, value, ttl_seconds)
+        return value
+
+    async def afetch(
+        self,
+        backend: str,
+        query: str,
+        ttl_seconds: float,
+        loader: Callable,
+        params: str = "",
+        timeout_seconds: float = 0.0,
+        default=None
+    ):
+        """Asynchronously return the cached payload for a query, awaiting loader at most once per key."""
+        key = self.key(backend, query, params)
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            metrics.record_call(backend, cache_hit=True)
+            return value
+        if timeout_seconds <= 0:
+            return await self.flight.ado(key, lambda: self._aload(backend, key, ttl_seconds, loader))
+
+        # Shielded, so a load that times out still finishes and fills the cache
+        pending = asyncio.ensure_future(self.flight.ado(key, lambda: self._aload(backend, key, ttl_seconds, loader)))
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending), timeout_seconds)
+        except asyncio.TimeoutError:
+            # Retrieve a later failure so it is not reported as never retrieved
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+            return self._stale(backend, key, query, timeout_seconds, default)
+
+    async def _aload(self, backend: str, key: str, ttl_seconds: float, loader: Callable):
+        cached = self.disk.get(key, max_age_seconds=ttl_seconds)
+        if cached is not None:
+            self.disk_hits += 1
+            metrics.record_call(backend, cache_hit=True)
+            value = json.loads(cached)
+        else:
+            self.misses += 1
+            value = await loader()
+            self.disk.set(key, json.dumps(value, default=str))
+        self.memory.set(key, value, ttl_seconds)
+        return value
+
+    def stats(self) -> dict:
+        """Return hit/miss/coalescing counters."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "timeouts": self.timeouts,
+            "coalesced": self.flight.shared
+        }
+
+
+@lru_cache(maxsize=None)
+def get_tavily_search():
+    """Return the process-wide Tavily client, built on first use."""
+    from langchain_tavily import TavilySearch
+    require_api_key("TAVILY_API_KEY")
+    return TavilySearch(max_results=WEB_SEARCH_MAX_RESULTS)
+
+
+search_cache = SearchCache(
+    DiskCache(SEARCH_CACHE_PATH, SEARCH_CACHE_MAX_BYTES, max(TAVILY_CACHE_TTL_SECONDS, WIKIPEDIA_CACHE_TTL_SECONDS)),
+    LRUCache(SEARCH_CACHE_MEMORY_ENTRIES)
+)
+
+
+def _tavily_results(response):
+    """Raise errors that the Tavily tool returns as values so they are retried, not cached."""
+    if isinstance(response, dict) and isinstance(response.get("error"), Exception):
+        raise response["error"]
+    return response
+
+
+def _load_web(query: str):
+    return call_with_backoff(
+        "tavily",
+        lambda: _tavily_results(get_tavily_search().invoke(query)),
+        {"tavily_requests": 1}
+    )
+
+
+async def _aload_web(query: str):
+    async def search():
+        return _tavily_results(await get_tavily_search().ainvoke(query))
+    return await acall_with_backoff("tavily", search, {"tavily_requests": 1})
+
+
+def web_search(query: str):
+    """Search the web with Tavily through the search cache."""
+    return search_cache.fetch(
+        "tavily",
+        query,
+        TAVILY_CACHE_TTL_SECONDS,
+        lambda: _load_web(query),
+        params=str(WEB_SEARCH_MAX_RESULTS),
+        timeout_seconds=TAVILY_TIMEOUT_SECONDS,
+        default={"results": []}
+    )
+
+
+async def aweb_search(query: str):
+    """Asynchronously search the web with Tavily through the search cache."""
+    return await search_cache.afetch(
+        "tavily",
+        query,
+        TAVILY_CACHE_TTL_SECONDS,
+        lambda: _aload_web(query),
+        params=str(WEB_SEARCH_MAX_RESULTS),
+        timeout_seconds=TAVILY_TIMEOUT_SECONDS,
+        default={"results": []}
+    )
+
+
+# The summary mode only needs lead sections, which the search request already returns
+WIKIPEDIA_LEAD_ONLY = WIKIPEDIA_MODE == "summary"
+# One search request plus one page request per loaded document
+WIKIPEDIA_REQUEST_COST = {"wikipedia_requests": 1 if WIKIPEDIA_LEAD_ONLY else 1 + WIKIPEDIA_MAX_DOCS}
+
+
+def _load_wikipedia(query: str) -> list:
+    from graph.retrieval.wikipedia import get_wikipedia_client
+    logger.info(f"Fetching Wikipedia pages for: {query}")
+    return call_with_backoff(
+        "wikipedia",
+        lambda: get_wikipedia_client().load(query, WIKIPEDIA_MAX_DOCS, WIKIPEDIA_LEAD_ONLY),
+        WIKIPEDIA_REQUEST_COST
+    )
+
+
+async def _aload_wikipedia(query: str) -> list:
+    from graph.retrieval.wikipedia import get_wikipedia_client
+    logger.info(f"Fetching Wikipedia pages for: {query}")
+    return await acall_with_backoff(
+        "wikipedia",
+        lambda: get_wikipedia_client().aload(query, WIKIPEDIA_MAX_DOCS, WIKIPEDIA_LEAD_ONLY),
+        WIKIPEDIA_REQUEST_COST
+    )
+
+
+def select_wikipedia_content(pages: list, query: str, mode: str = WIKIPEDIA_MODE) -> list:
+    """Reduce cached Wikipedia pages to the content sent to the LLM.
+
+    ``full`` keeps whole pages, ``summary`` keeps each page's lead summary and
+    ``chunks`` keeps the top-k section-aware chunks across all pages.
+    """
+    if mode == "full":
+        return [Document(page_content=page["page_content"], metadata=page["metadata"]) for page in pages]
+
+    if mode == "summary":
+        return [
+            Document(
+                page_content=page["metadata"].get("summary") or page["page_content"][:2000],
+                metadata=page["metadata"]
+            )
+            for page in pages
+        ]
+
+    chunks = []
+    sources = []
+    for page in pages:
+        for chunk in chunk_text(page["page_content"], WIKIPEDIA_CHUNK_TOKENS, WIKIPEDIA_CHUNK_OVERLAP_TOKENS):
+            chunks.append(chunk)
+            sources.append(page["metadata"])
+    selected = rank_chunks(chunks, query)[:WIKIPEDIA_TOP_K_CHUNKS]
+
+    total_chars = sum(len(page["page_content"]) for page in pages)
+    kept_chars = sum(len(chunks[index].text) for index in selected)
+    logger.info(f"Selected {len(selected)}/{len(chunks)} Wikipedia chunks, {kept_chars}/{total_chars} characters")
+    return [
+        Document(page_content=chunks[index].text, metadata={**sources[index], "section": chunks[index].section})
+        for index in selected
+    ]
+
+
+def wikipedia_search(query: str) -> list:
+    """Load Wikipedia documents through the search cache."""
+    pages = search_cache.fetch(
+        "wikipedia",
+        query,
+        WIKIPEDIA_CACHE_TTL_SECONDS,
+        lambda: _load_wikipedia(query),
+        params=f"{WIKIPEDIA_MAX_DOCS}|{'lead' if WIKIPEDIA_LEAD_ONLY else 'pages'}",
+        timeout_seconds=WIKIPEDIA_TIMEOUT_SECONDS,
+        default=[]
+    )
+    return select_wikipedia_content(pages, query)
+
+
+async def awikipedia_search(query: str) -> list:
+    """Asynchronously load Wikipedia documents through the search cache."""
+    pages = await search_cache.afetch(
+        "wikipedia",
+        query,
+        WIKIPEDIA_CACHE_TTL_SECONDS,
+        lambda: _aload_wikipedia(query),
+        params=f"{WIKIPEDIA_MAX_DOCS}|{'lead' if WIKIPEDIA_LEAD_ONLY else 'pages'}",
+        timeout_seconds=WIKIPEDIA_TIMEOUT_SECONDS,
+        default=[]
+    )
+    return select_wikipedia_content(pages, query)
+
+
+@lru_cache(maxsize=None)
+def get_local_index():
+    """Return the process-wide BM25 index, memory-mapped on first use."""
+    from graph.retrieval.bm25 import BM25Index
+    if not os.path.exists(os.path.join(LOCAL_INDEX_DIR, "meta.json")):
+        raise FileNotFoundError(
+            f"No local index in {LOCAL_INDEX_DIR}; build it with `python main.py --build-index CORPUS_DIR`"
+        )
+    return BM25Index(LOCAL_INDEX_DIR)
+
+
+def local_search(query: str, top_k: int = LOCAL_TOP_K) -> list:
+    """Search the local BM25 index; no network and no cache needed."""
+    started = time.perf_counter()
+    index = get_local_index()
+    documents = []
+    for passage_id, score in index.search(query, top_k):
+        passage = index.passage(passage_id)
+        documents.append(Document(
+            page_content=passage["text"],
+            metadata={"source": passage["source"], "section": passage["section"], "score": round(score, 4)}
+        ))
+    metrics.record_call("local", seconds=time.perf_counter() - started)
+    return documents
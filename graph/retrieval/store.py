@@ -0,0 +1,104 @@
+"""Run-scoped document store shared by the interview branches of one research run."""
+import threading
+import numpy as np
+from graph.retrieval.embeddings import HashingEmbedder, embedder
+from graph.metrics import metrics
+from graph.logging_config import logger
+from config import DOCUMENT_STORE_QUERY_SIMILARITY, DOCUMENT_STORE_MAX_RUNS
+
+
+class DocumentStore:
+    """Thread-safe store of the documents fetched during one run, keyed by Document.key.
+
+    Every fetched query is remembered together with the documents it returned.
+    A later query that is nearly the same (cosine similarity of the query
+    embeddings) is answered from the store instead of the network.
+    """
+
+    def __init__(self, query_similarity: float = DOCUMENT_STORE_QUERY_SIMILARITY, model: HashingEmbedder = embedder):
+        self.query_similarity = query_similarity
+        self.model = model
+        self._lock = threading.Lock()
+        self._documents = {}
+        self._queries = {}
+        self.lookups = 0
+        self.fetches_avoided = 0
+
+    def add(self, backend: str, query: str, documents: list):
+        """Remember the documents one query returned from a backend."""
+        vector = self.model.embed([query])[0]
+        with self._lock:
+            keys = []
+            for document in documents:
+                self._documents.setdefault(document.key, document)
+                keys.append(document.key)
+            self._queries.setdefault(backend, []).append((query, vector, keys))
+
+    def lookup(self, backend: str, query: str):
+        """Return the stored documents of the most similar earlier query, or None."""
+        vector = self.model.embed([query])[0]
+        with self._lock:
+            self.lookups += 1
+            entries = self._queries.get(backend, [])
+            if not entries:
+                return None
+            similarities = np.array([stored_vector @ vector for _, stored_vector, _ in entries])
+            best = int(similarities.argmax())
+            if similarities[best] < self.query_similarity:
+                return None
+            self.fetches_avoided += 1
+            stored_query, _, keys = entries[best]
+            documents = [self._documents[key] for key in keys]
+
+        metrics.record_call(f"{backend}_store", cache_hit=True)
+        logger.info(f"Reusing {len(documents)} {backend} documents of '{stored_query}' for '{query}'")
+        return documents
+
+    def stats(self) -> dict:
+        """Return document, lookup and avoided-fetch counts."""
+        with self._lock:
+            return {
+                "documents": len(self._documents),
+                "queries": sum(len(entries) for entries in self._queries.values()),
+                "lookups": self.lookups,
+                "fetches_avoided": self.fetches_avoided
+            }
+
+
+class DocumentStores:
+    """One DocumentStore per run id, held until the run releases it.
+
+    A store is only dropped by release(), from finalize_report or when the
+    run fails, so a run never loses its documents while it is still going.
+    Holding more than max_runs stores means runs are not being released,
+    which is logged.
+    """
+
+    def __init__(self, max_runs: int = DOCUMENT_STORE_MAX_RUNS):
+        self.max_runs = max_runs
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def get(self, run_id: str) -> DocumentStore:
+        """Return the store of a run, creating it on first use."""
+        with self._lock:
+            store = self._stores.get(run_id)
+            if store is None:
+                store = self._stores[run_id] = DocumentStore()
+                if len(self._stores) > self.max_runs:
+                    logger.warning(f"{len(self._stores)} document stores held, runs are not being released")
+            return store
+
+    def release(self, run_id: str):
+        """Drop the store of a finished run and return its stats, if it had one."""
+        with self._lock:
+            store = self._stores.pop(run_id, None)
+        return store.stats() if store else None
+
+
+document_stores = DocumentStores()
+
+
+def run_id(config) -> str:
+    """Run id of a node invocation: the thread id its graph runs on."""
+    return ((config or {}).get("configurable") or {}).get("thread_id", "")
@@ -0,0 +1,52 @@
+"""Lightweight text helpers shared by the retrieval components."""
+import hashlib
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Common words that carry no relevance signal
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "how", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "was", "what", "why", "with", "you", "your"
+}
+
+
+def tokenize(text: str) -> list:
+    """Lowercase word tokens without stopwords."""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of whitespace-normalized text."""
+    normalized = " ".join(text.split()).lower()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def score_texts(query: str, texts: list) -> list:
+    """Score texts against a query with TF-IDF weighted term overlap."""
+    query_terms = set(tokenize(query))
+    if not query_terms or not texts:
+        return [0.0] * len(texts)
+
+    term_counts = [Counter(tokenize(text)) for text in texts]
+    document_frequency = Counter()
+    for counts in term_counts:
+        document_frequency.update(query_terms.intersection(counts))
+
+    scores = []
+    for counts in term_counts:
+        length = sum(counts.values()) or 1
+        score = 0.0
+        for term in query_terms:
+            if counts[term]:
+                idf = math.log(1 + len(texts) / document_frequency[term])
+                score += idf * (1 + math.log(counts[term]))
+        scores.append(score / math.sqrt(length))
+    return scores
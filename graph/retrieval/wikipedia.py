@@ -0,0 +1,143 @@
+"""Pooled MediaWiki API client returning Wikipedia pages in WikipediaLoader's shape."""
+import asyncio
+import re
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import httpx
+from config import (
+    WIKIPEDIA_API_URL,
+    WIKIPEDIA_MAX_CONNECTIONS,
+    WIKIPEDIA_HTTP_TIMEOUT_SECONDS,
+    WIKIPEDIA_USER_AGENT
+)
+
+# "== History ==" style headings of plain-text extracts, as the chunker expects them
+FIRST_HEADING = re.compile(r"^==[^=].*==\s*$", re.MULTILINE)
+
+
+def lead_section(text: str) -> str:
+    """The text of a page before its first section heading."""
+    match = FIRST_HEADING.search(text)
+    return (text[:match.start()] if match else text).strip()
+
+
+def _search_params(query: str, max_docs: int, lead_only: bool) -> dict:
+    """One request resolving the search hits with their URLs, and their lead extracts if lead_only."""
+    params = {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "redirects": "1",
+        "generator": "search",
+        "gsrsearch": query,
+        "gsrlimit": str(max_docs),
+        "prop": "info",
+        "inprop": "url"
+    }
+    if lead_only:
+        params.update({"prop": "info|extracts", "exintro": "1", "explaintext": "1", "exlimit": "max"})
+    return params
+
+
+def _extract_params(title: str) -> dict:
+    """Whole-page plain-text extracts come one page per request."""
+    return {
+        "action": "query",
+        "format": "json",
+        "formatversion": "2",
+        "redirects": "1",
+        "titles": title,
+        "prop": "extracts",
+        "explaintext": "1",
+        "exsectionformat": "wiki"
+    }
+
+
+def _hits(response: dict) -> list:
+    """Search hits of a generator=search response, best first."""
+    pages = (response.get("query") or {}).get("pages") or []
+    return sorted((page for page in pages if not page.get("missing")), key=lambda page: page.get("index", 0))
+
+
+def _extract(response: dict) -> str:
+    pages = (response.get("query") or {}).get("pages") or [{}]
+    return pages[0].get("extract") or ""
+
+
+def _page(hit: dict, text: str) -> dict:
+    """A page in the cached WikipediaLoader shape."""
+    return {
+        "page_content": text,
+        "metadata": {"title": hit["title"], "summary": lead_section(text), "source": hit.get("fullurl", "")}
+    }
+
+
+class WikipediaClient:
+    """MediaWiki API client on keep-alive connection pools.
+
+    A load is one search request, plus one concurrent extract request per
+    page unless only lead sections are wanted, which the search request
+    already returns. Async clients are bound to their event loop, so there
+    is one pool per loop.
+    """
+
+    def __init__(self, api_url: str = WIKIPEDIA_API_URL, transport=None, async_transport=None):
+        self.api_url = api_url
+        self.async_transport = async_transport
+        self.client = httpx.Client(transport=transport, **self._client_options())
+        # Threads fetching the pages of synchronous loads concurrently
+        self.executor = ThreadPoolExecutor(max_workers=WIKIPEDIA_MAX_CONNECTIONS, thread_name_prefix="wikipedia")
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _client_options() -> dict:
+        return {
+            "headers": {"User-Agent": WIKIPEDIA_USER_AGENT},
+            "timeout": WIKIPEDIA_HTTP_TIMEOUT_SECONDS,
+            "limits": httpx.Limits(
+                max_connections=WIKIPEDIA_MAX_CONNECTIONS,
+                max_keepalive_connections=WIKIPEDIA_MAX_CONNECTIONS
+            )
+        }
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """Return the connection pool of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(transport=self.async_transport, **self._client_options())
+            self._async_clients[loop] = client
+        return client
+
+    def _get(self, params: dict) -> dict:
+        response = self.client.get(self.api_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _aget(self, params: dict) -> dict:
+        response = await self._async_client().get(self.api_url, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def load(self, query: str, max_docs: int, lead_only: bool = False) -> list:
+        """Return up to max_docs pages for the query, or only their lead sections."""
+        hits = _hits(self._get(_search_params(query, max_docs, lead_only)))
+        if lead_only:
+            return [_page(hit, hit.get("extract") or "") for hit in hits]
+        responses = list(self.executor.map(lambda hit: self._get(_extract_params(hit["title"])), hits))
+        return [_page(hit, _extract(response)) for hit, response in zip(hits, responses)]
+
+    async def aload(self, query: str, max_docs: int, lead_only: bool = False) -> list:
+        """Asynchronously return up to max_docs pages for the query, or only their lead sections."""
+        hits = _hits(await self._aget(_search_params(query, max_docs, lead_only)))
+        if lead_only:
+            return [_page(hit, hit.get("extract") or "") for hit in hits]
+        responses = await asyncio.gather(*(self._aget(_extract_params(hit["title"])) for hit in hits))
+        return [_page(hit, _extract(response)) for hit, response in zip(hits, responses)]
+
+
+@lru_cache(maxsize=None)
+def get_wikipedia_client() -> WikipediaClient:
+    """Return the process-wide Wikipedia client, built on first use."""
+    return WikipediaClient()
@@ -0,0 +1,130 @@
+"""Helpers to drive the research graph for a single topic."""
+from contextlib import contextmanager
+from graph.deadline import collect_late_interviews, interview_trackers
+from graph.retrieval.store import document_stores
+from graph.logging_config import logger
+
+
+def _thread_in_use(thread) -> str:
+    """Error of a new run started on a thread that already has checkpoints."""
+    thread_id = thread['configurable']['thread_id']
+    return f"Thread {thread_id} already has checkpoints; continue it with --resume {thread_id} or pick another thread id"
+
+
+@contextmanager
+def _released_on_failure(thread):
+    """Drop the run-scoped state of a run that fails before finalize_report releases it."""
+    try:
+        yield
+    except BaseException:
+        document_stores.release(thread['configurable']['thread_id'])
+        # Interviews still running past the deadline stop instead of spending quota for nothing
+        collect_late_interviews(interview_trackers.release(thread['configurable']['thread_id']))
+        raise
+
+
+def run_research(research_graph, topic, max_analysts, thread, on_event=None):
+    """Run the research graph synchronously and return the final report."""
+    if research_graph.get_state(thread).values:
+        raise ValueError(_thread_in_use(thread))
+
+    # Run until first interruption (at human_feedback node)
+    for event in research_graph.stream(
+        {"topic": topic, "max_analysts": max_analysts},
+        thread,
+        stream_mode="values"
+    ):
+        if on_event:
+            on_event("values", event)
+
+    # Continue without feedback (in production, you'd handle this interactively)
+    research_graph.update_state(
+        thread,
+        {"human_analyst_feedback": None},
+        as_node="human_feedback"
+    )
+
+    logger.info(f"Continuing research for thread {thread['configurable']['thread_id']}")
+    with _released_on_failure(thread):
+        for event in research_graph.stream(None, thread, stream_mode="updates"):
+            if on_event:
+                on_event("updates", event)
+
+    # Get final report
+    final_state = research_graph.get_state(thread)
+    return final_state.values.get('final_report')
+
+
+async def arun_research(research_graph, topic, max_analysts, thread, on_event=None):
+    """Run the research graph on the asyncio path and return the final report."""
+    if (await research_graph.aget_state(thread)).values:
+        raise ValueError(_thread_in_use(thread))
+
+    async for event in research_graph.astream(
+        {"topic": topic, "max_analysts": max_analysts},
+        thread,
+        stream_mode="values"
+    ):
+        if on_event:
+            on_event("values", event)
+
+    await research_graph.aupdate_state(
+        thread,
+        {"human_analyst_feedback": None},
+        as_node="human_feedback"
+    )
+
+    logger.info(f"Continuing research for thread {thread['configurable']['thread_id']}")
+    with _released_on_failure(thread):
+        async for event in research_graph.astream(None, thread, stream_mode="updates"):
+            if on_event:
+                on_event("updates", event)
+
+    final_state = await research_graph.aget_state(thread)
+    return final_state.values.get('final_report')
+
+
+def resume_research(research_graph, thread, on_event=None):
+    """Continue an interrupted run from its last checkpoint and return the final report."""
+    state = research_graph.get_state(thread)
+    if not state.values:
+        raise ValueError(f"No checkpoint found for thread {thread['configurable']['thread_id']}")
+
+    if state.next:
+        logger.info(f"Resuming thread {thread['configurable']['thread_id']} at {state.next}")
+        if "human_feedback" in state.next:
+            research_graph.update_state(
+                thread,
+                {"human_analyst_feedback": None},
+                as_node="human_feedback"
+            )
+        with _released_on_failure(thread):
+            for event in research_graph.stream(None, thread, stream_mode="updates"):
+                if on_event:
+                    on_event("updates", event)
+
+    final_state = research_graph.get_state(thread)
+    return final_state.values.get('final_report')
+
+
+async def aresume_research(research_graph, thread, on_event=None):
+    """Continue an interrupted run on the asyncio path and return the final report."""
+    state = await research_graph.aget_state(thread)
+    if not state.values:
+        raise ValueError(f"No checkpoint found for thread {thread['configurable']['thread_id']}")
+
+    if state.next:
+        logger.info(f"Resuming thread {thread['configurable']['thread_id']} at {state.next}")
+        if "human_feedback" in state.next:
+            await research_graph.aupdate_state(
+                thread,
+                {"human_analyst_feedback": None},
+                as_node="human_feedback"
+            )
+        with _released_on_failure(thread):
+            async for event in research_graph.astream(None, thread, stream_mode="updates"):
+                if on_event:
+                    on_event("updates", event)
+
+    final_state = await research_graph.aget_state(thread)
+    return final_state.values.get('final_report')
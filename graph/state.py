@@ -16,11 +16,18 @@ class GenerateAnalystsState(TypedDict):
 
 class InterviewState(MessagesState):
     """State for the interview sub-graph."""
+    interview_topic: str                    # Research topic, part of the interview memo key
     max_num_turns: int                      # Number turns of conversation
-    context: Annotated[list, operator.add]  # Source docs
+    search_queries: dict                    # Planned query per retrieval backend
+    context: Annotated[list, operator.add]  # Source Documents, rendered only when a prompt is built
+    ranked_context: list                    # Indices of the reranked passages of context for the latest question
+    seen_context: int                       # Context Documents already reranked
+    novelty: dict                           # Novelty of the latest retrieval turn
     analyst: Analyst                        # Analyst asking questions
     interview: str                          # Interview transcript
     sections: list                          # Final key we duplicate in outer state for Send() API
+    deadline: float                         # Wall time after which the report may proceed without this interview
+    quorum: int                             # Interviews that must finish before the report proceeds
 
 
 class ResearchGraphState(TypedDict):
@@ -30,6 +37,8 @@ class ResearchGraphState(TypedDict):
     human_analyst_feedback: str                     # Human feedback
     analysts: List[Analyst]                         # Analyst asking questions
     sections: Annotated[list, operator.add]         # Send() API key
+    late_interviews: Annotated[list, operator.add]  # Analysts whose interviews missed the deadline
+    digest: str                                     # Joined sections, reduced to a bounded size, for the writers
     introduction: str                               # Introduction for the final report
     content: str                                    # Content for the final report
     conclusion: str                                 # Conclusion for the final report
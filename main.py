@@ -1,64 +1,244 @@
 """Main entry point for the research agent."""
-from graph.graph import build_research_graph
+import argparse
+import asyncio
+import os
+import uuid
+from graph.graph import get_graph, draw_graphs
+from graph.runner import run_research, arun_research, resume_research, aresume_research
+from graph.batch import load_topics, run_batch, arun_batch
+from graph.checkpointing import CheckpointRetention, get_checkpointer, aopen_checkpointer
+from graph.chains.llm import llm
+from graph.retrieval.search import search_cache
+from graph import ratelimit
+from graph.metrics import metrics
 from graph.logging_config import logger
+from config import (
+    MAX_CONCURRENCY,
+    BATCH_MAX_IN_FLIGHT,
+    BATCH_OUTPUT_DIR,
+    CHECKPOINT_BACKEND,
+    METRICS_DIR,
+    LOCAL_INDEX_DIR,
+    LOCAL_CHUNK_TOKENS,
+    BM25_K1,
+    BM25_B
+)
 
 
-def main():
-    """Run the research agent."""
-    # Build the complete research graph
-    research_graph = build_research_graph()
-    
-    # Configuration
-    max_analysts = 3
-    topic = "Why people love so much cats in the Internet?"
-    thread = {"configurable": {"thread_id": "1"}}
-    
-    # Start research
-    logger.info(f"Starting research on: {topic}")
-    logger.info(f"Max analysts: {max_analysts}")
-    print(f"\nStarting research on: {topic}")
-    print(f"Max analysts: {max_analysts}")
-    print("-" * 80)
-    
-    # Run until first interruption (at human_feedback node)
-    for event in research_graph.stream(
-        {"topic": topic, "max_analysts": max_analysts}, 
-        thread, 
-        stream_mode="values"
-    ):
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the research agent.")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Bypass the LLM cache and re-run every prompt (results are still cached)."
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run the graph on the native asyncio path (astream)."
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Research every topic in a JSONL or CSV file instead of the default topic."
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=BATCH_OUTPUT_DIR,
+        help="Directory for batch reports and summary.json."
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=BATCH_MAX_IN_FLIGHT,
+        help="Maximum number of batch topics researched at the same time."
+    )
+    parser.add_argument(
+        "--max-analysts",
+        type=int,
+        default=3,
+        help="Number of analysts per topic."
+    )
+    parser.add_argument(
+        "--thread-id",
+        help="Thread id of a new run, used to resume it later (default: a fresh random id)."
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="THREAD_ID",
+        help="Continue an interrupted run from its SQLite checkpoints."
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        default=METRICS_DIR,
+        help="Directory for the per-run metrics summary (JSON) and Prometheus export."
+    )
+    parser.add_argument(
+        "--draw-graphs",
+        metavar="DIR",
+        nargs="?",
+        const=".",
+        help="Render the graph visualizations into DIR (default: current directory) and exit."
+    )
+    parser.add_argument(
+        "--build-index",
+        metavar="CORPUS_DIR",
+        help="Build the local BM25 index from the text and markdown files in CORPUS_DIR and exit."
+    )
+    return parser.parse_args()
+
+
+def print_event(mode, event):
+    """Print streamed progress for an interactive run."""
+    if mode == "values":
         analysts = event.get('analysts', '')
         if analysts:
             print(f"\nAnalysts created: {len(analysts)}")
             for analyst in analysts:
                 print(f"  - {analyst.name}: {analyst.role}")
-    
-    # Continue without feedback (in production, you'd handle this interactively)
-    research_graph.update_state(
-        thread, 
-        {"human_analyst_feedback": None}, 
-        as_node="human_feedback"
-    )
-    
-    print("\nContinuing research...")
-    for event in research_graph.stream(None, thread, stream_mode="updates"):
+    else:
         node_name = next(iter(event.keys()))
         print(f"Executing: {node_name}")
-    
-    # Get final report
-    final_state = research_graph.get_state(thread)
-    final_report = final_state.values.get('final_report')
-    
+
+
+def print_batch_summary(summary, output_dir):
+    """Print the outcome of a batch run."""
+    print(f"\nTopics: {summary['topics']}, succeeded: {summary['succeeded']}, failed: {summary['failed']}")
+    print(f"Wall time: {summary['wall_time_seconds']}s (p50 per topic: {summary['topic_time_p50_seconds']}s)")
+    for result in summary["results"]:
+        if result["status"] != "ok":
+            print(f"  FAILED {result['id']}: {result['error']}")
+    print(f"Summary saved to: {os.path.join(output_dir, 'summary.json')}")
+
+
+def print_report(final_report):
+    """Print and save the final report."""
+    print("\n" + "=" * 80)
+    print("FINAL REPORT")
+    print("=" * 80)
+    print(final_report)
+
+    # Save report to file
+    with open("research_report.md", "w", encoding="utf-8") as f:
+        f.write(final_report)
+    print("\nReport saved to: research_report.md")
+    logger.info("Research completed successfully")
+
+
+def run(args, research_graph, retention):
+    """Run the selected mode synchronously and return the final report, if any."""
+    thread_id = args.resume or args.thread_id
+    thread = {"configurable": {"thread_id": thread_id}, "max_concurrency": MAX_CONCURRENCY}
+
+    if args.batch:
+        jobs = load_topics(args.batch, args.max_analysts)
+        logger.info(f"Starting batch of {len(jobs)} topics, {args.max_in_flight} in flight")
+        summary = run_batch(research_graph, jobs, args.output_dir, args.max_in_flight, retention)
+        print_batch_summary(summary, args.output_dir)
+        return None
+
+    if args.resume:
+        print(f"\nResuming research thread: {thread_id}")
+        final_report = resume_research(research_graph, thread, print_event)
+    else:
+        final_report = run_research(research_graph, args.topic, args.max_analysts, thread, print_event)
+
+    if final_report and retention:
+        retention.mark_finished(thread_id)
+    return final_report
+
+
+async def arun(args, backend, retention):
+    """Run the selected mode on the asyncio path and return the final report, if any."""
+    # Async checkpointers bind to the running loop, so the graph is built here
+    async with aopen_checkpointer(backend) as checkpointer:
+        research_graph = get_graph("research", checkpointer, use_async=True)
+        return await arun_graph(args, research_graph, retention)
+
+
+async def arun_graph(args, research_graph, retention):
+    """Run the selected mode on an async research graph."""
+    thread_id = args.resume or args.thread_id
+    thread = {"configurable": {"thread_id": thread_id}, "max_concurrency": MAX_CONCURRENCY}
+
+    if args.batch:
+        jobs = load_topics(args.batch, args.max_analysts)
+        logger.info(f"Starting batch of {len(jobs)} topics, {args.max_in_flight} in flight")
+        summary = await arun_batch(research_graph, jobs, args.output_dir, args.max_in_flight, retention)
+        print_batch_summary(summary, args.output_dir)
+        return None
+
+    if args.resume:
+        print(f"\nResuming research thread: {thread_id}")
+        final_report = await aresume_research(research_graph, thread, print_event)
+    else:
+        final_report = await arun_research(research_graph, args.topic, args.max_analysts, thread, print_event)
+
+    if final_report and retention:
+        retention.mark_finished(thread_id)
+    return final_report
+
+
+def main():
+    """Run the research agent."""
+    args = parse_args()
+    if args.draw_graphs:
+        for path in draw_graphs(args.draw_graphs):
+            print(f"Saved: {path}")
+        return
+    if args.build_index:
+        from graph.retrieval.bm25 import build_index
+        stats = build_index(args.build_index, LOCAL_INDEX_DIR, LOCAL_CHUNK_TOKENS, BM25_K1, BM25_B)
+        print(f"Indexed {stats['passages']} passages from {stats['files']} files into {LOCAL_INDEX_DIR}")
+        return
+
+    if args.fresh:
+        llm.bypass = True
+
+    # Resuming needs the persistent checkpoints of the interrupted run
+    backend = "sqlite" if args.resume else CHECKPOINT_BACKEND
+    retention = CheckpointRetention() if backend == "sqlite" else None
+    if retention:
+        retention.prune()
+
+    # Configuration
+    args.topic = "Why people love so much cats in the Internet?"
+    if not args.batch and not args.resume:
+        # A new run never continues the checkpoints of an earlier one
+        args.thread_id = args.thread_id or uuid.uuid4().hex[:12]
+        # Start research
+        logger.info(f"Starting research on: {args.topic}")
+        logger.info(f"Max analysts: {args.max_analysts}")
+        print(f"\nStarting research on: {args.topic}")
+        print(f"Max analysts: {args.max_analysts}")
+        print(f"Thread id: {args.thread_id} (continue it with --resume {args.thread_id})")
+        print("-" * 80)
+
+    metrics.reset()
+    if args.use_async:
+        final_report = asyncio.run(arun(args, backend, retention))
+    else:
+        # Build the complete research graph
+        research_graph = get_graph("research", get_checkpointer(backend))
+        final_report = run(args, research_graph, retention)
+
     if final_report:
-        print("\n" + "=" * 80)
-        print("FINAL REPORT")
-        print("=" * 80)
-        print(final_report)
-        
-        # Save report to file
-        with open("research_report.md", "w", encoding="utf-8") as f:
-            f.write(final_report)
-        print("\nReport saved to: research_report.md")
-        logger.info("Research completed successfully")
+        print_report(final_report)
+
+    run_id = "batch" if args.batch else (args.resume or args.thread_id)
+    json_path, prometheus_path = metrics.write(args.metrics_dir, run_id)
+    print(f"Metrics saved to: {json_path}, {prometheus_path}")
+    for node, node_stats in list(metrics.summary()["nodes"].items())[:3]:
+        logger.info(f"Slowest node {node}: {node_stats['total_seconds']}s over {node_stats['runs']} runs")
+
+    cache_stats = llm.stats()
+    logger.info(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    logger.info(f"Search cache: {search_cache.stats()}")
+    for name, bucket_stats in ratelimit.stats()["buckets"].items():
+        logger.info(f"Rate limit {name}: {bucket_stats}")
+    logger.info(f"Retries: {ratelimit.stats()['retries']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+"""Shared test fixtures."""
+import pytest
+from graph.cache import DiskCache
+from graph.interview_memo import InterviewMemo
+
+
+@pytest.fixture(autouse=True)
+def interview_memo(tmp_path, monkeypatch):
+    """Give every test an empty interview memo so graph runs never reuse another test's interviews."""
+    memo = InterviewMemo(DiskCache(str(tmp_path / "interview_memo.sqlite"), 1 << 20, 3600))
+    monkeypatch.setattr("graph.nodes.interview_nodes.interview_memo", memo)
+    return memo
@@ -0,0 +1,96 @@
+"""Unit tests for the batch runner."""
+import json
+from unittest.mock import patch
+from langgraph.checkpoint.memory import MemorySaver
+from graph.batch import load_topics, run_batch
+
+
+def test_load_topics_jsonl(tmp_path):
+    """Test loading jobs from a JSONL file."""
+    path = tmp_path / "topics.jsonl"
+    path.write_text('{"topic": "Cats online"}\n\n{"topic": "Dogs", "max_analysts": 2, "id": "dogs"}\n')
+    jobs = load_topics(str(path), default_max_analysts=3)
+    assert jobs == [
+        {"id": "00000-cats-online", "topic": "Cats online", "max_analysts": 3},
+        {"id": "dogs", "topic": "Dogs", "max_analysts": 2}
+    ]
+
+
+def test_load_topics_csv(tmp_path):
+    """Test loading jobs from a CSV file."""
+    path = tmp_path / "topics.csv"
+    path.write_text("topic,max_analysts\nCats online,\nDogs,1\n")
+    jobs = load_topics(str(path), default_max_analysts=3)
+    assert [job["max_analysts"] for job in jobs] == [3, 1]
+
+
+@patch('graph.batch.run_research')
+def test_invalid_records_fail_alone(mock_run_research, tmp_path):
+    """Test that bad records, unsafe ids and duplicates fail per record while the rest of the batch runs."""
+    path = tmp_path / "topics.jsonl"
+    path.write_text("\n".join([
+        '{"topic": "Cats", "id": "../../etc/cats"}',
+        '{"id": "no-topic"}',
+        'not json',
+        '{"topic": "Dogs", "id": "ETC cats"}',
+        '{"topic": "Birds", "max_analysts": "many"}'
+    ]))
+    jobs = load_topics(str(path), default_max_analysts=3)
+    assert [job["id"] for job in jobs] == ["etc-cats", "no-topic", "00002", "etc-cats", "00004-birds"]
+    assert [job.get("error") for job in jobs] == [
+        None, "record has no topic", jobs[2]["error"], "duplicate id etc-cats", "invalid max_analysts: many"
+    ]
+    assert jobs[2]["error"].startswith("invalid JSON")
+    
+    mock_run_research.return_value = "# Report"
+    summary = run_batch(None, jobs, str(tmp_path / "reports"), max_in_flight=2)
+    
+    assert (summary["succeeded"], summary["failed"]) == (1, 4)
+    assert mock_run_research.call_count == 1
+    assert sorted(p.name for p in (tmp_path / "reports").iterdir()) == ["etc-cats.md", "summary.json"]
+
+
+@patch('graph.batch.run_research')
+def test_run_batch_reports_failures(mock_run_research, tmp_path):
+    """Test that reports are written per topic and failures are summarized."""
+    def fake_run(graph, topic, max_analysts, thread):
+        if topic == "bad":
+            raise RuntimeError("boom")
+        return f"# Report on {topic}"
+    mock_run_research.side_effect = fake_run
+    
+    jobs = [
+        {"id": "good", "topic": "good", "max_analysts": 1},
+        {"id": "bad", "topic": "bad", "max_analysts": 1}
+    ]
+    summary = run_batch(None, jobs, str(tmp_path), max_in_flight=2)
+    
+    assert summary["succeeded"] == 1
+    assert summary["failed"] == 1
+    assert (tmp_path / "good.md").read_text() == "# Report on good"
+    assert json.loads((tmp_path / "summary.json").read_text())["failed"] == 1
+    threads = sorted(call.args[3]["configurable"]["thread_id"] for call in mock_run_research.call_args_list)
+    assert [thread.rsplit("-", 1)[0] for thread in threads] == ["batch-bad", "batch-good"]
+    
+    # A rerun of the same topics gets fresh threads instead of continuing the first run's checkpoints
+    run_batch(None, jobs, str(tmp_path), max_in_flight=2)
+    rerun = {call.args[3]["configurable"]["thread_id"] for call in mock_run_research.call_args_list[2:]}
+    assert rerun.isdisjoint(threads)
+
+
+@patch('graph.batch.run_research')
+def test_run_batch_drops_in_memory_checkpoints_of_finished_topics(mock_run_research, tmp_path):
+    """Test that a batch on the memory backend does not keep every topic's checkpoints."""
+    class Graph:
+        checkpointer = MemorySaver()
+    
+    def fake_run(graph, topic, max_analysts, thread):
+        graph.checkpointer.storage[thread["configurable"]["thread_id"]]["ns"]["id"] = "checkpoint"
+        return f"# Report on {topic}"
+    mock_run_research.side_effect = fake_run
+    
+    jobs = [{"id": str(index), "topic": f"Topic {index}", "max_analysts": 1} for index in range(3)]
+    summary = run_batch(Graph(), jobs, str(tmp_path), max_in_flight=2)
+    
+    assert summary["succeeded"] == 3
+    assert dict(Graph.checkpointer.storage) == {}
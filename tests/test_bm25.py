@@ -0,0 +1,107 @@
+"""Unit tests for the local BM25 index and retrieval node."""
+import numpy as np
+import pytest
+from unittest.mock import patch
+from graph.retrieval.bm25 import BM25Index, build_index
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    """Build an index over a small corpus of text and markdown files."""
+    corpus = tmp_path / "corpus"
+    (corpus / "notes").mkdir(parents=True)
+    (corpus / "cats.md").write_text(
+        "Cats are popular pets.\n\n"
+        "# Internet\n"
+        "Lolcats and cat videos spread memes across social networks.\n\n"
+        "# History\n"
+        "Cats were domesticated in the Near East.\n",
+        encoding="utf-8"
+    )
+    (corpus / "notes" / "dogs.txt").write_text("Dogs are loyal companions and enjoy long walks.", encoding="utf-8")
+    (corpus / "notes" / "image.png").write_bytes(b"\x89PNG")
+    index_dir = tmp_path / "index"
+    build_index(str(corpus), str(index_dir), chunk_tokens=20)
+    return str(index_dir)
+
+
+def test_build_index_stats(index_dir):
+    """Test that only text and markdown files are indexed."""
+    index = BM25Index(index_dir)
+    assert index.sources == ["cats.md", "notes/dogs.txt"]
+    assert len(index) == 4
+
+
+def test_search_ranks_relevant_passage_first(index_dir):
+    """Test that the passage matching the query terms ranks first and keeps its section."""
+    index = BM25Index(index_dir)
+    results = index.search("cat memes videos", top_k=2)
+    best = index.passage(results[0][0])
+    assert "Lolcats" in best["text"]
+    assert best["source"] == "cats.md"
+    assert best["section"] == "Internet"
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def test_search_matches_reference_bm25(tmp_path):
+    """Test sparse and dense scoring against a direct BM25 computation."""
+    import math
+    from graph.retrieval.text import tokenize
+    
+    words = "alpha beta gamma delta epsilon zeta eta theta".split()
+    passages = [
+        " ".join(["common"] + words[i % 8:i % 8 + 1 + i % 3] * (1 + i % 2) + ["omega"] * (i % 23 == 0))
+        for i in range(200)
+    ]
+    (tmp_path / "corpus").mkdir()
+    (tmp_path / "corpus" / "doc.txt").write_text("\n\n".join(passages), encoding="utf-8")
+    build_index(str(tmp_path / "corpus"), str(tmp_path / "index"), chunk_tokens=1)
+    index = BM25Index(str(tmp_path / "index"))
+    assert len(index) == len(passages)
+    
+    tokens = [tokenize(passage) for passage in passages]
+    average = sum(map(len, tokens)) / len(tokens)
+    
+    def reference(query):
+        scores = []
+        for passage in tokens:
+            score = 0.0
+            for term in set(tokenize(query)):
+                df = sum(term in other for other in tokens)
+                tf = passage.count(term)
+                idf = math.log(1 + (len(tokens) - df + 0.5) / (df + 0.5))
+                score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * len(passage) / average))
+            scores.append(score)
+        return scores
+    
+    # "omega" is rare (sparse postings), "common" is in every passage (dense row)
+    assert index.dense_rows[index.vocabulary["omega"]] < 0 <= index.dense_rows[index.vocabulary["common"]]
+    for query in ("omega", "omega common", "omega gamma", "gamma delta"):
+        expected = reference(query)
+        for passage_id, score in index.search(query, top_k=5):
+            assert score == pytest.approx(expected[passage_id], rel=1e-4)
+        assert index.search(query, top_k=1)[0][1] == pytest.approx(max(expected), rel=1e-4)
+
+
+def test_index_is_memory_mapped(index_dir):
+    """Test that postings are memory-mapped instead of read into memory."""
+    index = BM25Index(index_dir)
+    assert isinstance(index.postings_weights, np.memmap)
+    assert isinstance(index.postings_passages, np.memmap)
+
+
+def test_search_unknown_terms(index_dir):
+    """Test that a query without indexed terms returns nothing."""
+    assert BM25Index(index_dir).search("quantum chromodynamics", top_k=3) == []
+
+
+def test_search_local_node_formats_documents(index_dir):
+    """Test that the local retrieval node emits one Document per distinct passage."""
+    from graph.nodes.interview_nodes import search_local
+    
+    with patch("graph.retrieval.search.get_local_index", return_value=BM25Index(index_dir)):
+        result = search_local({"search_queries": {"local": ["dogs walks", "loyal dogs"]}})
+    
+    [document] = result["context"]
+    assert document.render().startswith('<Document source="notes/dogs.txt"/>')
+    assert "loyal companions" in document.text
@@ -0,0 +1,110 @@
+"""Unit tests for the LLM cache."""
+import asyncio
+import time
+import pytest
+from unittest.mock import Mock
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import SystemMessage, HumanMessage
+from graph.cache import DiskCache
+from graph.chains.llm import CachedChatModel, cache_key
+from graph.models import SearchQuery
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    """Create an empty on-disk cache."""
+    return DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=1024, max_age_seconds=60)
+
+
+def test_disk_cache_roundtrip(disk_cache):
+    """Test storing and retrieving a value."""
+    assert disk_cache.get("missing") is None
+    disk_cache.set("key", "value")
+    assert disk_cache.get("key") == "value"
+    assert disk_cache.stats()["hits"] == 1
+    assert disk_cache.stats()["misses"] == 1
+
+
+def test_disk_cache_age_eviction(disk_cache):
+    """Test that expired entries are not returned."""
+    disk_cache.set("key", "value")
+    disk_cache.max_age_seconds = 0
+    time.sleep(0.01)
+    assert disk_cache.get("key") is None
+    disk_cache.evict()
+    assert len(disk_cache) == 0
+
+
+def test_disk_cache_size_eviction(disk_cache):
+    """Test that least recently used entries are evicted over max_bytes."""
+    disk_cache.set("old", "x" * 600)
+    disk_cache.set("new", "y" * 600)
+    disk_cache.evict()
+    assert disk_cache.get("old") is None
+    assert disk_cache.get("new") == "y" * 600
+
+
+def test_cache_key_depends_on_model_messages_and_schema():
+    """Test that the cache key covers model, messages and schema."""
+    messages = [SystemMessage(content="system"), HumanMessage(content="hi")]
+    key = cache_key("model-a", messages)
+    assert key == cache_key("model-a", [SystemMessage(content="system"), HumanMessage(content="hi")])
+    assert key != cache_key("model-b", messages)
+    assert key != cache_key("model-a", messages[:1])
+    assert key != cache_key("model-a", messages, SearchQuery)
+
+
+def test_cached_chat_model_serves_repeated_prompts(disk_cache):
+    """Test that a repeated prompt does not hit the underlying model."""
+    disk_cache.max_bytes = 1024 * 1024
+    model = FakeListChatModel(responses=["first", "second"])
+    cached = CachedChatModel(model, "fake", cache=disk_cache)
+
+    assert cached.invoke([HumanMessage(content="hi")]).content == "first"
+    assert cached.invoke([HumanMessage(content="hi")]).content == "first"
+    assert cached.invoke([HumanMessage(content="other")]).content == "second"
+    assert cached.stats()["hits"] == 1
+
+
+def test_cached_chat_model_bypass(disk_cache):
+    """Test that bypass skips lookups but still refreshes the cache."""
+    disk_cache.max_bytes = 1024 * 1024
+    model = FakeListChatModel(responses=["first", "second"])
+    cached = CachedChatModel(model, "fake", cache=disk_cache, bypass=True)
+
+    assert cached.invoke([HumanMessage(content="hi")]).content == "first"
+    assert cached.invoke([HumanMessage(content="hi")]).content == "second"
+    cached.bypass = False
+    assert cached.invoke([HumanMessage(content="hi")]).content == "second"
+
+
+def test_cached_structured_output(disk_cache):
+    """Test caching of structured output results."""
+    disk_cache.max_bytes = 1024 * 1024
+    structured = Mock()
+    structured.invoke.return_value = SearchQuery(search_query="cats")
+    model = Mock()
+    model.with_structured_output.return_value = structured
+    cached = CachedChatModel(model, "fake", cache=disk_cache)
+
+    first = cached.with_structured_output(SearchQuery).invoke([HumanMessage(content="hi")])
+    second = cached.with_structured_output(SearchQuery).invoke([HumanMessage(content="hi")])
+    assert first == second == SearchQuery(search_query="cats")
+    assert structured.invoke.call_count == 1
+    # The structured runnable is only built on a cache miss
+    assert model.with_structured_output.call_count == 1
+    factory = Mock()
+    cold = CachedChatModel(None, "fake", cache=disk_cache, model_factory=factory)
+    assert cold.with_structured_output(SearchQuery).invoke([HumanMessage(content="hi")]) == first
+    factory.assert_not_called()
+
+
+def test_cached_chat_model_ainvoke(disk_cache):
+    """Test that the async path shares the cache with the sync path."""
+    disk_cache.max_bytes = 1024 * 1024
+    model = FakeListChatModel(responses=["first", "second"])
+    cached = CachedChatModel(model, "fake", cache=disk_cache)
+
+    assert cached.invoke([HumanMessage(content="hi")]).content == "first"
+    assert asyncio.run(cached.ainvoke([HumanMessage(content="hi")])).content == "first"
+    assert asyncio.run(cached.ainvoke([HumanMessage(content="other")])).content == "second"
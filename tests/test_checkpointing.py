@@ -0,0 +1,109 @@
+"""Tests for persistent checkpointing, retention and crash resume."""
+import time
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from graph.checkpointing import CheckpointRetention, get_checkpointer
+from graph.graph import build_research_graph
+from graph.retrieval.store import document_stores
+from graph.models import Analyst, Perspectives, QueryPlan, ReportFraming
+from graph.runner import run_research, resume_research
+
+
+class FlakyLLM:
+    """Fake LLM whose answers fail once for one analyst."""
+
+    def __init__(self):
+        self.calls = []
+        self.failed = False
+
+    def invoke(self, messages, **kwargs):
+        system = messages[0] if isinstance(messages[0], str) else messages[0].content
+        self.calls.append(system)
+        if "Name: Flaky" in system and "answer a question" in system and not self.failed:
+            self.failed = True
+            raise RuntimeError("transient failure")
+        return AIMessage(content="## Insights\nCats [1]")
+
+    def with_structured_output(self, schema, **kwargs):
+        llm = self
+
+        class Structured:
+            def invoke(self, messages, **kwargs):
+                llm.calls.append(schema.__name__)
+                if schema is Perspectives:
+                    return Perspectives(analysts=[
+                        Analyst(affiliation="A", name="Steady", role="r", description="steady focus"),
+                        Analyst(affiliation="B", name="Flaky", role="r", description="flaky focus")
+                    ])
+                if schema is ReportFraming:
+                    return ReportFraming(introduction="# Cats\n## Introduction", conclusion="## Conclusion")
+                return QueryPlan(search_query="cats")
+        return Structured()
+
+
+@pytest.fixture
+def flaky_llm():
+    """Patch every node module with a flaky fake LLM and offline search."""
+    llm = FlakyLLM()
+    with patch('graph.nodes.analyst_nodes.llm', llm), \
+            patch('graph.nodes.interview_nodes.llm', llm), \
+            patch('graph.nodes.report_nodes.llm', llm), \
+            patch('graph.nodes.interview_nodes.web_search', lambda query: [{"url": "https://a", "content": "cats"}]), \
+            patch('graph.nodes.interview_nodes.wikipedia_search', lambda query: []):
+        yield llm
+
+
+def test_resume_does_not_redo_finished_interviews(flaky_llm, tmp_path):
+    """Test that resuming a failed run only reruns the failed interview."""
+    path = str(tmp_path / "checkpoints.sqlite")
+    graph = build_research_graph(checkpointer=get_checkpointer("sqlite", path))
+    thread = {"configurable": {"thread_id": "crash"}}
+    
+    with pytest.raises(RuntimeError):
+        run_research(graph, "cats", 2, thread)
+    # The failed run no longer holds its document store
+    assert document_stores.release("crash") is None
+    steady_answers = sum("Name: Steady" in call and "answer a question" in call for call in flaky_llm.calls)
+    
+    # A new process resumes from the same database
+    resumed_graph = build_research_graph(checkpointer=get_checkpointer("sqlite", path))
+    final_report = resume_research(resumed_graph, thread)
+    
+    assert final_report
+    assert sum("Name: Steady" in call and "answer a question" in call for call in flaky_llm.calls) == steady_answers
+
+
+def test_retention_prunes_old_checkpoints_and_finished_threads(flaky_llm, tmp_path):
+    """Test keep-last-N pruning and dropping of finished threads."""
+    flaky_llm.failed = True
+    path = str(tmp_path / "checkpoints.sqlite")
+    saver = get_checkpointer("sqlite", path)
+    graph = build_research_graph(checkpointer=saver)
+    run_research(graph, "cats", 2, {"configurable": {"thread_id": "done"}})
+    
+    retention = CheckpointRetention(path, keep_last=2, finished_ttl_seconds=3600)
+    assert retention.prune()["checkpoints"] > 0
+    counts = saver.conn.execute(
+        "SELECT MAX(n) FROM (SELECT COUNT(*) AS n FROM checkpoints GROUP BY thread_id, checkpoint_ns)"
+    ).fetchone()[0]
+    assert counts <= 2
+    
+    retention.mark_finished("done")
+    retention.finished_ttl_seconds = 0
+    time.sleep(0.01)
+    assert retention.prune()["threads"] == 1
+    assert saver.conn.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 0
+
+
+def test_new_run_rejects_a_thread_with_checkpoints(flaky_llm, tmp_path):
+    """Test that only resume continues a thread; a new run on it fails instead of mixing state."""
+    flaky_llm.failed = True
+    graph = build_research_graph(checkpointer=get_checkpointer("sqlite", str(tmp_path / "checkpoints.sqlite")))
+    thread = {"configurable": {"thread_id": "taken"}}
+    run_research(graph, "cats", 2, thread)
+    sections = len(graph.get_state(thread).values["sections"])
+    
+    with pytest.raises(ValueError, match="--resume taken"):
+        run_research(graph, "dogs", 2, thread)
+    assert len(graph.get_state(thread).values["sections"]) == sections
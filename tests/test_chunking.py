@@ -0,0 +1,59 @@
+"""Unit tests for chunking and Wikipedia content selection."""
+from graph.retrieval.chunking import chunk_text, rank_chunks, split_sections
+from graph.retrieval.search import select_wikipedia_content
+
+
+PAGE = """Cats are small domesticated carnivores.
+
+== History ==
+Cats were domesticated in the Near East.
+Egyptians revered cats.
+
+== Internet ==
+Cat videos and memes are among the most viewed content online.
+Lolcats popularized captioned cat images.
+Grumpy Cat became an internet celebrity.
+"""
+
+
+def test_split_sections():
+    """Test splitting plain-text Wikipedia pages on section headings."""
+    sections = split_sections(PAGE)
+    assert [title for title, _ in sections] == ["", "History", "Internet"]
+
+
+def test_chunk_text_respects_size_and_overlap():
+    """Test that chunks stay in their section and overlap within it."""
+    chunks = chunk_text(PAGE, chunk_tokens=30, overlap_tokens=12)
+    assert all(chunk.section in ("", "History", "Internet") for chunk in chunks)
+    internet = [chunk.text for chunk in chunks if chunk.section == "Internet"]
+    assert len(internet) > 1
+    # The last paragraph of a chunk is repeated at the start of the next one
+    assert internet[1].split("\n\n")[0] == internet[0].split("\n\n")[-1]
+
+
+def test_rank_chunks_puts_most_relevant_first():
+    """Test that the most relevant chunk is ranked first."""
+    chunks = chunk_text(PAGE, chunk_tokens=20)
+    ranked = rank_chunks(chunks, "internet memes")
+    assert sorted(ranked) == list(range(len(chunks)))
+    assert chunks[ranked[0]].section == "Internet"
+
+
+def test_select_wikipedia_content_modes():
+    """Test full, summary and chunk retrieval modes."""
+    pages = [{"page_content": PAGE, "metadata": {"source": "https://en.wikipedia.org/wiki/Cat", "summary": "Cats summary"}}]
+    
+    assert select_wikipedia_content(pages, "memes", mode="full")[0].page_content == PAGE
+    assert select_wikipedia_content(pages, "memes", mode="summary")[0].page_content == "Cats summary"
+    
+    chunks = select_wikipedia_content(pages, "internet memes", mode="chunks")
+    assert chunks[0].metadata["section"] == "Internet"
+    assert chunks[0].metadata["source"] == "https://en.wikipedia.org/wiki/Cat"
+    assert sum(len(doc.page_content) for doc in chunks) <= len(PAGE) * 2
+
+
+def test_split_sections_markdown_headings():
+    """Test that markdown headings split sections like Wikipedia headings."""
+    sections = split_sections("Intro text.\n\n# Usage\nRun it.\n\n## Tuning\nSet k1.\n#hashtag is not a heading\n")
+    assert [title for title, _ in sections] == ["", "Usage", "Tuning"]
@@ -0,0 +1,123 @@
+"""Tests for the run deadline and quorum of interview branches."""
+import asyncio
+import threading
+import time
+from typing import TypedDict
+from langgraph.graph import StateGraph, START, END
+from graph.deadline import InterviewTrackers, adeadline_interview, deadline_interview, interview_trackers
+from graph.metrics import instrument_node
+from graph.models import Analyst
+from graph.nodes.report_nodes import finalize_report
+
+REPORT = {"introduction": "# Cats", "content": "## Insights\nBody", "conclusion": "## Conclusion"}
+
+
+def _branch(name: str, deadline: float) -> dict:
+    analyst = Analyst(affiliation="Lab", name=name, role="Researcher", description=f"{name} focus")
+    return {"analyst": analyst, "deadline": deadline, "quorum": 1}
+
+
+class SlowInterviews:
+    """Interview sub-graph stand-in whose interviews take a per-analyst time."""
+
+    def __init__(self, seconds: dict):
+        self.seconds = seconds
+
+    def invoke(self, state, config=None):
+        time.sleep(self.seconds[state["analyst"].name])
+        return {"sections": [f"## {state['analyst'].name}"], "messages": ["not shared"]}
+
+    async def ainvoke(self, state, config=None):
+        await asyncio.sleep(self.seconds[state["analyst"].name])
+        return {"sections": [f"## {state['analyst'].name}"], "messages": ["not shared"]}
+
+
+def test_straggler_is_left_out_after_deadline_and_attached_when_done():
+    """Test that the report proceeds at the deadline once a quorum finished, with the straggler as addendum."""
+    config = {"configurable": {"thread_id": "deadline-sync"}}
+    conduct_interview = deadline_interview(SlowInterviews({"Fast": 0.0, "Slow": 0.4}))
+    deadline = time.time() + 0.1
+    results = {}
+    branches = [
+        threading.Thread(target=lambda name=name: results.update({name: conduct_interview(_branch(name, deadline), config)}))
+        for name in ("Fast", "Slow")
+    ]
+    started = time.perf_counter()
+    for branch in branches:
+        branch.start()
+    for branch in branches:
+        branch.join()
+    
+    assert time.perf_counter() - started < 0.35
+    assert results == {"Fast": {"sections": ["## Fast"]}, "Slow": {"late_interviews": ["Slow"]}}
+    
+    time.sleep(0.5)
+    report = finalize_report({**REPORT, "late_interviews": ["Slow"]}, config)["final_report"]
+    assert "## Addendum\n\n## Slow" in report
+    assert "left out" not in report
+
+
+def test_cancelled_late_interview_stops_before_its_next_node():
+    """Test that a threaded interview cancelled by finalize_report runs no further nodes."""
+    class InterviewState(TypedDict, total=False):
+        analyst: Analyst
+        sections: list
+    
+    ran = []
+    
+    def slow_question(state):
+        time.sleep(0.3 if state["analyst"].name == "Slow" else 0.0)
+        return {}
+    
+    def write_section(state):
+        ran.append(state["analyst"].name)
+        return {"sections": [f"## {state['analyst'].name}"]}
+    
+    builder = StateGraph(InterviewState)
+    builder.add_node("ask_question", instrument_node("ask_question", slow_question))
+    builder.add_node("write_section", instrument_node("write_section", write_section))
+    builder.add_edge(START, "ask_question")
+    builder.add_edge("ask_question", "write_section")
+    builder.add_edge("write_section", END)
+    conduct_interview = deadline_interview(builder.compile())
+    config = {"configurable": {"thread_id": "deadline-cancel"}}
+    deadline = time.time() + 0.05
+    
+    assert conduct_interview(_branch("Fast", deadline), config) == {"sections": ["## Fast"]}
+    assert conduct_interview(_branch("Slow", deadline), config) == {"late_interviews": ["Slow"]}
+    report = finalize_report({**REPORT, "late_interviews": ["Slow"]}, config)["final_report"]
+    time.sleep(0.4)
+    
+    assert report.endswith("*Interviews left out after the deadline: Slow*")
+    assert ran == ["Fast"]
+
+
+def test_branches_wait_past_deadline_until_quorum():
+    """Test that a branch past the deadline keeps waiting while fewer than quorum interviews finished."""
+    conduct_interview = adeadline_interview(SlowInterviews({"Only": 0.2}))
+    config = {"configurable": {"thread_id": "deadline-async"}}
+    
+    result = asyncio.run(conduct_interview(_branch("Only", time.time()), config))
+    
+    assert result == {"sections": ["## Only"]}
+    assert interview_trackers.release("deadline-async") == []
+
+
+def test_untracked_late_interviews_are_listed():
+    """Test that late interviews without a tracker, e.g. after a resume elsewhere, are named in the report."""
+    report = finalize_report({**REPORT, "late_interviews": ["Slow"]}, {"configurable": {"thread_id": "untracked"}})
+    assert report["final_report"].endswith("*Interviews left out after the deadline: Slow*")
+
+
+def test_trackers_are_held_until_released(caplog):
+    """Test that a run's tracker is never evicted by later runs, only dropped by its own release."""
+    trackers = InterviewTrackers(max_runs=2)
+    first = trackers.get("run-1")
+    first.add_late("Slow", None, None)
+    trackers.get("run-2")
+    trackers.get("run-3")
+    
+    assert "3 interview trackers held" in caplog.text
+    assert trackers.get("run-1") is first
+    assert trackers.release("run-1") == [("Slow", None, None)]
+    assert trackers.release("run-1") == []
@@ -0,0 +1,74 @@
+"""Unit tests for hashing embeddings and reranking."""
+import numpy as np
+from unittest.mock import patch
+from langchain_core.messages import HumanMessage
+from graph.retrieval.embeddings import HashingEmbedder, rerank
+from graph.retrieval.documents import Document
+
+
+def test_embeddings_are_unit_length_and_deterministic():
+    """Test that rows are normalized and identical texts embed identically."""
+    model = HashingEmbedder(dimensions=256, cache_entries=10)
+    vectors = model.embed(["cats on the internet", "cats  on the Internet", ""])
+    assert vectors.shape == (3, 256)
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert np.allclose(vectors[0], vectors[1])
+    assert not vectors[2].any()
+
+
+def test_embeddings_cached_by_content_hash():
+    """Test that repeated passages are not embedded again."""
+    model = HashingEmbedder(dimensions=256, cache_entries=10)
+    model.embed(["cats love memes", "dogs love walks"])
+    assert (model.hits, model.misses) == (0, 2)
+    model.embed(["Cats love memes", "stock prices"])
+    assert (model.hits, model.misses) == (1, 3)
+
+
+def test_rerank_orders_by_similarity():
+    """Test that the most similar passages are kept, best first."""
+    model = HashingEmbedder(dimensions=1024, cache_entries=10)
+    texts = [
+        "The stock market closed higher today.",
+        "Cat videos and memes spread across the internet.",
+        "Cats are popular on the internet because of memes."
+    ]
+    ranked = rerank("why are cats popular on the internet", texts, top_k=2, model=model)
+    assert [index for index, _ in ranked] == [2, 1]
+    assert ranked[0][1] >= ranked[1][1] > 0
+    assert rerank("cats", [], top_k=2, model=model) == []
+
+
+def test_rerank_context_node_keeps_top_passages():
+    """Test that the node reranks the accumulated context against the latest question."""
+    from graph.nodes.interview_nodes import rerank_context
+    
+    context = [
+        Document("web", "https://a.example", "The stock market closed higher today."),
+        Document("wikipedia", "https://en.wikipedia.org/wiki/Cat", "Cats dominate internet memes.", title="Cat")
+    ]
+    with patch("graph.nodes.interview_nodes.RERANK_TOP_K", 1):
+        result = rerank_context({"messages": [HumanMessage(content="Why do cats dominate memes?")], "context": context})
+    
+    assert result["ranked_context"] == [1]
+
+
+def test_measure_novelty():
+    """Test that repeated and near-duplicate passages do not count as new."""
+    from graph.retrieval.novelty import measure_novelty
+    
+    model = HashingEmbedder(dimensions=1024, cache_entries=10)
+    previous = [Document("web", "https://a", "Cats dominate internet memes and viral videos.")]
+    current = [
+        Document("web", "https://a", "Cats dominate internet memes and viral videos."),
+        Document("web", "https://b", "Cats dominate internet memes and viral videos!"),
+        Document("web", "https://c", "Dogs were domesticated from wolves.")
+    ]
+    novelty = measure_novelty(previous, current, duplicate_similarity=0.9, model=model)
+    
+    assert novelty["passages"] == 3
+    assert novelty["new_sources"] == 0.6667
+    assert novelty["new_passages"] == 0.6667
+    assert novelty["score"] == 0.3333
+    assert measure_novelty([], current, 0.9, model=model)["score"] == 1.0
+    assert measure_novelty(previous, [], 0.9, model=model)["score"] is None
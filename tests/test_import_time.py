@@ -0,0 +1,57 @@
+"""Import-time regression tests for CLI startup and worker spawn."""
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Client SDKs that must only load when the first LLM or search call is made
+LAZY_MODULES = ("langchain_google_genai", "langchain_tavily", "langchain_community", "google.genai")
+
+# Generous ceiling for `import main`; it takes well under a second locally
+IMPORT_BUDGET_SECONDS = 5.0
+
+
+def _import_times(module: str) -> dict:
+    """Import module in a fresh interpreter without API keys and parse -X importtime."""
+    env = {key: value for key, value in os.environ.items() if key not in ("GOOGLE_API_KEY", "TAVILY_API_KEY")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_import_main_skips_client_sdks():
+    """Test that importing main neither needs API keys nor loads client SDKs."""
+    times = _import_times("main")
+    loaded = [name for name in times if name.startswith(LAZY_MODULES)]
+    assert loaded == []
+    assert times["main"] < IMPORT_BUDGET_SECONDS
+
+
+def test_clients_are_built_on_first_use(monkeypatch):
+    """Test that the LLM and Tavily clients validate keys only when first built."""
+    from graph.chains.llm import CachedChatModel
+    from graph.retrieval.search import get_tavily_search
+
+    factory_calls = []
+    model = CachedChatModel(None, "fake", model_factory=lambda: factory_calls.append(1) or "model")
+    assert factory_calls == []
+    assert model.model == "model"
+    assert model.model == "model"
+    assert factory_calls == [1]
+
+    monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+    get_tavily_search.cache_clear()
+    with pytest.raises(ValueError, match="TAVILY_API_KEY"):
+        get_tavily_search()
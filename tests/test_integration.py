@@ -74,3 +74,30 @@ def test_graph_state_persistence():
     state = graph.get_state(thread)
     assert state is not None
 
+
+
+def test_async_research_graph_builds():
+    """Test that the research graph can be built with native async nodes."""
+    graph = build_research_graph(use_async=True)
+    assert graph is not None
+    assert hasattr(graph, 'nodes')
+
+
+def test_graph_factory_reuses_compiled_graphs():
+    """Test that the graph factory caches compiled graphs per checkpointer."""
+    from langgraph.checkpoint.memory import MemorySaver
+    from graph.graph import get_graph
+
+    checkpointer = MemorySaver()
+    graph = get_graph("research", checkpointer)
+    assert get_graph("research", checkpointer) is graph
+    assert get_graph("research", MemorySaver()) is not graph
+    assert get_graph("research", checkpointer, use_async=True) is not graph
+
+
+def test_building_graphs_does_not_render_visualizations(tmp_path, monkeypatch):
+    """Test that graph builders never write visualization files."""
+    monkeypatch.chdir(tmp_path)
+    build_research_graph()
+    build_analyst_generation_graph()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,107 @@
+"""Tests for reusing finished interviews across feedback rounds."""
+import threading
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from graph.cache import DiskCache
+from graph.graph import build_research_graph
+from graph.interview_memo import InterviewMemo, _hash
+from graph.retrieval.documents import Document
+from graph.models import Analyst, Perspectives, QueryPlan, ReportFraming
+from graph.runner import run_research
+
+CONTEXT = [Document("web", "https://a.example", "Cats dominate internet memes.")]
+OUTPUTS = {"interview": "Q&A", "sections": ["## Cats"], "context": CONTEXT, "messages": ["not stored"]}
+
+
+def _analyst(name: str, description: str) -> Analyst:
+    return Analyst(affiliation="Lab", name=name, role="Researcher", description=description)
+
+
+def test_memo_reuses_same_and_similar_personas(tmp_path):
+    """Test exact and near-identical personas hit, and other topics, budgets or personas miss."""
+    memo = InterviewMemo(DiskCache(str(tmp_path / "memo.sqlite"), 1 << 20, 3600), similarity=0.9)
+    ada = _analyst("Ada", "Studies how cat memes spread across social networks and video platforms")
+    memo.put("Cats", 2, ada, OUTPUTS)
+    
+    assert memo.get("Cats", 2, ada) == {"interview": "Q&A", "sections": ["## Cats"], "context": CONTEXT}
+    nearly = _analyst("Ada", "Studies how cat memes spread across social networks and video platforms.")
+    assert memo.get("Cats", 2, nearly)["sections"] == ["## Cats"]
+    assert memo.get("Dogs", 2, ada) is None
+    assert memo.get("Cats", 3, ada) is None
+    assert memo.get("Cats", 2, _analyst("Bob", "Economist measuring advertising revenue of pet influencers")) is None
+    # Another analyst with the same description never gets Ada's transcript
+    assert memo.get("Cats", 2, _analyst("Eve", "Studies how cat memes spread across social networks and video platforms")) is None
+    assert memo.reused == 2
+
+
+def test_memo_index_keeps_concurrently_stored_personas(tmp_path):
+    """Test that interviews stored from parallel branches all end up in the persona index."""
+    memo = InterviewMemo(DiskCache(str(tmp_path / "memo.sqlite"), 1 << 20, 3600))
+    analysts = [_analyst(f"Analyst {i}", f"Persona number {i}") for i in range(20)]
+    threads = [threading.Thread(target=memo.put, args=("Cats", 2, analyst, OUTPUTS)) for analyst in analysts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(memo._index(_hash("index", "Cats", 2))) == 20
+
+
+class CountingLLM:
+    """Fake LLM counting calls, which replaces Bob with Carol when the feedback asks for it."""
+
+    def __init__(self, analysts, replacement):
+        self.analysts = analysts
+        self.replacement = replacement
+        self.calls = 0
+
+    def invoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(content="## Insights\nCats [1]")
+
+    def with_structured_output(self, schema, **kwargs):
+        llm = self
+
+        class Structured:
+            def invoke(self, messages, **kwargs):
+                if schema is Perspectives:
+                    feedback = "Replace Bob" in str(messages)
+                    return Perspectives(analysts=llm.replacement if feedback else llm.analysts)
+                llm.calls += 1
+                if schema is ReportFraming:
+                    return ReportFraming(introduction="# Cats\n## Introduction", conclusion="## Conclusion")
+                return QueryPlan(search_query="cats")
+        return Structured()
+
+
+def test_feedback_round_only_interviews_new_analysts(interview_memo):
+    """Test that rerunning a topic with feedback that replaces one analyst only interviews that analyst."""
+    ada = _analyst("Ada", "Studies cat memes")
+    bob = _analyst("Bob", "Studies cat videos")
+    carol = _analyst("Carol", "Economist of pet influencer advertising")
+    llm = CountingLLM([ada, bob], [ada, carol])
+    
+    with patch("graph.nodes.analyst_nodes.llm", llm), \
+            patch("graph.nodes.interview_nodes.llm", llm), \
+            patch("graph.nodes.report_nodes.llm", llm), \
+            patch("graph.nodes.interview_nodes.web_search", lambda query: []), \
+            patch("graph.nodes.interview_nodes.wikipedia_search", lambda query: []):
+        graph = build_research_graph()
+        first_report = run_research(graph, "Cats", 2, {"configurable": {"thread_id": "first"}})
+        first_calls, llm.calls = llm.calls, 0
+        
+        # The rerun pauses for feedback, which replaces Bob before any interview starts
+        thread = {"configurable": {"thread_id": "feedback"}}
+        list(graph.stream({"topic": "Cats", "max_analysts": 2}, thread))
+        graph.update_state(thread, {"human_analyst_feedback": "Replace Bob with an economist"}, as_node="human_feedback")
+        list(graph.stream(None, thread))
+        assert [analyst.name for analyst in graph.get_state(thread).values["analysts"]] == ["Ada", "Carol"]
+        graph.update_state(thread, {"human_analyst_feedback": None}, as_node="human_feedback")
+        list(graph.stream(None, thread))
+        second_report = graph.get_state(thread).values["final_report"]
+        second_calls = llm.calls
+    
+    assert first_report and second_report
+    # Ada's interview is reused, so the rerun saves exactly one interview's calls
+    assert interview_memo.reused == 1
+    assert 0 < second_calls < first_calls
@@ -0,0 +1,115 @@
+"""Tests for node and call instrumentation."""
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage
+from graph.graph import build_research_graph
+from graph.metrics import Metrics, instrument_node, metrics
+from graph.models import Analyst, Perspectives, QueryPlan, ReportFraming
+from graph.ratelimit import call_with_backoff, acall_with_backoff
+from graph.runner import run_research
+
+
+class FakeLLM:
+    """Fake LLM that reports provider token usage."""
+
+    def invoke(self, messages, **kwargs):
+        return call_with_backoff("llm", lambda: AIMessage(
+            content="## Insights\nCats [1]",
+            usage_metadata={"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}
+        ), {"llm_requests": 1})
+
+    def with_structured_output(self, schema, **kwargs):
+        class Structured:
+            def invoke(self, messages, **kwargs):
+                if schema is Perspectives:
+                    return Perspectives(analysts=[
+                        Analyst(affiliation="A", name="Ada", role="r", description="ada focus"),
+                        Analyst(affiliation="B", name="Bob", role="r", description="bob focus")
+                    ])
+                if schema is ReportFraming:
+                    return ReportFraming(introduction="# Cats\n## Introduction", conclusion="## Conclusion")
+                return QueryPlan(search_query="cats")
+        return Structured()
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    """Start every test with empty process-wide metrics."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_calls_are_labelled_with_node_and_analyst():
+    """Test that calls made inside a node are grouped by node and analyst."""
+    def answer(state):
+        call_with_backoff("llm", lambda: "answer", {"llm_tokens": 7})
+        return {}
+
+    node = instrument_node("answer_question", answer)
+    node({"analyst": Analyst(affiliation="A", name="Ada", role="r", description="d")})
+    metrics.record_call("tavily", cache_hit=True)
+
+    summary = metrics.summary()
+    assert summary["nodes"]["answer_question"]["runs"] == 1
+    assert summary["interviews"].keys() == {"Ada"}
+    llm_calls = [row for row in summary["calls"] if row["backend"] == "llm"][0]
+    assert (llm_calls["node"], llm_calls["analyst"]) == ("answer_question", "Ada")
+    assert llm_calls["input_tokens"] == 7
+    tavily_calls = [row for row in summary["calls"] if row["backend"] == "tavily"][0]
+    assert (tavily_calls["node"], tavily_calls["cache_hits"]) == ("", 1)
+
+
+def test_async_nodes_record_queueing_and_errors():
+    """Test async node instrumentation, including failed nodes."""
+    async def search(state):
+        async def call():
+            return "result"
+        await acall_with_backoff("wikipedia", call, {})
+        raise ValueError("boom")
+
+    node = instrument_node("search_wikipedia", search)
+    with pytest.raises(ValueError):
+        asyncio.run(node({}))
+
+    summary = metrics.summary()
+    assert summary["node_runs"][0]["error"] is True
+    assert summary["calls"][0]["node"] == "search_wikipedia"
+    assert summary["calls"][0]["queue_seconds"] >= 0
+
+
+def test_prometheus_export():
+    """Test the Prometheus text format, including label escaping."""
+    recorder = Metrics()
+    recorder.record_node("write_report", 'Dr. "Q"', recorder.started, 1.5)
+    text = recorder.to_prometheus()
+    assert "# TYPE research_node_seconds_total counter" in text
+    assert 'research_node_seconds_total{node="write_report",analyst="Dr. \\"Q\\""} 1.5' in text
+    assert text.endswith("\n")
+
+
+def test_research_graph_is_instrumented(tmp_path):
+    """Test that every node of a full research run is recorded and exported."""
+    llm = FakeLLM()
+    with patch('graph.nodes.analyst_nodes.llm', llm), \
+            patch('graph.nodes.interview_nodes.llm', llm), \
+            patch('graph.nodes.report_nodes.llm', llm), \
+            patch('graph.nodes.interview_nodes.web_search', lambda query: [{"url": "https://a", "content": "cats"}]), \
+            patch('graph.nodes.interview_nodes.wikipedia_search', lambda query: []):
+        run_research(build_research_graph(), "Cats", 2, {"configurable": {"thread_id": "metrics"}})
+
+    summary = metrics.summary()
+    for node in ("create_analysts", "answer_question", "search_wikipedia", "rerank_context", "write_section", "write_report"):
+        assert node in summary["nodes"]
+    assert summary["interviews"].keys() == {"Ada", "Bob"}
+    answer_calls = [row for row in summary["calls"] if row["node"] == "answer_question"]
+    assert {row["analyst"] for row in answer_calls} == {"Ada", "Bob"}
+    assert all(row["output_tokens"] == 5 * row["calls"] for row in answer_calls)
+
+    json_path, prometheus_path = metrics.write(str(tmp_path), "run")
+    with open(json_path) as f:
+        assert json.load(f)["nodes"] == summary["nodes"]
+    with open(prometheus_path) as f:
+        assert 'node="answer_question",analyst="Ada"' in f.read()
@@ -1,6 +1,6 @@
 """Unit tests for models."""
 import pytest
-from graph.models import Analyst, SearchQuery, Perspectives
+from graph.models import Analyst, SearchQuery, Perspectives, QueryPlan, BackendQuery
 
 
 def test_analyst_creation():
@@ -47,3 +47,27 @@ def test_perspectives():
     assert len(perspectives.analysts) == 1
     assert perspectives.analysts[0].name == "Dr. Smith"
 
+
+
+def test_query_plan_backend_fallback():
+    """Test QueryPlan falls back to the general query for unplanned backends."""
+    plan = QueryPlan(
+        search_query="why cats are popular online",
+        backend_queries=[BackendQuery(backend="wikipedia", search_query="Cats and the Internet")]
+    )
+    queries = plan.queries_by_backend(["web", "wikipedia"])
+    assert queries == {"web": ["why cats are popular online"], "wikipedia": ["Cats and the Internet"]}
+
+
+def test_query_plan_multiple_queries():
+    """Test QueryPlan returns distinct queries per backend, specific ones first."""
+    plan = QueryPlan(
+        search_query="cats online",
+        alternative_queries=["cat memes history", "cats online", ""],
+        backend_queries=[BackendQuery(backend="wikipedia", search_query="Cats and the Internet")]
+    )
+    queries = plan.queries_by_backend(["web", "wikipedia"], max_queries=3)
+    assert queries == {
+        "web": ["cats online", "cat memes history"],
+        "wikipedia": ["Cats and the Internet", "cats online", "cat memes history"]
+    }
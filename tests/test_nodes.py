@@ -34,3 +34,146 @@ def test_analyst_state_structure(sample_analyst_state):
     assert sample_analyst_state["max_analysts"] == 3
     assert isinstance(sample_analyst_state["analysts"], list)
 
+
+
+@patch('graph.nodes.interview_nodes.llm')
+def test_plan_queries_single_call_for_all_backends(mock_llm, sample_analyst):
+    """Test that one planner call yields a query for every retrieval backend."""
+    from langchain_core.messages import HumanMessage
+    from graph.models import QueryPlan, BackendQuery
+    from graph.nodes.interview_nodes import plan_queries
+    from graph.retrieval.search import SEARCH_BACKENDS
+    
+    mock_structured_llm = Mock()
+    mock_structured_llm.invoke.return_value = QueryPlan(
+        search_query="cats internet",
+        backend_queries=[BackendQuery(backend="wikipedia", search_query="Cats and the Internet")]
+    )
+    mock_llm.with_structured_output.return_value = mock_structured_llm
+    
+    result = plan_queries({"analyst": sample_analyst, "messages": [HumanMessage(content="Why cats?")]})
+    
+    assert mock_structured_llm.invoke.call_count == 1
+    assert set(result["search_queries"]) == set(SEARCH_BACKENDS)
+    assert result["search_queries"]["wikipedia"][0] == "Cats and the Internet"
+
+
+@patch('graph.nodes.report_nodes.MAX_INTERVIEW_TURNS', 4)
+def test_interviews_receive_configured_turns(sample_analyst):
+    """Test that every interview is started with MAX_INTERVIEW_TURNS."""
+    from graph.nodes.report_nodes import initiate_all_interviews
+    
+    sends = initiate_all_interviews({"topic": "Cats", "analysts": [sample_analyst, sample_analyst]})
+    
+    assert len(sends) == 2
+    assert all(send.arg["max_num_turns"] == 4 for send in sends)
+
+
+def test_route_messages_stops_on_low_novelty(sample_analyst):
+    """Test that an interview ends early once retrieval stops finding new passages."""
+    from langchain_core.messages import HumanMessage, AIMessage
+    from graph.nodes.interview_nodes import route_messages
+    
+    state = {
+        "analyst": sample_analyst,
+        "max_num_turns": 3,
+        "messages": [HumanMessage(content="Why cats?"), AIMessage(content="Memes.", name="expert")]
+    }
+    assert route_messages({**state, "novelty": {"score": 0.8}}) == "ask_question"
+    assert route_messages({**state, "novelty": {"score": 0.1}}) == "save_interview"
+    # A turn whose searches all came back empty does not end the interview
+    assert route_messages({**state, "novelty": {"passages": 0, "score": None}}) == "ask_question"
+    with patch("graph.nodes.interview_nodes.NOVELTY_THRESHOLD", 0.0):
+        assert route_messages({**state, "novelty": {"score": 0.0}}) == "ask_question"
+
+
+def test_search_web_fans_out_and_merges(sample_analyst):
+    """Test that every planned query is searched concurrently and repeated results are merged."""
+    import threading
+    import time
+    from graph.nodes.interview_nodes import search_web
+    
+    threads = set()
+    
+    def fake_web_search(query):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.2)
+        return {"query": query, "results": [
+            {"url": "https://shared.example", "content": "Cats rule the internet."},
+            {"url": f"https://{query}.example", "content": f"About {query}."}
+        ]}
+    
+    started = time.perf_counter()
+    with patch("graph.nodes.interview_nodes.web_search", fake_web_search):
+        result = search_web({"search_queries": {"web": ["a", "b", "c"]}})
+    
+    assert time.perf_counter() - started < 0.5
+    assert len(threads) == 3
+    assert [document.url for document in result["context"]].count("https://shared.example") == 1
+    assert len(result["context"]) == 4
+
+
+def test_asearch_wikipedia_fans_out_and_merges():
+    """Test that async Wikipedia searches run concurrently and duplicate chunks are dropped."""
+    import asyncio
+    import time
+    from langchain_core.documents import Document
+    from graph.nodes.interview_nodes import asearch_wikipedia
+    
+    async def fake_wikipedia_search(query):
+        await asyncio.sleep(0.2)
+        return [
+            Document(page_content="Cats are popular.", metadata={"source": "https://w/Cat"}),
+            Document(page_content=f"On {query}.", metadata={"source": f"https://w/{query}"})
+        ]
+    
+    started = time.perf_counter()
+    with patch("graph.nodes.interview_nodes.awikipedia_search", fake_wikipedia_search):
+        result = asyncio.run(asearch_wikipedia({"search_queries": {"wikipedia": ["a", "b"]}}))
+    
+    assert time.perf_counter() - started < 0.35
+    assert len(result["context"]) == 3
+
+
+def test_digest_sections_tree_reduces_in_batches():
+    """Test that sections over the token budget are merged in batches of REPORT_FAN_IN memos."""
+    from graph.nodes.report_nodes import digest_sections
+    
+    llm = Mock()
+    llm.invoke.side_effect = lambda messages: Mock(content="merged")
+    # ~15 tokens per section, 390 in total
+    sections = [f"## Section {number:02d}\nCats rule the internet." for number in range(26)]
+    with patch("graph.nodes.report_nodes.llm", llm), \
+            patch("graph.nodes.report_nodes.REPORT_FAN_IN", 5), \
+            patch("graph.nodes.report_nodes.REPORT_DIGEST_TOKEN_BUDGET", 100):
+        result = digest_sections({"topic": "Cats", "sections": sections})
+        # 26 sections -> 5 merged batches, and the last section fits the per-memo budget and passes through
+        assert result["digest"] == "\n\n".join(["merged"] * 5 + [sections[25]])
+        assert llm.invoke.call_count == 5
+        
+        # Many sections under the budget are not merged at all
+        llm.invoke.reset_mock()
+        assert digest_sections({"topic": "Cats", "sections": sections[:6]})["digest"] == "\n\n".join(sections[:6])
+        assert llm.invoke.call_count == 0
+        
+        # A single section over the budget is condensed
+        assert digest_sections({"topic": "Cats", "sections": ["Cats " * 100]})["digest"] == "merged"
+        assert llm.invoke.call_count == 1
+
+
+def test_write_framing_uses_one_structured_call_over_the_digest():
+    """Test that introduction and conclusion come back from one call over the shared digest."""
+    from graph.models import ReportFraming
+    from graph.nodes.report_nodes import write_framing
+    
+    llm = Mock()
+    structured = llm.with_structured_output.return_value
+    structured.invoke.return_value = ReportFraming(introduction="# Cats\n## Introduction", conclusion="## Conclusion")
+    with patch("graph.nodes.report_nodes.llm", llm):
+        result = write_framing({"topic": "Cats", "sections": ["## Raw"], "digest": "## Digest"})
+    
+    assert result == {"introduction": "# Cats\n## Introduction", "conclusion": "## Conclusion"}
+    assert structured.invoke.call_count == 1
+    llm.with_structured_output.assert_called_once_with(ReportFraming)
+    system_message = structured.invoke.call_args[0][0][0].content
+    assert "## Digest" in system_message and "## Raw" not in system_message
@@ -0,0 +1,43 @@
+"""Unit tests for context packing."""
+from graph.retrieval.documents import Document, render_documents
+from graph.retrieval.packing import pack_context
+from graph.retrieval.text import score_texts
+
+
+CONTEXT = [
+    Document("web", "https://a.example", "Cats dominate internet memes."),
+    Document("web", "https://b.example", "The stock market closed higher today."),
+    Document("wikipedia", "https://en.wikipedia.org/wiki/Cat", "Cats dominate internet memes.", title="Cat"),
+    Document("local", "notes/dogs.txt", "plain text entry about dogs", section="Dogs")
+]
+
+
+def test_documents_render_in_prompt_format():
+    """Test that documents render to the <Document .../> prompt format only when asked."""
+    assert render_documents(CONTEXT[:1]) == '<Document href="https://a.example"/>\nCats dominate internet memes.\n</Document>'
+    assert CONTEXT[2].header == '<Document source="https://en.wikipedia.org/wiki/Cat" page="Cat"/>'
+    assert CONTEXT[3].header == '<Document source="notes/dogs.txt" section="Dogs"/>'
+    assert Document("web", "", "No URL.").header == '<Document source="web_search"/>'
+    assert CONTEXT[0].key == "https://a.example"
+    assert CONTEXT[2].key == CONTEXT[0].content_hash
+    assert Document(**CONTEXT[3].to_dict()) == CONTEXT[3]
+
+
+def test_score_texts_prefers_relevant_text():
+    """Test that relevant texts score higher."""
+    scores = score_texts("why are cats popular on the internet", ["cats internet", "stock market"])
+    assert scores[0] > scores[1]
+
+
+def test_pack_context_dedups_and_ranks():
+    """Test that duplicates are dropped and the best passage comes first."""
+    packed = pack_context(CONTEXT, "cats on the internet", token_budget=1000)
+    assert packed.count("Cats dominate internet memes.") == 1
+    assert packed.index("Cats dominate") < packed.index("stock market")
+
+
+def test_pack_context_respects_budget():
+    """Test that packing stops at the token budget."""
+    packed = pack_context(CONTEXT, "cats on the internet", token_budget=20)
+    assert "Cats dominate internet memes." in packed
+    assert "stock market" not in packed
@@ -0,0 +1,99 @@
+"""Unit tests for the rate limiter and retry policy."""
+import asyncio
+import pytest
+import graph.ratelimit as ratelimit
+from graph.ratelimit import TokenBucket, call_with_backoff, acall_with_backoff, is_retryable
+
+
+class RateLimitError(Exception):
+    """Stand-in for a provider 429 error."""
+    status_code = 429
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    """Record backoff sleeps instead of waiting."""
+    sleeps = []
+
+    async def fake_asleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(ratelimit.time, "sleep", sleeps.append)
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_asleep)
+    return sleeps
+
+
+def test_token_bucket_reservations_and_wait_metrics():
+    """Test that a drained bucket hands out increasing waits and records them."""
+    bucket = TokenBucket(rate_per_second=10, capacity=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    first_wait = bucket.reserve()
+    second_wait = bucket.reserve()
+    assert 0 < first_wait < second_wait <= 0.2
+
+    stats = bucket.stats()
+    assert stats["acquisitions"] == 4
+    assert stats["throttled"] == 2
+    assert stats["wait_seconds"] == pytest.approx(first_wait + second_wait, abs=1e-3)
+
+
+def test_disabled_bucket_never_waits():
+    """Test that a non-positive rate disables the limit."""
+    bucket = TokenBucket(rate_per_second=0, capacity=0)
+    assert all(bucket.reserve(1000) == 0 for _ in range(10))
+
+
+def test_is_retryable():
+    """Test classification of transient and permanent errors."""
+    assert is_retryable(RateLimitError())
+    assert is_retryable(TimeoutError())
+    assert is_retryable(Exception("429 RESOURCE_EXHAUSTED"))
+    assert not is_retryable(ValueError("bad schema"))
+
+
+def test_call_with_backoff_retries_transient_errors(no_sleep):
+    """Test that transient errors are retried with jittered, bounded delays."""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError()
+        return "ok"
+
+    retries_before = ratelimit.retries["test"]
+    assert call_with_backoff("test", flaky, {}) == "ok"
+    assert len(attempts) == 3
+    assert ratelimit.retries["test"] - retries_before == 2
+    assert len(no_sleep) == 2
+    assert 0 <= no_sleep[0] <= ratelimit.RETRY_BASE_DELAY_SECONDS
+
+
+def test_call_with_backoff_gives_up(no_sleep):
+    """Test that permanent errors and exhausted attempts are raised."""
+    with pytest.raises(ValueError):
+        call_with_backoff("test", lambda: (_ for _ in ()).throw(ValueError("bad")), {})
+    assert no_sleep == []
+
+    def always_limited():
+        raise RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        call_with_backoff("test", always_limited, {}, max_attempts=3)
+    assert len(no_sleep) == 2
+
+
+def test_acall_with_backoff_waits_for_the_limiter(no_sleep, monkeypatch):
+    """Test that async calls wait for their reservation before running."""
+    monkeypatch.setitem(ratelimit.BUCKETS, "test_requests", TokenBucket(rate_per_second=1, capacity=1))
+
+    async def call():
+        return "ok"
+
+    async def run():
+        return [await acall_with_backoff("test", call, {"test_requests": 1}) for _ in range(3)]
+
+    assert asyncio.run(run()) == ["ok"] * 3
+    assert len(no_sleep) == 2
+    assert ratelimit.BUCKETS["test_requests"].stats()["throttled"] == 2
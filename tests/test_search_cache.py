@@ -0,0 +1,163 @@
+"""Unit tests for the search cache."""
+import asyncio
+import threading
+import time
+import pytest
+from graph.cache import DiskCache, LRUCache, SingleFlight
+from graph.retrieval.search import SearchCache, normalize_query
+
+
+@pytest.fixture
+def search_cache(tmp_path):
+    """Create an empty two-tier search cache."""
+    disk = DiskCache(str(tmp_path / "search.sqlite"), max_bytes=1024 * 1024, max_age_seconds=3600)
+    return SearchCache(disk, LRUCache(max_entries=8))
+
+
+def test_normalize_query():
+    """Test that only case, punctuation and whitespace are folded into the key."""
+    assert normalize_query("Why do people love cats?") == normalize_query("  why do PEOPLE love cats")
+    assert normalize_query("Cats, internet") == normalize_query("cats internet")
+    assert normalize_query("Why do cats purr") != normalize_query("How do cats purr")
+    assert normalize_query("cats love dogs") != normalize_query("dogs love cats")
+
+
+def test_lru_cache_expiry_and_capacity():
+    """Test LRU expiry and capacity eviction."""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1, ttl_seconds=60)
+    cache.set("b", 2, ttl_seconds=60)
+    cache.get("a")
+    cache.set("c", 3, ttl_seconds=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    cache.set("d", 4, ttl_seconds=-1)
+    assert cache.get("d") is None
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent calls for the same key run the function once."""
+    flight = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("key", slow))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.shared == 4
+
+
+def test_search_cache_tiers(search_cache):
+    """Test memory and disk tiers of the search cache."""
+    loader_calls = []
+
+    def loader():
+        loader_calls.append(1)
+        return [{"url": "https://example.com", "content": "cats"}]
+
+    first = search_cache.fetch("tavily", "Why cats?", 60, loader)
+    second = search_cache.fetch("tavily", "why  CATS", 60, loader)
+    assert first == second
+    assert len(loader_calls) == 1
+    assert search_cache.stats()["memory_hits"] == 1
+
+    # A fresh memory tier falls back to disk
+    search_cache.memory = LRUCache(max_entries=8)
+    assert search_cache.fetch("tavily", "why cats", 60, loader) == first
+    assert search_cache.stats()["disk_hits"] == 1
+    assert len(loader_calls) == 1
+
+
+def test_search_cache_backend_ttl(search_cache):
+    """Test that a zero TTL forces a reload."""
+    search_cache.fetch("wikipedia", "cats", 60, lambda: ["old"])
+    search_cache.memory = LRUCache(max_entries=8)
+    time.sleep(0.01)
+    assert search_cache.fetch("wikipedia", "cats", 0, lambda: ["new"]) == ["new"]
+
+
+def test_single_flight_coalesces_concurrent_coroutines():
+    """Test that concurrent coroutines for the same key await one call."""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*[flight.ado("key", slow) for _ in range(5)])
+
+    assert asyncio.run(run()) == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.shared == 4
+
+
+def test_single_flight_survives_cancelled_leader():
+    """Test that coroutines waiting on a cancelled call make the call themselves instead of hanging."""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        leader = asyncio.ensure_future(flight.ado("key", slow))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.ado("key", slow)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await asyncio.wait_for(asyncio.gather(*followers), timeout=1)
+
+    assert asyncio.run(run()) == ["result"] * 3
+    assert len(calls) == 2
+
+
+def test_search_cache_timeout_falls_back_to_stale_entry(search_cache):
+    """Test that a slow load is not waited for, the stale entry is served, and the load still fills the cache."""
+    from graph.metrics import metrics
+    metrics.reset()
+    search_cache.fetch("wikipedia", "cats", 60, lambda: ["old"])
+    search_cache.memory = LRUCache(max_entries=8)
+    time.sleep(0.01)
+
+    def slow():
+        time.sleep(0.3)
+        return ["new"]
+
+    started = time.perf_counter()
+    assert search_cache.fetch("wikipedia", "cats", 0, slow, timeout_seconds=0.05, default=[]) == ["old"]
+    assert search_cache.fetch("wikipedia", "dogs", 0, slow, timeout_seconds=0.05, default=[]) == []
+    assert time.perf_counter() - started < 0.25
+    assert search_cache.stats()["timeouts"] == 2
+    assert sum(row["timeouts"] for row in metrics.summary()["calls"] if row["backend"] == "wikipedia") == 2
+
+    time.sleep(0.4)
+    assert search_cache.fetch("wikipedia", "cats", 60, lambda: ["unused"]) == ["new"]
+
+
+def test_search_cache_async_timeout(search_cache):
+    """Test that an awaited load is abandoned after its timeout but keeps filling the cache."""
+    async def slow():
+        await asyncio.sleep(0.2)
+        return ["new"]
+
+    async def run():
+        first = await search_cache.afetch("tavily", "cats", 60, slow, timeout_seconds=0.05, default={"results": []})
+        await asyncio.sleep(0.3)
+        return first, await search_cache.afetch("tavily", "cats", 60, slow, timeout_seconds=0.05)
+
+    assert asyncio.run(run()) == ({"results": []}, ["new"])
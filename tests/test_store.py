@@ -0,0 +1,57 @@
+"""Unit tests for the run-scoped document store."""
+from unittest.mock import patch
+from graph.retrieval.documents import Document
+from graph.retrieval.store import DocumentStore, DocumentStores, run_id
+
+WEB_DOCUMENTS = [
+    Document("web", "https://a.example", "Cats dominate internet memes."),
+    Document("web", "https://b.example", "Lolcats started on image boards.")
+]
+
+
+def test_lookup_reuses_documents_of_similar_query():
+    """Test that a near-identical query is served from the store and a different one is not."""
+    store = DocumentStore(query_similarity=0.85)
+    assert store.lookup("web", "why are cats popular on the internet") is None
+    store.add("web", "why are cats popular on the internet", WEB_DOCUMENTS)
+    
+    assert store.lookup("web", "Why cats are popular on the Internet?") == WEB_DOCUMENTS
+    assert store.lookup("wikipedia", "why are cats popular on the internet") is None
+    assert store.lookup("web", "history of dog domestication") is None
+    assert store.stats() == {"documents": 2, "queries": 1, "lookups": 4, "fetches_avoided": 1}
+
+
+def test_stores_are_scoped_per_run(caplog):
+    """Test that runs get separate stores, kept past max_runs until each run releases its own."""
+    stores = DocumentStores(max_runs=2)
+    first = stores.get("run-1")
+    assert stores.get("run-1") is first
+    assert stores.get("run-2") is not first
+    stores.get("run-3")
+    assert "3 document stores held" in caplog.text
+    assert stores.get("run-1") is first
+    assert stores.release("run-1") == {"documents": 0, "queries": 0, "lookups": 0, "fetches_avoided": 0}
+    assert stores.release("run-1") is None
+    assert run_id({"configurable": {"thread_id": "t"}}) == "t"
+    assert run_id(None) == ""
+
+
+def test_parallel_branches_share_fetched_documents():
+    """Test that a second interview branch of the same run reuses the first branch's web results."""
+    from graph.nodes.interview_nodes import search_web
+    
+    fetched = []
+    
+    def fake_web_search(query):
+        fetched.append(query)
+        return {"results": [{"url": "https://a.example", "content": "Cats dominate internet memes."}]}
+    
+    config = {"configurable": {"thread_id": "store-test"}}
+    state = {"search_queries": {"web": ["why are cats popular on the internet"]}}
+    with patch("graph.nodes.interview_nodes.web_search", fake_web_search):
+        first = search_web(state, config)
+        second = search_web(state, config)
+        search_web(state, {"configurable": {"thread_id": "other-run"}})
+    
+    assert first == second
+    assert len(fetched) == 2
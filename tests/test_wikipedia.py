@@ -0,0 +1,63 @@
+"""Tests for the pooled Wikipedia client."""
+import asyncio
+import time
+import httpx
+from graph.retrieval.wikipedia import WikipediaClient, lead_section
+
+PAGE = "Cats are small.\n\n== History ==\nDomesticated long ago.\n\n=== Egypt ===\nRevered."
+
+
+def _respond(request: httpx.Request, requests: list) -> httpx.Response:
+    params = request.url.params
+    requests.append(dict(params))
+    if params.get("generator") == "search":
+        pages = [
+            {"index": i + 1, "title": f"Cat {i}", "fullurl": f"https://en.wikipedia.org/wiki/Cat_{i}", "extract": "Cats are small."}
+            for i in reversed(range(int(params["gsrlimit"])))
+        ]
+    else:
+        pages = [{"title": params["titles"], "extract": PAGE}]
+    return httpx.Response(200, json={"query": {"pages": pages}})
+
+
+def test_lead_section():
+    """Test that the lead ends at the first section heading."""
+    assert lead_section(PAGE) == "Cats are small."
+    assert lead_section("No sections.") == "No sections."
+
+
+def test_pages_are_fetched_concurrently():
+    """Test that page extracts are fetched in parallel and come back in search order, loader-shaped."""
+    requests = []
+
+    def handler(request):
+        time.sleep(0.1)
+        return _respond(request, requests)
+
+    client = WikipediaClient(api_url="https://wiki.test/w/api.php", transport=httpx.MockTransport(handler))
+    started = time.perf_counter()
+    pages = client.load("cats", 4)
+    
+    # One search round trip plus one concurrent round of page requests
+    assert time.perf_counter() - started < 0.35
+    assert len(requests) == 5
+    assert [page["metadata"]["title"] for page in pages] == ["Cat 0", "Cat 1", "Cat 2", "Cat 3"]
+    assert pages[0] == {
+        "page_content": PAGE,
+        "metadata": {"title": "Cat 0", "summary": "Cats are small.", "source": "https://en.wikipedia.org/wiki/Cat_0"}
+    }
+
+
+def test_lead_only_needs_one_request():
+    """Test that lead sections come from the search request alone, on the async path too."""
+    requests = []
+
+    async def handler(request):
+        return _respond(request, requests)
+
+    client = WikipediaClient(api_url="https://wiki.test/w/api.php", async_transport=httpx.MockTransport(handler))
+    pages = asyncio.run(client.aload("cats", 3, lead_only=True))
+    
+    assert len(requests) == 1
+    assert requests[0]["exintro"] == "1"
+    assert [page["page_content"] for page in pages] == ["Cats are small."] * 3